@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Stellar Appulse Search
+======================
+
+Finds the moments 3I/ATLAS passes close to catalog stars ("ATLAS passes
+0.8' from HIP 70012"), with exact times and minimum separations, from a
+local star catalog and the stored trajectory.
+
+Method:
+- Stars are loaded once into a sky index: unit vectors binned on an
+  equal-angle cube-face grid (six faces of n x n cells) and sorted by cell
+  id, so a cell's stars are one contiguous slice found by np.searchsorted
+  (O(log N) per lookup, million-star catalogs are fine)
+- ATLAS's geocentric astrometric path (observer_geometry.py) is sampled on
+  a regular grid; each epoch probes the cells under a ring around its
+  position that covers the search radius (threshold + motion per step)
+- Candidate (epoch, star) pairs are reduced to local separation minima and
+  refined by a parabola through sep^2 at the neighbouring samples; the
+  separation is then re-evaluated at the refined time
+
+Catalog positions are used as given (ICRS at the catalog epoch, no proper
+motion). Any CSV with RA/Dec in degrees works, e.g. a Hipparcos, Tycho-2 or
+Gaia export: columns ra/dec (or RAdeg/DEdeg), optional name and magnitude.
+
+Usage:
+    python3 appulse_search.py --catalog tycho2_bright.csv --threshold 60
+    python3 appulse_search.py --catalog gaia_g12.csv --threshold 30 --output appulses.json
+
+Author: 3IAtlas Development Team
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ephemeris import EphemerisSeries, date_to_jd, jd_to_datetime, load_stored
+from observer_geometry import format_dec, format_ra, observer_geometry
+
+CATALOG_FILE = "star_catalog.csv"
+
+# Report appulses closer than this (arcseconds)
+DEFAULT_THRESHOLD_ARCSEC = 60.0
+STEP_HOURS = 1.0
+
+# Epochs handled per vectorized block
+EPOCH_BLOCK = 2048
+
+# Probe ring: PROBE_COUNT points at PROBE_FACTOR x the search radius, with
+# cells at least CELL_FACTOR x the radius wide, so any cell reaching into the
+# search cap contains the center or a probe
+PROBE_COUNT = 32
+PROBE_FACTOR = 1.5
+CELL_FACTOR = 6.0
+MAX_CELLS_PER_EDGE = 8192
+
+COLUMN_ALIASES = {
+    'ra': ('ra', 'ra_deg', 'radeg', 'ra_icrs', '_raj2000'),
+    'dec': ('dec', 'dec_deg', 'dedeg', 'de_icrs', 'dej2000', '_dej2000'),
+    'mag': ('mag', 'vmag', 'vtmag', 'btmag', 'hpmag', 'phot_g_mean_mag', 'gmag'),
+    'name': ('name', 'id', 'hip', 'tyc', 'source_id', 'designation'),
+}
+
+
+def radec_to_unit(ra_deg: np.ndarray, dec_deg: np.ndarray) -> np.ndarray:
+    """(N, 3) ICRF unit vectors"""
+    ra, dec = np.radians(ra_deg), np.radians(dec_deg)
+    return np.stack([np.cos(dec) * np.cos(ra), np.cos(dec) * np.sin(ra), np.sin(dec)], axis=-1)
+
+
+def separation_arcsec(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Angle between unit vectors (chord formula, accurate at small angles)"""
+    chord = np.linalg.norm(a - b, axis=-1)
+    return np.degrees(2.0 * np.arcsin(np.clip(chord / 2.0, 0.0, 1.0))) * 3600.0
+
+
+def _equal_angle_cell(x: np.ndarray, n: int) -> np.ndarray:
+    """Cell column of gnomonic face coordinates, equal-angle spacing
+
+    Equal angles (rather than equal gnomonic steps) keep cells nearly
+    uniform in size across each face.
+    """
+    cell = (np.arctan(x) / (np.pi / 2) + 0.5) * n
+    return np.clip(cell, 0, n - 1).astype(np.int64)
+
+
+class SkyIndex:
+    """Star unit vectors sorted by equal-angle cube-face cell"""
+
+    def __init__(self, vectors: np.ndarray, cells_per_edge: int):
+        self.n = int(cells_per_edge)
+        ids = self.cell_ids(vectors)
+        self.order = np.argsort(ids, kind='stable')
+        self.ids = ids[self.order]
+        self.vectors = vectors[self.order]
+
+    @classmethod
+    def for_radius(cls, vectors: np.ndarray, radius_arcsec: float) -> 'SkyIndex':
+        """Index with cells about CELL_FACTOR search radii wide"""
+        cell_deg = CELL_FACTOR * radius_arcsec / 3600.0
+        return cls(vectors, int(np.clip(90.0 / cell_deg, 1, MAX_CELLS_PER_EDGE)))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def cell_arcsec(self) -> float:
+        """Nominal cell width"""
+        return 90.0 * 3600.0 / self.n
+
+    def cell_ids(self, vectors: np.ndarray) -> np.ndarray:
+        """Cell id of (..., 3) unit vectors: face * n^2 + row * n + column"""
+        absolute = np.abs(vectors)
+        axis = np.argmax(absolute, axis=-1)
+        major = np.take_along_axis(vectors, axis[..., None], axis=-1)[..., 0]
+        face = axis * 2 + (major < 0)
+
+        # The two remaining coordinates, divided by the major one (gnomonic)
+        u_axis, v_axis = (axis + 1) % 3, (axis + 2) % 3
+        scale = 1.0 / np.abs(major)
+        u = np.take_along_axis(vectors, u_axis[..., None], axis=-1)[..., 0] * scale
+        v = np.take_along_axis(vectors, v_axis[..., None], axis=-1)[..., 0] * scale
+
+        return (face.astype(np.int64) * self.n * self.n
+                + _equal_angle_cell(u, self.n) * self.n + _equal_angle_cell(v, self.n))
+
+    def query_cells(self, cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """[start, stop) slices of the sorted stars for each cell id"""
+        return (np.searchsorted(self.ids, cells, side='left'),
+                np.searchsorted(self.ids, cells, side='right'))
+
+
+def probe_ring(centers: np.ndarray, radius_rad: float) -> np.ndarray:
+    """(T, PROBE_COUNT + 1, 3) probe points: each center and a ring around it"""
+    helper = np.where(np.abs(centers[:, 2:3]) < 0.9, [[0.0, 0.0, 1.0]], [[1.0, 0.0, 0.0]])
+    e1 = np.cross(centers, helper)
+    e1 /= np.linalg.norm(e1, axis=1, keepdims=True)
+    e2 = np.cross(centers, e1)
+
+    phi = np.linspace(0.0, 2 * np.pi, PROBE_COUNT, endpoint=False)
+    rho = PROBE_FACTOR * radius_rad
+    ring = (np.cos(rho) * centers[:, None, :]
+            + np.sin(rho) * (np.cos(phi)[None, :, None] * e1[:, None, :]
+                             + np.sin(phi)[None, :, None] * e2[:, None, :]))
+    return np.concatenate([centers[:, None, :], ring], axis=1)
+
+
+def candidate_pairs(index: SkyIndex, path: np.ndarray,
+                    radius_arcsec: float) -> Tuple[np.ndarray, np.ndarray]:
+    """(epoch, star) pairs closer than radius_arcsec, stars in index order"""
+    epochs, stars = [], []
+    for start in range(0, len(path), EPOCH_BLOCK):
+        block = path[start:start + EPOCH_BLOCK]
+        cells = index.cell_ids(probe_ring(block, np.radians(radius_arcsec / 3600.0)))
+
+        # Unique (epoch, cell) lookups, then expand each slice into star indices
+        keys = np.unique(np.arange(len(block))[:, None] * (6 * index.n ** 2) + cells)
+        epoch, cell = np.divmod(keys, 6 * index.n ** 2)
+        lo, hi = index.query_cells(cell)
+        counts = hi - lo
+        if not counts.sum():
+            continue
+
+        epoch = np.repeat(epoch, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        star = np.repeat(lo, counts) + offsets
+
+        close = separation_arcsec(block[epoch], index.vectors[star]) <= radius_arcsec
+        epochs.append(epoch[close] + start)
+        stars.append(star[close])
+
+    if not epochs:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(epochs), np.concatenate(stars)
+
+
+def line_of_sight(target: EphemerisSeries, earth: EphemerisSeries, jd) -> np.ndarray:
+    """Astrometric ICRF unit vectors from the geocenter"""
+    table = observer_geometry(target, earth, jd)
+    return radec_to_unit(table['ra_deg'], table['dec_deg'])
+
+
+def search_radius(path: np.ndarray, threshold_arcsec: float) -> float:
+    """Candidate radius: threshold plus the largest motion between samples"""
+    motion = float(np.max(separation_arcsec(path[1:], path[:-1]))) if len(path) > 1 else 0.0
+    return threshold_arcsec + motion
+
+
+def find_appulses(target: EphemerisSeries, earth: EphemerisSeries, index: SkyIndex,
+                  jd: np.ndarray, threshold_arcsec: float = DEFAULT_THRESHOLD_ARCSEC) -> Dict:
+    """Refined separation minima below threshold
+
+    Returns arrays 'star' (catalog row), 'jd' and 'separation_arcsec'.
+    """
+    path = line_of_sight(target, earth, jd)
+    radius = search_radius(path, threshold_arcsec)
+    if index.cell_arcsec < CELL_FACTOR * radius:
+        raise ValueError(f"Sky index cells ({index.cell_arcsec:.0f}\") are too fine for a "
+                         f"{radius:.0f}\" search; build it with SkyIndex.for_radius")
+    epoch, star = candidate_pairs(index, path, radius)
+
+    # Local minima along the sampled path (interior epochs only)
+    inner = (epoch > 0) & (epoch < len(jd) - 1)
+    epoch, star = epoch[inner], star[inner]
+    vectors = index.vectors[star]
+    d_prev = separation_arcsec(path[epoch - 1], vectors) ** 2
+    d_here = separation_arcsec(path[epoch], vectors) ** 2
+    d_next = separation_arcsec(path[epoch + 1], vectors) ** 2
+    minimum = (d_here <= d_prev) & (d_here < d_next)
+    epoch, star = epoch[minimum], star[minimum]
+    d_prev, d_here, d_next = d_prev[minimum], d_here[minimum], d_next[minimum]
+
+    # Parabola through sep^2 at the three samples
+    curvature = d_prev - 2 * d_here + d_next
+    with np.errstate(divide='ignore', invalid='ignore'):
+        offset = np.where(curvature > 0, 0.5 * (d_prev - d_next) / curvature, 0.0)
+    step = jd[epoch + 1] - jd[epoch]
+    refined_jd = jd[epoch] + np.clip(offset, -1.0, 1.0) * step
+
+    separation = separation_arcsec(line_of_sight(target, earth, refined_jd), index.vectors[star])
+    keep = separation <= threshold_arcsec
+    order = np.argsort(refined_jd[keep])
+    return {
+        'star': index.order[star[keep]][order],
+        'jd': refined_jd[keep][order],
+        'separation_arcsec': separation[keep][order],
+    }
+
+
+def _column(header: List[str], key: str) -> Optional[int]:
+    lookup = {name.strip().lower(): k for k, name in enumerate(header)}
+    for alias in COLUMN_ALIASES[key]:
+        if alias in lookup:
+            return lookup[alias]
+    return None
+
+
+def read_star_catalog(path: str) -> Dict[str, np.ndarray]:
+    """RA/Dec (deg), magnitude and names from a star catalog CSV"""
+    with open(path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = [row for row in reader if row]
+
+    ra_col, dec_col = _column(header, 'ra'), _column(header, 'dec')
+    if ra_col is None or dec_col is None:
+        raise ValueError(f"{path} has no RA/Dec columns (found: {', '.join(header)})")
+    mag_col, name_col = _column(header, 'mag'), _column(header, 'name')
+
+    ra = np.array([float(row[ra_col]) for row in rows])
+    dec = np.array([float(row[dec_col]) for row in rows])
+    mag = (np.array([float(row[mag_col]) if row[mag_col].strip() else np.nan for row in rows])
+           if mag_col is not None else np.full(len(rows), np.nan))
+    names = (np.array([row[name_col].strip() for row in rows]) if name_col is not None
+             else np.array([f"star {k}" for k in range(len(rows))]))
+    return {'ra': ra, 'dec': dec, 'mag': mag, 'name': names}
+
+
+def to_records(catalog: Dict[str, np.ndarray], appulses: Dict[str, np.ndarray]) -> List[Dict]:
+    """Appulse records, sorted by time"""
+    records = []
+    for row, jd, separation in zip(appulses['star'], appulses['jd'],
+                                   appulses['separation_arcsec']):
+        magnitude = catalog['mag'][row]
+        records.append({
+            'star': str(catalog['name'][row]),
+            'star_mag': None if np.isnan(magnitude) else round(float(magnitude), 2),
+            'ra': format_ra(catalog['ra'][row]),
+            'dec': format_dec(catalog['dec'][row]),
+            'jd': round(float(jd), 6),
+            'time_tdb': jd_to_datetime(jd).strftime('%Y-%m-%dT%H:%M:%S'),
+            'separation_arcsec': round(float(separation), 2),
+        })
+    return records
+
+
+def main():
+    """Search a local star catalog for ATLAS appulses"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="3I/ATLAS stellar appulse search")
+    parser.add_argument('--catalog', default=CATALOG_FILE, help='Star catalog CSV (RA/Dec in degrees)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD_ARCSEC,
+                        help='Largest separation to report (arcsec)')
+    parser.add_argument('--max-mag', type=float, default=None, help='Skip fainter stars')
+    parser.add_argument('--start', default=None, help='First epoch (default: stored span)')
+    parser.add_argument('--end', default=None, help='Last epoch')
+    parser.add_argument('--step-hours', type=float, default=STEP_HOURS, help='Path sampling step')
+    parser.add_argument('--output', default=None, help='Write appulses as JSON')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.catalog):
+        print(f"✗ Star catalog not found: {args.catalog}")
+        sys.exit(1)
+
+    stored = load_stored()
+    if 'atlas' not in stored or 'earth' not in stored:
+        print("✗ Stored ATLAS and Earth data are required")
+        sys.exit(1)
+
+    t_start = time.perf_counter()
+    catalog = read_star_catalog(args.catalog)
+    if args.max_mag is not None:
+        bright = ~(catalog['mag'] > args.max_mag)
+        catalog = {key: values[bright] for key, values in catalog.items()}
+    vectors = radec_to_unit(catalog['ra'], catalog['dec'])
+    t_read = time.perf_counter() - t_start
+
+    atlas, earth = stored['atlas'], stored['earth']
+    start = date_to_jd(args.start) if args.start else max(atlas.start, earth.start)
+    end = date_to_jd(args.end) if args.end else min(atlas.end, earth.end)
+    jd = np.arange(start, end + 1e-9, args.step_hours / 24.0)
+
+    t_start = time.perf_counter()
+    radius = search_radius(line_of_sight(atlas, earth, jd), args.threshold)
+    index = SkyIndex.for_radius(vectors, radius)
+    t_index = time.perf_counter() - t_start
+
+    t_start = time.perf_counter()
+    appulses = find_appulses(atlas, earth, index, jd, args.threshold)
+    t_search = time.perf_counter() - t_start
+
+    print(f"✓ {len(index):,} stars read in {t_read:.2f} s, indexed in {t_index:.2f} s "
+          f"({index.n} cells per face edge)")
+    print(f"✓ {len(jd):,} epochs searched in {t_search:.2f} s: "
+          f"{len(appulses['jd'])} appulses within {args.threshold:g}\"")
+
+    records = to_records(catalog, appulses)
+    for record in records[:30]:
+        print(f"  {record['time_tdb']} TDB  {record['separation_arcsec']:7.2f}\"  "
+              f"{record['star']} (mag {record['star_mag']})")
+
+    if args.output:
+        product = {
+            'metadata': {
+                'generated': datetime.now().isoformat(),
+                'catalog': os.path.basename(args.catalog),
+                'stars': len(index),
+                'threshold_arcsec': args.threshold,
+                'observer': 'geocenter (astrometric)',
+            },
+            'appulses': records,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(product, f, indent=2)
+        print(f"✓ Appulses saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Precomputed Camera Tracks
+=========================
+
+Fits smooth camera keyframes (position, look-at, up) for the named camera
+modes over the whole ATLAS timeline, so the client samples a curve instead
+of rebuilding the camera from raw 6-hour records every frame (which jitters
+where the velocity direction kinks at the sample joins).
+
+Modes (mirroring the frontend):
+- ride-atlas   chase camera RIDE_BACK behind the comet along its velocity
+               and RIDE_HEIGHT above it (SceneContent.tsx)
+
+Method:
+- The stored trajectory is Hermite-interpolated on an hourly grid and every
+  mode's camera is evaluated there in one vectorized pass
+- Each track is fitted with a uniform cubic B-spline (one knot per
+  KNOT_DAYS) by penalized least squares (P-spline, second-difference
+  penalty), which removes the join kinks while staying within a small
+  distance of the raw camera
+- Only the control points are exported; the client evaluates the standard
+  uniform B-spline basis at u = (jd - start_jd) / knot_days
+
+Tracks are in three.js scene axes (ecliptic x, z, -y; AU), like the renderer.
+
+Usage:
+    python3 camera_paths.py                      # writes camera_tracks.json
+    python3 camera_paths.py --knot-days 0.5 --smoothing 0.01
+
+Author: 3IAtlas Development Team
+"""
+
+import json
+import sys
+from datetime import datetime
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+from ephemeris import EphemerisSeries, load_stored
+
+OUTPUT_FILE = "../frontend/public/data/camera_tracks.json"
+
+SAMPLE_HOURS = 1.0
+KNOT_DAYS = 1.0
+
+# Second-difference penalty relative to the data term
+SMOOTHING = 0.05
+
+# Camera offsets in scene units (AU), as used by the components
+RIDE_BACK = 2.2
+RIDE_HEIGHT = 0.9
+
+WORLD_UP = np.array([0.0, 1.0, 0.0])
+
+CONTROL_DECIMALS = 6
+
+
+def to_scene(vectors: np.ndarray) -> np.ndarray:
+    """Ecliptic (x, y, z) -> three.js scene (x, z, -y)"""
+    return np.stack([vectors[:, 0], vectors[:, 2], -vectors[:, 1]], axis=1)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=1)[:, None]
+
+
+def ride_atlas(position: np.ndarray, velocity: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Chase camera behind and above the comet, local up"""
+    forward = _normalize(velocity)
+    right = np.cross(forward, WORLD_UP)
+    degenerate = np.linalg.norm(right, axis=1) < 1e-3
+    right[degenerate] = (1.0, 0.0, 0.0)
+    right = _normalize(right)
+    up = np.cross(right, forward)
+    camera = position - RIDE_BACK * forward + RIDE_HEIGHT * up
+    return camera, position, up
+
+
+CAMERA_MODES: Dict[str, Callable] = {
+    'ride-atlas': ride_atlas,
+}
+
+
+def bspline_basis(u: np.ndarray, segments: int) -> np.ndarray:
+    """Dense (len(u), segments + 3) uniform cubic B-spline basis matrix"""
+    i = np.clip(np.floor(u).astype(int), 0, segments - 1)
+    t = u - i
+    weights = np.stack([(1 - t) ** 3,
+                        3 * t ** 3 - 6 * t ** 2 + 4,
+                        -3 * t ** 3 + 3 * t ** 2 + 3 * t + 1,
+                        t ** 3], axis=1) / 6.0
+    basis = np.zeros((len(u), segments + 3))
+    rows = np.arange(len(u))
+    for k in range(4):
+        basis[rows, i + k] = weights[:, k]
+    return basis
+
+
+def fit_track(u: np.ndarray, values: np.ndarray, segments: int,
+              smoothing: float = SMOOTHING) -> np.ndarray:
+    """Control points (segments + 3, D) of a penalized least-squares B-spline"""
+    basis = bspline_basis(u, segments)
+    count = segments + 3
+    second = np.diff(np.eye(count), 2, axis=0)
+    scale = len(u) / count
+    lhs = basis.T @ basis + smoothing * scale * second.T @ second
+    return np.linalg.solve(lhs, basis.T @ values)
+
+
+def evaluate_track(control: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """Spline values at parameters u (what the client computes)"""
+    return bspline_basis(u, len(control) - 3) @ control
+
+
+def camera_tracks(series: EphemerisSeries, sample_hours: float = SAMPLE_HOURS,
+                  knot_days: float = KNOT_DAYS, smoothing: float = SMOOTHING) -> Dict[str, Dict]:
+    """Fitted tracks for every camera mode, with fit statistics"""
+    segments = max(1, int(np.ceil((series.end - series.start) / knot_days)))
+    jd = np.linspace(series.start, series.end,
+                     int(round((series.end - series.start) * 24.0 / sample_hours)) + 1)
+    u = (jd - series.start) / knot_days
+
+    position, velocity = series.interpolate(jd)
+    position, velocity = to_scene(position), to_scene(velocity)
+
+    tracks = {}
+    for mode, camera in CAMERA_MODES.items():
+        raw = dict(zip(('position', 'look_at', 'up'), camera(position, velocity)))
+        track = {'start_jd': series.start, 'knot_days': knot_days, 'segments': segments}
+        for key, values in raw.items():
+            control = fit_track(u, values, segments, smoothing)
+            fitted = evaluate_track(control, u)
+            track[key] = np.round(control, CONTROL_DECIMALS).ravel().tolist()
+            track[f'{key}_max_error'] = float(np.linalg.norm(fitted - values, axis=1).max())
+        tracks[mode] = track
+    return tracks
+
+
+def main():
+    """Fit camera tracks for the stored ATLAS trajectory"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precompute smooth camera tracks per mode")
+    parser.add_argument('--knot-days', type=float, default=KNOT_DAYS, help='Spline knot spacing')
+    parser.add_argument('--sample-hours', type=float, default=SAMPLE_HOURS,
+                        help='Trajectory sampling for the fit')
+    parser.add_argument('--smoothing', type=float, default=SMOOTHING,
+                        help='Second-difference penalty weight')
+    parser.add_argument('--output', default=OUTPUT_FILE, help='Output JSON file')
+    args = parser.parse_args()
+
+    stored = load_stored()
+    if 'atlas' not in stored:
+        print("✗ No stored ATLAS trajectory")
+        sys.exit(1)
+
+    tracks = camera_tracks(stored['atlas'], args.sample_hours, args.knot_days, args.smoothing)
+    for mode, track in tracks.items():
+        print(f"  {mode:11s} {track['segments'] + 3:4d} control points  "
+              f"max deviation: position {track['position_max_error']:.1e} AU, "
+              f"look-at {track['look_at_max_error']:.1e} AU, up {track['up_max_error']:.1e}")
+
+    product = {
+        'metadata': {
+            'generated': datetime.now().isoformat(),
+            'frame': 'three.js scene axes (ecliptic x, z, -y), AU',
+            'spline': 'uniform cubic B-spline, u = (jd - start_jd) / knot_days',
+            'layout': 'control points are flat [x, y, z, ...]',
+        },
+        'tracks': tracks,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(product, f, separators=(',', ':'))
+    print(f"✓ {len(tracks)} camera tracks saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
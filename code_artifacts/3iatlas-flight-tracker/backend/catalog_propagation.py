@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Bulk Propagation of Small-Body Element Catalogs
+===============================================
+
+Propagates thousands to hundreds of thousands of asteroids and comets from a
+local orbital-element catalog, with no Horizons requests, for the frontend's
+asteroid belt and background small bodies.
+
+Method:
+- The catalog is parsed once into an (N, 6) cometary element array
+  (e, q, tp, om, w, i), converting mean-anomaly elements where needed
+- Bodies are split into chunks; each chunk is one vectorized two-body
+  (conic) call, and chunks run in a process pool writing straight into a
+  shared-memory (epochs, bodies, 3) result array
+- Output is compact: a columnar.py product (float32 positions, float64
+  epochs) whose JSON manifest also carries names and absolute magnitudes
+
+Supported catalogs:
+- CSV with a header row (e.g. an SBDB query export): name/full_name/pdes,
+  e, q or a, i, om/node, w/peri, and tp or ma + epoch
+- Saved SBDB query API JSON ({"fields": [...], "data": [[...], ...]})
+- MPC MPCORB.DAT fixed-width files
+
+Usage:
+    python3 catalog_propagation.py --catalog sbdb_asteroids.csv
+    python3 catalog_propagation.py --catalog MPCORB.DAT --limit 100000 --workers 8
+
+Author: 3IAtlas Development Team
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from columnar import write_columnar
+from conic import GM_SUN, propagate
+from ephemeris import date_to_jd
+from parallel import (
+    SharedArray, attached, balanced_chunk_size, chunk_ranges, close_all,
+    default_workers, run_chunks
+)
+
+CATALOG_FILE = "small_body_catalog.csv"
+OUTPUT_FILE = "../frontend/public/data/small_bodies.json"
+SMALL_BODIES_OBJECT = 'small_bodies'
+
+DISCOVERY_DATE = "2025-07-01"
+FUTURE_DATE = "2026-03-31"
+
+# Accepted column names for each quantity (first match wins)
+COLUMN_ALIASES = {
+    'name': ('full_name', 'name', 'pdes', 'designation', 'spkid'),
+    'e': ('e',),
+    'q': ('q',),
+    'a': ('a',),
+    'i': ('i', 'incl'),
+    'om': ('om', 'node'),
+    'w': ('w', 'peri'),
+    'tp': ('tp',),
+    'ma': ('ma', 'm'),
+    'epoch': ('epoch', 'epoch_jd'),
+    'h': ('h',),
+}
+
+# MPC packed-date characters: 1-9, then A=10 ... V=31
+PACKED_DIGITS = {c: k for k, c in enumerate('0123456789ABCDEFGHIJKLMNOPQRSTUV')}
+PACKED_CENTURY = {'I': 1800, 'J': 1900, 'K': 2000}
+
+
+def _unpack_mpc_epoch(packed: str) -> float:
+    """MPC packed epoch (e.g. "K2555") to Julian Date"""
+    year = PACKED_CENTURY[packed[0]] + int(packed[1:3])
+    month, day = PACKED_DIGITS[packed[3]], PACKED_DIGITS[packed[4]]
+    return date_to_jd(f"{year:04d}-{month:02d}-{day:02d}")
+
+
+def _columns_from_rows(header: List[str], rows: List[List]) -> Dict[str, np.ndarray]:
+    """Pick the known quantities out of a tabular catalog"""
+    lookup = {name.strip().lower(): k for k, name in enumerate(header)}
+    columns = {}
+    for key, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in lookup:
+                k = lookup[alias]
+                values = [row[k] for row in rows]
+                if key == 'name':
+                    columns[key] = np.array([str(v).strip() for v in values])
+                else:
+                    columns[key] = np.array([float(v) if v not in (None, '') else np.nan
+                                             for v in values])
+                break
+    return columns
+
+
+def read_csv_catalog(path: str) -> Dict[str, np.ndarray]:
+    with open(path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = [row for row in reader if row]
+    return _columns_from_rows(header, rows)
+
+
+def read_sbdb_catalog(path: str) -> Dict[str, np.ndarray]:
+    with open(path, 'r') as f:
+        data = json.load(f)
+    return _columns_from_rows(data['fields'], data['data'])
+
+
+def read_mpcorb_catalog(path: str) -> Dict[str, np.ndarray]:
+    """MPCORB.DAT: fixed-width orbit records (header lines are skipped)"""
+    names, h, epoch, values = [], [], [], []
+    with open(path, 'r', errors='replace') as f:
+        for line in f:
+            if len(line) < 103:
+                continue
+            try:
+                record_epoch = _unpack_mpc_epoch(line[20:25])
+                # M, Peri, Node, Incl, e, a
+                record = [float(line[26:35]), float(line[37:46]), float(line[48:57]),
+                          float(line[59:68]), float(line[70:79]), float(line[92:103])]
+                magnitude = float(line[8:13]) if line[8:13].strip() else np.nan
+            except (KeyError, ValueError, IndexError):
+                continue
+            epoch.append(record_epoch)
+            values.append(record)
+            h.append(magnitude)
+            names.append(line[166:194].strip() or line[0:7].strip())
+
+    values = np.array(values).reshape(-1, 6)
+    return {
+        'name': np.array(names), 'h': np.array(h), 'epoch': np.array(epoch),
+        'ma': values[:, 0], 'w': values[:, 1], 'om': values[:, 2], 'i': values[:, 3],
+        'e': values[:, 4], 'a': values[:, 5],
+    }
+
+
+def read_catalog(path: str) -> Dict[str, np.ndarray]:
+    """Read any supported catalog format"""
+    if path.lower().endswith('.json'):
+        return read_sbdb_catalog(path)
+    if path.lower().endswith(('.dat', '.txt')):
+        return read_mpcorb_catalog(path)
+    return read_csv_catalog(path)
+
+
+def catalog_elements(columns: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """(N, 6) cometary elements and a mask of the rows that were usable
+
+    Perihelion distance comes from a(1 - e) when only a is given; the
+    perihelion time from the mean anomaly at epoch for elliptic orbits.
+    """
+    count = len(columns['e'])
+    nan = np.full(count, np.nan)
+    e = columns['e']
+
+    q = columns.get('q', nan)
+    if 'a' in columns:
+        q = np.where(np.isnan(q), columns['a'] * (1 - e), q)
+
+    tp = columns.get('tp', nan)
+    if 'ma' in columns and 'epoch' in columns:
+        a = q / (1 - e)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            n = np.sqrt(GM_SUN / a ** 3)                        # rad/day
+            tp_from_ma = columns['epoch'] - np.radians(columns['ma']) / n
+        tp = np.where(np.isnan(tp) & (e < 1), tp_from_ma, tp)
+
+    elements = np.stack([e, q, tp, columns.get('om', nan), columns.get('w', nan),
+                         columns.get('i', nan)], axis=1)
+    valid = np.all(np.isfinite(elements), axis=1) & (q > 0) & (e >= 0)
+    return elements, valid
+
+
+def _propagate_chunk(task: Tuple) -> None:
+    """Worker: propagate bodies[start:stop] into the shared position array"""
+    elements_spec, jd_spec, out_spec, start, stop = task
+    with attached(elements_spec) as elements, attached(jd_spec) as jd, \
+            attached(out_spec) as out:
+        position, _ = propagate(elements[start:stop], jd)      # (T, n, 3)
+        out[:, start:stop] = position
+
+
+def propagate_catalog(elements: np.ndarray, jd: np.ndarray,
+                      workers: Optional[int] = None) -> np.ndarray:
+    """Positions (epochs, bodies, 3) as float32, propagated in a process pool"""
+    workers = workers or default_workers()
+    shared: List[SharedArray] = []
+    try:
+        elements_sh = SharedArray.from_array(elements)
+        jd_sh = SharedArray.from_array(jd)
+        out_sh = SharedArray((len(jd), len(elements), 3), dtype=np.float32)
+        shared = [elements_sh, jd_sh, out_sh]
+
+        size = balanced_chunk_size(len(elements), workers, minimum=512)
+        run_chunks(_propagate_chunk, [
+            (elements_sh.spec(), jd_sh.spec(), out_sh.spec(), start, stop)
+            for start, stop in chunk_ranges(len(elements), size)
+        ], workers)
+
+        return out_sh.array.copy()
+    finally:
+        close_all(shared)
+
+
+def write_positions(path: str, positions: np.ndarray, jd: np.ndarray, names: np.ndarray,
+                    metadata: Dict, magnitudes: Optional[np.ndarray] = None) -> str:
+    """Write positions as one columnar object, 'small_bodies' [epoch][body][x, y, z]
+
+    Names (and H magnitudes, if known) go into the manifest alongside.
+    """
+    extra = {'names': names.tolist()}
+    if magnitudes is not None:
+        extra['h'] = [None if np.isnan(v) else round(float(v), 2) for v in magnitudes]
+    objects = {SMALL_BODIES_OBJECT: {'jd': jd, 'position': positions}}
+    return write_columnar(path, objects, metadata, position_dtype='<f4', extra=extra)
+
+
+def main():
+    """Propagate a local small-body catalog"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Propagate a small-body element catalog in a process pool"
+    )
+    parser.add_argument('--catalog', default=CATALOG_FILE, help='CSV, SBDB JSON or MPCORB.DAT')
+    parser.add_argument('--start', default=DISCOVERY_DATE, help='First epoch')
+    parser.add_argument('--end', default=FUTURE_DATE, help='Last epoch')
+    parser.add_argument('--step-days', type=float, default=5.0, help='Output cadence')
+    parser.add_argument('--limit', type=int, default=None, help='Use the first N bodies')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes')
+    parser.add_argument('--output', default=OUTPUT_FILE, help='Manifest file to write')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.catalog):
+        print(f"✗ Catalog not found: {args.catalog}")
+        sys.exit(1)
+
+    t_start = time.perf_counter()
+    columns = read_catalog(args.catalog)
+    elements, valid = catalog_elements(columns)
+    if args.limit:
+        valid &= np.cumsum(valid) <= args.limit
+    elements = elements[valid]
+    names = columns.get('name', np.arange(len(valid)).astype(str))[valid]
+    magnitudes = columns['h'][valid] if 'h' in columns else None
+    t_read = time.perf_counter() - t_start
+
+    print(f"✓ Read {len(elements):,} bodies from {args.catalog} "
+          f"({(~valid).sum():,} skipped) in {t_read:.2f} s")
+    if not len(elements):
+        sys.exit(1)
+
+    jd = np.arange(date_to_jd(args.start), date_to_jd(args.end) + 1e-9, args.step_days)
+    workers = args.workers or default_workers()
+
+    t_start = time.perf_counter()
+    positions = propagate_catalog(elements, jd, workers)
+    elapsed = time.perf_counter() - t_start
+
+    metadata = {
+        'generated': datetime.now().isoformat(),
+        'catalog': os.path.basename(args.catalog),
+        'bodies': len(elements),
+        'epochs': len(jd),
+        'method': 'two-body conic',
+        'frame': 'heliocentric J2000 ecliptic',
+        'units': {'distance': 'AU', 'time': 'JD TDB'},
+    }
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    data_path = write_positions(args.output, positions, jd, names, metadata, magnitudes)
+
+    print(f"✓ Propagated {len(elements):,} bodies x {len(jd)} epochs on {workers} worker(s) "
+          f"in {elapsed:.2f} s")
+    print(f"✓ Positions saved to: {data_path} ({os.path.getsize(data_path):,} bytes)")
+    print(f"✓ Manifest saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
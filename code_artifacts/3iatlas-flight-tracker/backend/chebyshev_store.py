@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Chebyshev-Compressed Ephemeris Store
+====================================
+
+Compiles the stored state vectors into per-segment Chebyshev polynomials,
+following the scheme of the JPL DE ephemerides and SPK types 2/3: each body's
+time span is split into equal-length segments and each coordinate is a
+Chebyshev series in normalized time within its segment.
+
+- The compiler halves the segment length until the fit reproduces every
+  stored sample to the requested tolerance, or until a segment would hold
+  too few samples to fit; a body that stops short is recorded with
+  tolerance_met: false and its actual max error (e.g. planet centers whose
+  satellite-induced wobble is faster than the sample step)
+- Equal segments make lookup constant-time: one division finds the segment
+- Velocity comes from the analytic derivative of the position series
+- Coefficient files are a small fraction of the raw JSON
+
+Usage:
+    python3 chebyshev_store.py                           # compile trajectory_static.json
+    python3 chebyshev_store.py --input FILE --tolerance 1e-8 --degree 10
+
+Author: 3IAtlas Development Team
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from ephemeris import EphemerisSeries, load_ephemerides
+
+AU_TO_KM = 149597870.7
+TRAJECTORY_FILE = "../frontend/public/data/trajectory_static.json"
+OUTPUT_FILE = "../frontend/public/data/ephemeris_chebyshev.json"
+
+DEFAULT_TOLERANCE = 1e-9   # AU (~150 m)
+DEFAULT_DEGREE = 12
+
+
+def _chebyshev_matrix(tau: np.ndarray, degree: int) -> Tuple[np.ndarray, np.ndarray]:
+    """T_k(tau) and dT_k/dtau for k = 0..degree, shaped (degree+1, len(tau))"""
+    T = np.empty((degree + 1, len(tau)))
+    dT = np.empty((degree + 1, len(tau)))
+    T[0], dT[0] = 1.0, 0.0
+    if degree >= 1:
+        T[1], dT[1] = tau, 1.0
+    for k in range(1, degree):
+        T[k + 1] = 2 * tau * T[k] - T[k - 1]
+        dT[k + 1] = 2 * T[k] + 2 * tau * dT[k] - dT[k - 1]
+    return T, dT
+
+
+def fit_segments(series: EphemerisSeries, segments: int, degree: int) -> Optional[np.ndarray]:
+    """Chebyshev coefficients (segments, 3, degree+1) fitted to the series
+
+    Each segment is a least-squares fit to the stored positions and
+    velocities that fall inside it (boundary samples count for both
+    neighbours). Velocity rows are weighted by the sample spacing so both
+    constraint types are in position units. Returns None if a segment has too
+    few samples to determine its coefficients.
+    """
+    length = (series.end - series.start) / segments
+    spacing = float(np.median(np.diff(series.jd)))
+    u = (series.jd - series.start) / length
+    coeffs = np.empty((segments, 3, degree + 1))
+
+    for seg in range(segments):
+        inside = (u >= seg - 1e-9) & (u <= seg + 1 + 1e-9)
+        if 2 * inside.sum() < degree + 1:
+            return None
+
+        tau = 2 * (u[inside] - seg) - 1
+        T, dT = _chebyshev_matrix(tau, degree)
+        design = np.vstack([T.T, dT.T * (2 / length) * spacing])
+        target = np.vstack([series.position[inside], series.velocity[inside] * spacing])
+
+        solution, *_ = np.linalg.lstsq(design, target, rcond=None)
+        coeffs[seg] = solution.T
+
+    return coeffs
+
+
+class ChebyshevSeries:
+    """Uniform-segment Chebyshev representation of one body"""
+
+    def __init__(self, start_jd: float, segment_days: float, coefficients: np.ndarray,
+                 name: str = ''):
+        self.name = name
+        self.start = start_jd
+        self.segment_days = segment_days
+        self.coefficients = np.asarray(coefficients, dtype=np.float64)
+
+    @property
+    def end(self) -> float:
+        return self.start + self.segment_days * len(self.coefficients)
+
+    @property
+    def degree(self) -> int:
+        return self.coefficients.shape[2] - 1
+
+    def evaluate(self, jd) -> Tuple[np.ndarray, np.ndarray]:
+        """Position (AU) and velocity (AU/day) at arbitrary epochs, (T, 3) each"""
+        jd = np.atleast_1d(np.asarray(jd, dtype=np.float64))
+        u = (jd - self.start) / self.segment_days
+        idx = np.clip(np.floor(u).astype(np.int64), 0, len(self.coefficients) - 1)
+        tau = 2 * (u - idx) - 1
+
+        T, dT = _chebyshev_matrix(tau, self.degree)
+        coeffs = self.coefficients[idx]                       # (T, 3, n+1)
+        position = np.einsum('tck,kt->tc', coeffs, T)
+        velocity = np.einsum('tck,kt->tc', coeffs, dT) * (2 / self.segment_days)
+        return position, velocity
+
+    def to_dict(self) -> Dict:
+        return {
+            'start_jd': self.start,
+            'end_jd': self.end,
+            'segment_days': self.segment_days,
+            'segments': len(self.coefficients),
+            'degree': self.degree,
+            'coefficients': self.coefficients.ravel().tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, name: str = '') -> 'ChebyshevSeries':
+        coeffs = np.array(data['coefficients']).reshape(data['segments'], 3, data['degree'] + 1)
+        return cls(data['start_jd'], data['segment_days'], coeffs, name=name)
+
+
+def compile_series(series: EphemerisSeries, tolerance: float = DEFAULT_TOLERANCE,
+                   degree: int = DEFAULT_DEGREE) -> Tuple[ChebyshevSeries, Dict]:
+    """Find the coarsest segmentation meeting the tolerance on stored samples
+
+    If the samples run out first, the finest fit is returned and the stats
+    say tolerance_met: False.
+    """
+    best = None
+    segments = 1
+    while True:
+        coeffs = fit_segments(series, segments, degree)
+        if coeffs is None:
+            break
+
+        # Round to well below the tolerance; keeps the file compact
+        digits = int(np.ceil(-np.log10(tolerance / 100)))
+        compiled = ChebyshevSeries(series.start, (series.end - series.start) / segments,
+                                   np.round(coeffs, digits), name=series.name)
+        position, velocity = compiled.evaluate(series.jd)
+        pos_error = float(np.linalg.norm(position - series.position, axis=1).max())
+        best = (compiled, pos_error, velocity)
+
+        if pos_error <= tolerance:
+            break
+        segments *= 2
+
+    if best is None:
+        raise ValueError(f"Too few samples to fit degree {degree} for {series.name}")
+
+    compiled, pos_error, velocity = best
+    vel_error = np.linalg.norm(velocity - series.velocity, axis=1).max()
+    return compiled, {
+        'max_position_error_au': pos_error,
+        'max_velocity_error_au_per_day': float(vel_error),
+        'tolerance_met': pos_error <= tolerance,
+    }
+
+
+class ChebyshevEphemeris:
+    """All compiled bodies from one coefficient file"""
+
+    def __init__(self, bodies: Dict[str, ChebyshevSeries], metadata: Optional[Dict] = None):
+        self.bodies = bodies
+        self.metadata = metadata or {}
+
+    @classmethod
+    def load(cls, path: str = OUTPUT_FILE) -> 'ChebyshevEphemeris':
+        with open(path, 'r') as f:
+            data = json.load(f)
+        bodies = {name: ChebyshevSeries.from_dict(body, name)
+                  for name, body in data['objects'].items()}
+        return cls(bodies, data.get('metadata'))
+
+    def evaluate(self, name: str, jd) -> Tuple[np.ndarray, np.ndarray]:
+        return self.bodies[name].evaluate(jd)
+
+
+def compile_file(input_path: str, output_path: str, tolerance: float = DEFAULT_TOLERANCE,
+                 degree: int = DEFAULT_DEGREE) -> Dict:
+    """Compile every body in a stored product and write the coefficient file"""
+    stored = load_ephemerides(input_path)
+    objects, stats = {}, {}
+
+    for name, series in stored.items():
+        compiled, errors = compile_series(series, tolerance, degree)
+        objects[name] = compiled.to_dict()
+        stats[name] = dict(errors, segments=len(compiled.coefficients),
+                           segment_days=compiled.segment_days, samples=len(series))
+
+    product = {
+        'metadata': {
+            'generated': datetime.now().isoformat(),
+            'source_file': os.path.basename(input_path),
+            'tolerance_au': tolerance,
+            'tolerance_met': all(fit['tolerance_met'] for fit in stats.values()),
+            'degree': degree,
+            'layout': 'coefficients[segment][axis][k], tau = 2 * (jd - seg_start) / segment_days - 1',
+            'units': {'distance': 'AU', 'velocity': 'AU/day', 'time': 'JD TDB'},
+            'fit': stats,
+        },
+        'objects': objects,
+    }
+
+    with open(output_path, 'w') as f:
+        json.dump(product, f, separators=(',', ':'))
+    return product
+
+
+def main():
+    """Compile a stored trajectory product into Chebyshev coefficients"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compile stored ephemerides into Chebyshev segments"
+    )
+    parser.add_argument('--input', default=TRAJECTORY_FILE, help='Stored trajectory product')
+    parser.add_argument('--output', default=OUTPUT_FILE, help='Coefficient file to write')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Max position error on stored samples (AU)')
+    parser.add_argument('--degree', type=int, default=DEFAULT_DEGREE, help='Chebyshev degree')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"✗ Input not found: {args.input}")
+        sys.exit(1)
+
+    product = compile_file(args.input, args.output, args.tolerance, args.degree)
+
+    for name, fit in product['metadata']['fit'].items():
+        print(f"{name:10s}: {fit['samples']:5d} samples -> {fit['segments']:3d} segments "
+              f"of {fit['segment_days']:.2f} d, max error "
+              f"{fit['max_position_error_au'] * AU_TO_KM:.3f} km")
+
+    missed = [name for name, fit in product['metadata']['fit'].items()
+              if not fit['tolerance_met']]
+    if missed:
+        print(f"⚠ Tolerance {args.tolerance:g} AU ({args.tolerance * AU_TO_KM:.3f} km) not met "
+              f"for {', '.join(missed)}: too few samples per segment to subdivide further")
+
+    in_size = os.path.getsize(args.input)
+    out_size = os.path.getsize(args.output)
+    print(f"✓ {in_size:,} bytes -> {out_size:,} bytes ({in_size / out_size:.1f}x smaller)")
+    print(f"✓ Coefficients saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
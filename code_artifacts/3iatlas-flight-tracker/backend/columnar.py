@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Binary Columnar Trajectory Format
+=================================
+
+Compact alternative to the indent=2 JSON products: one little-endian binary
+file of column blocks plus a small JSON manifest describing them, so a
+browser can map each block straight into a Float64Array/Float32Array (e.g.
+for a three.js BufferGeometry) and Python can np.memmap it without parsing.
+
+Layout:
+- <name>.json  manifest: format tag, data_file, byte size, product metadata,
+  time axes and, per object, each column's offset, dtype, shape and units
+- <name>.bin   blocks at 8-byte aligned offsets; every column's first axis
+  is its object's time axis, and objects sampled on identical epochs share
+  one axis block
+
+Column dtypes:
+- time axes float64 (JD TDB)
+- position float64 by default (float32 rounds to ~50 km at 5 AU), or
+  float32 for render-only products
+- velocity and derived scalar/vector columns float32
+
+Usage:
+    python3 columnar.py --input ../frontend/public/data/trajectory_static.json
+    python3 columnar.py --input ../frontend/public/data/SOLAR_SYSTEM_POSITIONS.json --float32
+    python3 columnar.py --read ../frontend/public/data/trajectory_static.columnar.json
+
+Author: 3IAtlas Development Team
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ephemeris import _vector, date_to_jd, jd_to_datetime, object_key
+
+FORMAT = '3iatlas-columnar/1'
+ALIGNMENT = 8
+
+# Record keys that are not exported as extra columns
+RESERVED_KEYS = {'jd', 'date', 'object', 'note', 'position', 'velocity',
+                 'position_au', 'velocity_au_per_day'}
+
+# Units by column name (or name suffix for derived columns)
+COLUMN_UNITS = {
+    'position': 'AU',
+    'velocity': 'AU/day',
+    'au': 'AU',
+    'kms': 'km/s',
+    'min': 'minutes',
+}
+
+
+def _units(column: str) -> str:
+    return COLUMN_UNITS.get(column, COLUMN_UNITS.get(column.rsplit('_', 1)[-1], ''))
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _grouped_records(data) -> Dict[str, List[Dict]]:
+    """Records per normalized object key for both stored layouts"""
+    grouped: Dict[str, List[Dict]] = {}
+    if isinstance(data, list):
+        for point in data:
+            grouped.setdefault(object_key(point.get('object', 'atlas')), []).append(point)
+    else:
+        for name, records in data.items():
+            if isinstance(records, list) and records and isinstance(records[0], dict) \
+                    and ('position' in records[0] or 'position_au' in records[0]):
+                grouped[object_key(name)] = records
+    return grouped
+
+
+def _extra_column(records: List[Dict], key: str) -> Optional[np.ndarray]:
+    """Numeric or {x,y,z} column over all records; missing values are NaN"""
+    sample = next(point[key] for point in records if key in point)
+    if isinstance(sample, bool):
+        return np.array([point.get(key, False) for point in records], dtype=np.uint8)
+    if isinstance(sample, (int, float)):
+        return np.array([point.get(key, np.nan) for point in records], dtype=np.float64)
+    if isinstance(sample, dict) and 'x' in sample:
+        blank = [np.nan] * 3
+        return np.array([_vector(point[key]) if key in point else blank for point in records],
+                        dtype=np.float64)
+    return None
+
+
+def columns_from_records(records: List[Dict]) -> Dict[str, np.ndarray]:
+    """jd, position, velocity and any extra numeric columns of one object"""
+    columns = {
+        'jd': np.array([point['jd'] if 'jd' in point else date_to_jd(point['date'])
+                        for point in records], dtype=np.float64),
+        'position': np.array([_vector(point.get('position', point.get('position_au')))
+                              for point in records], dtype=np.float64),
+        'velocity': np.array([_vector(point.get('velocity', point.get('velocity_au_per_day')))
+                              for point in records], dtype=np.float64),
+    }
+    extras = sorted({key for point in records for key in point} - RESERVED_KEYS)
+    for key in extras:
+        values = _extra_column(records, key)
+        if values is not None:
+            columns[key] = values
+    return columns
+
+
+def columns_from_product(data) -> Dict[str, Dict[str, np.ndarray]]:
+    """Columns for every object of a stored JSON product"""
+    return {name: columns_from_records(records)
+            for name, records in _grouped_records(data).items()}
+
+
+def _column_dtype(column: str, values: np.ndarray, position_dtype: str) -> str:
+    if values.dtype == np.uint8:
+        return '|u1'
+    return position_dtype if column == 'position' else '<f4'
+
+
+def write_columnar(path: str, objects: Dict[str, Dict[str, np.ndarray]],
+                   metadata: Optional[Dict] = None, position_dtype: str = '<f8',
+                   extra: Optional[Dict] = None) -> str:
+    """Write objects ({name: {'jd': (T,), column: (T, ...)}}) as manifest + .bin
+
+    Objects with identical epochs share one time axis. Returns the data path.
+    """
+    data_path = os.path.splitext(path)[0] + '.bin'
+    axes: List[Dict] = []
+    axis_arrays: List[np.ndarray] = []
+    entries: Dict[str, Dict] = {}
+    blocks: List[Tuple[int, bytes]] = []
+    offset = 0
+
+    def add_block(values: np.ndarray, dtype: str) -> Dict:
+        nonlocal offset
+        offset = _aligned(offset)
+        raw = np.ascontiguousarray(values, dtype=dtype).tobytes()
+        block = {'offset': offset, 'dtype': dtype, 'shape': list(values.shape)}
+        blocks.append((offset, raw))
+        offset += len(raw)
+        return block
+
+    for name, columns in objects.items():
+        jd = np.asarray(columns['jd'], dtype=np.float64)
+        axis = next((k for k, known in enumerate(axis_arrays)
+                     if len(known) == len(jd) and np.array_equal(known, jd)), None)
+        if axis is None:
+            axis = len(axes)
+            axis_arrays.append(jd)
+            axes.append(dict(add_block(jd, '<f8'), units='JD TDB'))
+
+        entry = {'axis': axis, 'columns': {}}
+        for column, values in columns.items():
+            if column == 'jd':
+                continue
+            values = np.asarray(values)
+            block = add_block(values, _column_dtype(column, values, position_dtype))
+            units = _units(column)
+            if units:
+                block['units'] = units
+            entry['columns'][column] = block
+        entries[name] = entry
+
+    with open(data_path, 'wb') as f:
+        for start, raw in blocks:
+            f.seek(start)
+            f.write(raw)
+
+    manifest = {
+        'format': FORMAT,
+        'data_file': os.path.basename(data_path),
+        'bytes': offset,
+        'byte_order': 'little',
+        'metadata': metadata or {},
+        'axes': axes,
+        'objects': entries,
+    }
+    manifest.update(extra or {})
+    with open(path, 'w') as f:
+        json.dump(manifest, f, separators=(',', ':'))
+    return data_path
+
+
+def is_columnar(data) -> bool:
+    """True for a loaded columnar manifest"""
+    return isinstance(data, dict) and data.get('format') == FORMAT
+
+
+def read_manifest(path: str) -> Dict:
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+    if not is_columnar(manifest):
+        raise ValueError(f"{path} is not a {FORMAT} manifest")
+    return manifest
+
+
+def columns_from_manifest(manifest: Dict, directory: str,
+                          objects: Optional[List[str]] = None) -> Dict[str, Dict[str, np.ndarray]]:
+    """Memory-mapped columns for the objects of a loaded manifest"""
+    blob = np.memmap(os.path.join(directory, manifest['data_file']), dtype=np.uint8, mode='r')
+
+    def view(block: Dict) -> np.ndarray:
+        dtype = np.dtype(block['dtype'])
+        count = int(np.prod(block['shape']))
+        start = block['offset']
+        return blob[start:start + count * dtype.itemsize].view(dtype).reshape(block['shape'])
+
+    result = {}
+    for name, entry in manifest['objects'].items():
+        if objects is not None and name not in objects:
+            continue
+        columns = {'jd': view(manifest['axes'][entry['axis']])}
+        columns.update({column: view(block) for column, block in entry['columns'].items()})
+        result[name] = columns
+    return result
+
+
+def read_columnar(path: str, objects: Optional[List[str]] = None) -> Dict[str, Dict[str, np.ndarray]]:
+    """Columns of a columnar product ({name: {'jd': ..., column: ...}})"""
+    return columns_from_manifest(read_manifest(path), os.path.dirname(path), objects)
+
+
+def records_from_columns(columns: Dict[str, np.ndarray]) -> List[Dict]:
+    """Generator-layout records (trajectory_static.json) from one object's columns"""
+    records = []
+    extras = [key for key in columns if key not in ('jd', 'position', 'velocity')]
+    for k, jd in enumerate(columns['jd']):
+        pos, vel = columns['position'][k], columns['velocity'][k]
+        point = {
+            'jd': float(jd),
+            'date': jd_to_datetime(jd).strftime('%Y-%m-%d %H:%M:%S'),
+            'position': {'x': float(pos[0]), 'y': float(pos[1]), 'z': float(pos[2])},
+            'velocity': {'x': float(vel[0]), 'y': float(vel[1]), 'z': float(vel[2])},
+        }
+        for key in extras:
+            value = columns[key][k]
+            if columns[key].dtype == np.uint8:
+                if value:
+                    point[key] = True
+            elif np.ndim(value):
+                if not np.isnan(value).any():
+                    point[key] = {'x': float(value[0]), 'y': float(value[1]), 'z': float(value[2])}
+            elif not np.isnan(value):
+                point[key] = float(value)
+        records.append(point)
+    return records
+
+
+def columnar_path(json_path: str) -> str:
+    """Default manifest path next to a JSON product (x.json -> x.columnar.json)"""
+    return os.path.splitext(json_path)[0] + '.columnar.json'
+
+
+def write_product(data, path: str, position_dtype: str = '<f8') -> str:
+    """Convert a loaded stored JSON product to the columnar format"""
+    metadata = data.get('metadata', {}) if isinstance(data, dict) else {}
+    return write_columnar(path, columns_from_product(data), metadata, position_dtype)
+
+
+def main():
+    """Convert a stored JSON product to the columnar format, or inspect one"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Binary columnar trajectory format")
+    parser.add_argument('--input', default=None, help='Stored JSON product to convert')
+    parser.add_argument('--output', default=None, help='Manifest path (default: *.columnar.json)')
+    parser.add_argument('--float32', action='store_true', help='Store positions as float32')
+    parser.add_argument('--read', default=None, metavar='MANIFEST', help='Summarize a manifest')
+    args = parser.parse_args()
+
+    if args.read:
+        t_start = time.perf_counter()
+        objects = read_columnar(args.read)
+        elapsed = time.perf_counter() - t_start
+        for name, columns in objects.items():
+            shapes = ', '.join(f"{key} {tuple(values.shape)}" for key, values in columns.items())
+            print(f"  {name:10s} {shapes}")
+        print(f"✓ Mapped {len(objects)} objects in {elapsed * 1000:.1f} ms")
+        return
+
+    if not args.input:
+        parser.error("--input or --read is required")
+
+    try:
+        t_start = time.perf_counter()
+        with open(args.input, 'r') as f:
+            data = json.load(f)
+        json_seconds = time.perf_counter() - t_start
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"✗ Cannot read {args.input}: {e}")
+        sys.exit(1)
+
+    output = args.output or columnar_path(args.input)
+    data_path = write_product(data, output, '<f4' if args.float32 else '<f8')
+
+    t_start = time.perf_counter()
+    objects = read_columnar(output)
+    for columns in objects.values():
+        for values in columns.values():
+            np.asarray(values).sum()
+    binary_seconds = time.perf_counter() - t_start
+
+    json_bytes = os.path.getsize(args.input)
+    binary_bytes = os.path.getsize(data_path) + os.path.getsize(output)
+    print(f"✓ {len(objects)} objects: {json_bytes:,} bytes JSON -> {binary_bytes:,} bytes "
+          f"({json_bytes / binary_bytes:.1f}x smaller)")
+    print(f"✓ Load: JSON {json_seconds * 1000:.1f} ms, columnar {binary_seconds * 1000:.1f} ms")
+    print(f"✓ Saved to: {output} + {os.path.basename(data_path)}")
+
+
+if __name__ == "__main__":
+    main()
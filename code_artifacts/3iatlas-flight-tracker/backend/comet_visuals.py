@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Precomputed Comet Visual Parameters
+===================================
+
+Adds the numbers Comet3D needs to orient and light the comet to every
+stored 3I/ATLAS record, so tail geometry comes from the trajectory itself
+and is identical in every client.
+
+Columns (added next to 'position' and 'velocity', stored frame):
+- anti_solar     unit vector pointing away from the Sun (ion tail)
+- dust_tail      unit vector from the nucleus to dust released DUST_AGE_DAYS
+                 earlier (lags behind the anti-solar direction)
+- dust_tail_au   length of that dust-tail offset
+- activity       (q / r)^n, 1 at perihelion and fading with distance; q is
+                 the perihelion distance of the fitted orbit
+                 (atlas_orbit_solution.json, written by orbit_fit.py), or
+                 of the JPL#26 elements when there is no solution yet
+
+Method:
+- The dust tail is the synchrone/syndyne point for one grain size: the
+  comet state at t - age becomes a grain orbit under reduced solar gravity
+  mu (1 - beta), propagated to t with conic.py (vectorized over epochs)
+- The activity index n is the photometric slope k1 / 2.5 (photometry.py)
+- Epochs closer than a few hours to the series start fall back to the
+  anti-solar direction
+
+Usage:
+    python3 comet_visuals.py                  # annotate trajectory_static.json
+    python3 comet_visuals.py --beta 0.5 --age-days 20
+
+Author: 3IAtlas Development Team
+"""
+
+import json
+import os
+import sys
+from typing import Dict, Optional
+
+import numpy as np
+
+from conic import GM_SUN, state_at_anomaly, state_to_elements, true_anomaly
+from ephemeris import EphemerisSeries, ephemerides_from_data, object_key, stack_records
+from orbit_fit import SOLUTION_FILE, load_solution
+from photometry import K1_ATLAS
+
+TRAJECTORY_FILE = "../frontend/public/data/trajectory_static.json"
+
+DEFAULT_TARGET = 'atlas'
+
+# Radiation-pressure / gravity ratio of the rendered grains (~1 micron dust)
+DUST_BETA = 0.3
+
+# Age of the dust whose direction defines the rendered tail
+DUST_AGE_DAYS = 10.0
+
+# Shortest usable dust age near the start of the series
+MIN_DUST_AGE_DAYS = 0.1
+
+# Activity: (q / r)^n with q from the fitted orbit solution
+SOLUTION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), SOLUTION_FILE)
+ACTIVITY_INDEX = K1_ATLAS / 2.5
+
+VECTOR_DECIMALS = 6
+SCALAR_DECIMALS = 6
+
+
+def anti_solar(position: np.ndarray) -> np.ndarray:
+    """Unit vectors pointing away from the Sun for (N, 3) heliocentric positions"""
+    return position / np.linalg.norm(position, axis=1)[:, None]
+
+
+def dust_offsets(series: EphemerisSeries, jd: np.ndarray, position: np.ndarray,
+                 beta: float = DUST_BETA, age_days: float = DUST_AGE_DAYS) -> np.ndarray:
+    """Grain position minus nucleus position (N, 3) at each epoch
+
+    Grains leave the nucleus at t - age with its velocity and then move on a
+    conic under mu (1 - beta). Release epochs are clamped to the series start.
+    """
+    release = np.maximum(jd - age_days, series.start)
+    mu = GM_SUN * (1.0 - beta)
+
+    release_pos, release_vel = series.interpolate(release)
+    elements = state_to_elements(release_pos, release_vel, release, mu=mu)
+    grain, _ = state_at_anomaly(elements, true_anomaly(elements, jd, mu), mu)
+
+    offset = grain - position
+    offset[jd - release < MIN_DUST_AGE_DAYS] = 0.0
+    return offset
+
+
+def perihelion_distance(path: str = SOLUTION_PATH) -> float:
+    """Perihelion distance q (AU) of the fitted ATLAS orbit
+
+    Without a readable solution, falls back to the JPL#26 elements the
+    generator's Kepler fallback uses, so the visual columns never block a save.
+    """
+    solution = load_solution(path)
+    try:
+        return float(solution['elements']['q'])
+    except (TypeError, KeyError, ValueError):
+        from generate_atlas_trajectory import OrbitalMechanicsCalculator
+        print(f"⚠ No orbit solution in {path}; activity uses the JPL#26 perihelion distance")
+        return float(OrbitalMechanicsCalculator.ATLAS_ELEMENTS['perihelion_au'])
+
+
+def activity_scale(r_au: np.ndarray, perihelion_au: Optional[float] = None,
+                   index: float = ACTIVITY_INDEX) -> np.ndarray:
+    """Relative activity (q / r)^n, clipped to [0, 1]"""
+    if perihelion_au is None:
+        perihelion_au = perihelion_distance()
+    return np.clip((perihelion_au / r_au) ** index, 0.0, 1.0)
+
+
+def visual_columns(series: EphemerisSeries, jd: np.ndarray, position: np.ndarray,
+                   beta: float = DUST_BETA, age_days: float = DUST_AGE_DAYS,
+                   perihelion_au: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """anti_solar, dust_tail, dust_tail_au and activity arrays for every epoch"""
+    sunward = anti_solar(position)
+    offset = dust_offsets(series, jd, position, beta, age_days)
+    length = np.linalg.norm(offset, axis=1)
+    tail = np.where(length[:, None] > 0, offset / np.where(length > 0, length, 1.0)[:, None],
+                    sunward)
+    return {
+        'anti_solar': sunward,
+        'dust_tail': tail,
+        'dust_tail_au': length,
+        'activity': activity_scale(np.linalg.norm(position, axis=1), perihelion_au),
+    }
+
+
+def attach_visuals(data: Dict, target: str = DEFAULT_TARGET, beta: float = DUST_BETA,
+                   age_days: float = DUST_AGE_DAYS) -> Dict:
+    """Add visual columns to the target's records in place
+
+    Returns the model parameters for the product metadata (empty if the
+    target is not in data).
+    """
+    ephemerides = ephemerides_from_data(data)
+    if target not in ephemerides:
+        return {}
+    perihelion_au = perihelion_distance()
+
+    for name, records in data.items():
+        if not (isinstance(records, list) and records and object_key(name) == target):
+            continue
+
+        jd, position, _ = stack_records(records)
+        columns = visual_columns(ephemerides[target], jd, position, beta, age_days,
+                                 perihelion_au)
+
+        for key in ('anti_solar', 'dust_tail'):
+            vectors = np.round(columns[key], VECTOR_DECIMALS).tolist()
+            for point, (x, y, z) in zip(records, vectors):
+                point[key] = {'x': x, 'y': y, 'z': z}
+        for key in ('dust_tail_au', 'activity'):
+            for point, value in zip(records, np.round(columns[key], SCALAR_DECIMALS).tolist()):
+                point[key] = value
+
+    return {
+        'dust_beta': beta,
+        'dust_age_days': age_days,
+        'activity_model': '(q / r)^n',
+        'perihelion_au': perihelion_au,
+        'activity_index': ACTIVITY_INDEX,
+    }
+
+
+def annotate(data: Dict, target: str = DEFAULT_TARGET, beta: float = DUST_BETA,
+             age_days: float = DUST_AGE_DAYS) -> Dict:
+    """attach_visuals() plus a 'comet_visuals' entry in the metadata"""
+    parameters = attach_visuals(data, target, beta, age_days)
+    if parameters and 'metadata' in data and isinstance(data['metadata'], dict):
+        data['metadata']['comet_visuals'] = parameters
+    return data
+
+
+def main():
+    """Add comet visual columns to an existing trajectory product"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precompute comet tail and activity parameters")
+    parser.add_argument('--input', default=TRAJECTORY_FILE, help='Trajectory product to annotate')
+    parser.add_argument('--output', default=None, help='Write here instead of in place')
+    parser.add_argument('--target', default=DEFAULT_TARGET, help='Comet to annotate')
+    parser.add_argument('--beta', type=float, default=DUST_BETA,
+                        help='Radiation-pressure ratio of the rendered dust')
+    parser.add_argument('--age-days', type=float, default=DUST_AGE_DAYS,
+                        help='Age of the dust defining the tail direction')
+    args = parser.parse_args()
+
+    try:
+        with open(args.input, 'r') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"✗ Cannot read {args.input}: {e}")
+        sys.exit(1)
+
+    annotate(data, args.target, args.beta, args.age_days)
+    if 'comet_visuals' not in data.get('metadata', {}):
+        print(f"✗ No '{args.target}' records in {args.input}")
+        sys.exit(1)
+
+    records = next(v for k, v in data.items() if isinstance(v, list) and object_key(k) == args.target)
+    lag = [np.degrees(np.arccos(np.clip(
+        sum(p['anti_solar'][c] * p['dust_tail'][c] for c in 'xyz'), -1, 1))) for p in records]
+    print(f"✓ {len(records)} records: dust tail lags anti-solar by "
+          f"{min(lag):.1f}-{max(lag):.1f}°, activity "
+          f"{min(p['activity'] for p in records):.3f}-{max(p['activity'] for p in records):.3f}")
+
+    output = args.output or args.input
+    with open(output, 'w') as f:
+        json.dump(data, f, indent=2)
+    print(f"✓ Saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
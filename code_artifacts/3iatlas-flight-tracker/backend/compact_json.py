@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Streaming Compact JSON Writer
+=============================
+
+Writes the trajectory products without indentation and with floats rounded
+to a fixed number of decimals, one record at a time, so files shrink 2-3x
+and serialization uses the C encoder instead of json.dump(indent=2)'s
+pure-Python path. The JSON structure (keys, nesting, value types) is exactly
+what json.dump would write; only whitespace and float digits change.
+
+Method:
+- Top-level keys are written in order; list values are streamed record by
+  record (lists, tuples or any iterable, e.g. a generator of records)
+- Each record is rounded recursively and encoded with compact separators
+- DEFAULT_DECIMALS = 9: 1e-9 AU is ~150 m and 1e-9 AU/day ~2 mm/s, far below
+  the Horizons vector accuracy; Julian Dates keep sub-millisecond resolution
+
+Usage:
+    from compact_json import write_json
+    write_json(path, data)                   # whole product
+    with JsonStreamWriter(path) as writer:   # incremental
+        writer.write_records('atlas', records)
+        writer.write_value('metadata', metadata)
+
+    python3 compact_json.py --input ../frontend/public/data/trajectory_static.json --output /tmp/t.json
+
+Author: 3IAtlas Development Team
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Any, Iterable, Optional
+
+DEFAULT_DECIMALS = 9
+
+_encoder = json.JSONEncoder(separators=(',', ':'))
+
+
+def rounded(value: Any, decimals: Optional[int] = DEFAULT_DECIMALS) -> Any:
+    """Copy of value with every float rounded to decimals (None: unchanged)"""
+    if decimals is None:
+        return value
+    if isinstance(value, float):
+        return round(value, decimals)
+    if isinstance(value, dict):
+        return {key: rounded(item, decimals) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [rounded(item, decimals) for item in value]
+    if hasattr(value, 'tolist'):                       # NumPy scalars and arrays
+        return rounded(value.tolist(), decimals)
+    return value
+
+
+def dumps(value: Any, decimals: Optional[int] = DEFAULT_DECIMALS) -> str:
+    """Compact, rounded JSON text of one value"""
+    return _encoder.encode(rounded(value, decimals))
+
+
+class JsonStreamWriter:
+    """Writes a top-level JSON object one key (and one record) at a time"""
+
+    def __init__(self, path: str, decimals: Optional[int] = DEFAULT_DECIMALS):
+        self.path = path
+        self.decimals = decimals
+        self._file = None
+        self._keys = 0
+
+    def __enter__(self) -> 'JsonStreamWriter':
+        self._file = open(self.path, 'w')
+        self._file.write('{')
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self._file.write('}\n')
+        finally:
+            self._file.close()
+
+    def _key(self, key: str) -> None:
+        if self._keys:
+            self._file.write(',')
+        self._file.write(_encoder.encode(key) + ':')
+        self._keys += 1
+
+    def write_value(self, key: str, value: Any) -> None:
+        """Write key: value in one piece"""
+        self._key(key)
+        self._file.write(dumps(value, self.decimals))
+
+    def write_records(self, key: str, records: Iterable) -> int:
+        """Stream key: [record, ...] and return the record count"""
+        self._key(key)
+        write = self._file.write
+        write('[')
+        count = 0
+        for record in records:
+            if count:
+                write(',')
+            write(dumps(record, self.decimals))
+            count += 1
+        write(']')
+        return count
+
+
+def write_json(path: str, data: Any, decimals: Optional[int] = DEFAULT_DECIMALS) -> int:
+    """Write a product compactly; returns the file size in bytes
+
+    Top-level dicts are streamed key by key with list values record by
+    record; any other top-level value (e.g. a flat record list) is streamed
+    as an array.
+    """
+    if isinstance(data, dict):
+        with JsonStreamWriter(path, decimals) as writer:
+            for key, value in data.items():
+                if isinstance(value, (list, tuple)):
+                    writer.write_records(key, value)
+                else:
+                    writer.write_value(key, value)
+    else:
+        with open(path, 'w') as f:
+            f.write('[')
+            for count, record in enumerate(data):
+                f.write((',' if count else '') + dumps(record, decimals))
+            f.write(']\n')
+    return os.path.getsize(path)
+
+
+def main():
+    """Rewrite a stored JSON product compactly and report the savings"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compact, precision-controlled JSON rewrite")
+    parser.add_argument('--input', required=True, help='JSON product to rewrite')
+    parser.add_argument('--output', default=None, help='Write here instead of in place')
+    parser.add_argument('--decimals', type=int, default=DEFAULT_DECIMALS,
+                        help='Decimal places kept for floats')
+    args = parser.parse_args()
+
+    try:
+        with open(args.input, 'r') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"✗ Cannot read {args.input}: {e}")
+        sys.exit(1)
+
+    original = os.path.getsize(args.input)
+    t_start = time.perf_counter()
+    json.dumps(data, indent=2)
+    indent_seconds = time.perf_counter() - t_start
+
+    output = args.output or args.input
+    t_start = time.perf_counter()
+    size = write_json(output, data, args.decimals)
+    compact_seconds = time.perf_counter() - t_start
+
+    print(f"✓ {original:,} -> {size:,} bytes ({original / size:.1f}x smaller)")
+    print(f"✓ Serialization: indent=2 {indent_seconds * 1000:.0f} ms, "
+          f"compact {compact_seconds * 1000:.0f} ms")
+    print(f"✓ Saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
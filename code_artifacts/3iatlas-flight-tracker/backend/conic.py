@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Vectorized Two-Body Conic Propagation
+=====================================
+
+Converts heliocentric cometary orbital elements to state vectors (and back)
+for any number of orbits and epochs at once. Elliptic, parabolic and
+hyperbolic orbits are all supported, so the same code serves 3I/ATLAS,
+planets and small-body catalogs.
+
+Element arrays have shape (..., 6) in the order of ELEMENT_NAMES:
+    e   eccentricity
+    q   perihelion distance (AU)
+    tp  time of perihelion passage (JD TDB)
+    om  longitude of the ascending node (deg)
+    w   argument of perihelion (deg)
+    i   inclination (deg)
+
+Angles are J2000 ecliptic, matching the stored Horizons vectors.
+
+Author: 3IAtlas Development Team
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+# Gaussian gravitational constant squared (AU^3/day^2)
+GM_SUN = 2.959122082855911e-4
+
+ELEMENT_NAMES = ('e', 'q', 'tp', 'om', 'w', 'i')
+
+# Orbits closer to e = 1 than this are treated as parabolic
+PARABOLIC_TOLERANCE = 1e-8
+
+
+def _solve_elliptic(M: np.ndarray, e: np.ndarray) -> np.ndarray:
+    """Solve E - e sin E = M (Newton, vectorized)"""
+    M = np.remainder(M + np.pi, 2 * np.pi) - np.pi
+    E = np.where(e > 0.8, np.pi * np.sign(M), M + e * np.sin(M))
+    for _ in range(50):
+        delta = (E - e * np.sin(E) - M) / (1 - e * np.cos(E))
+        E = E - delta
+        if np.all(np.abs(delta) < 1e-14):
+            break
+    return E
+
+
+def _solve_hyperbolic(M: np.ndarray, e: np.ndarray) -> np.ndarray:
+    """Solve e sinh F - F = M (Newton, vectorized)"""
+    F = np.sign(M) * np.log(2 * np.abs(M) / e + 1.8)
+    for _ in range(50):
+        delta = (e * np.sinh(F) - F - M) / (e * np.cosh(F) - 1)
+        F = F - delta
+        if np.all(np.abs(delta) < 1e-14):
+            break
+    return F
+
+
+def true_anomaly(elements: np.ndarray, jd: np.ndarray, mu: float = GM_SUN) -> np.ndarray:
+    """True anomaly (rad) for broadcast-compatible elements (..., 6) and epochs"""
+    e, q, tp = elements[..., 0], elements[..., 1], elements[..., 2]
+    dt = jd - tp
+    e, q, dt = np.broadcast_arrays(e, q, dt)
+    nu = np.empty(dt.shape)
+
+    elliptic = e < 1 - PARABOLIC_TOLERANCE
+    hyperbolic = e > 1 + PARABOLIC_TOLERANCE
+    parabolic = ~(elliptic | hyperbolic)
+
+    if np.any(elliptic):
+        ee, a = e[elliptic], q[elliptic] / (1 - e[elliptic])
+        M = np.sqrt(mu / a ** 3) * dt[elliptic]
+        E = _solve_elliptic(M, ee)
+        nu[elliptic] = 2 * np.arctan2(np.sqrt(1 + ee) * np.sin(E / 2),
+                                      np.sqrt(1 - ee) * np.cos(E / 2))
+
+    if np.any(hyperbolic):
+        ee, a = e[hyperbolic], q[hyperbolic] / (e[hyperbolic] - 1)
+        M = np.sqrt(mu / a ** 3) * dt[hyperbolic]
+        F = _solve_hyperbolic(M, ee)
+        nu[hyperbolic] = 2 * np.arctan(np.sqrt((ee + 1) / (ee - 1)) * np.tanh(F / 2))
+
+    if np.any(parabolic):
+        # Barker's equation: D + D^3/3 = sqrt(mu / (2 q^3)) * dt
+        W = 1.5 * np.sqrt(mu / (2 * q[parabolic] ** 3)) * dt[parabolic]
+        Y = np.cbrt(W + np.sqrt(W * W + 1))
+        nu[parabolic] = 2 * np.arctan(Y - 1 / Y)
+
+    return nu
+
+
+def perifocal_basis(elements: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Unit vectors P (toward perihelion) and Q, shaped (..., 3)"""
+    om, w, inc = (np.radians(elements[..., k]) for k in (3, 4, 5))
+    cos_om, sin_om = np.cos(om), np.sin(om)
+    cos_w, sin_w = np.cos(w), np.sin(w)
+    cos_i, sin_i = np.cos(inc), np.sin(inc)
+
+    P = np.stack([cos_om * cos_w - sin_om * sin_w * cos_i,
+                  sin_om * cos_w + cos_om * sin_w * cos_i,
+                  sin_w * sin_i], axis=-1)
+    Q = np.stack([-cos_om * sin_w - sin_om * cos_w * cos_i,
+                  -sin_om * sin_w + cos_om * cos_w * cos_i,
+                  cos_w * sin_i], axis=-1)
+    return P, Q
+
+
+def state_at_anomaly(elements: np.ndarray, nu: np.ndarray,
+                     mu: float = GM_SUN) -> Tuple[np.ndarray, np.ndarray]:
+    """Position and velocity (..., 3) at given true anomalies"""
+    e, q = elements[..., 0], elements[..., 1]
+    p = q * (1 + e)
+    r = p / (1 + e * np.cos(nu))
+    speed = np.sqrt(mu / p)
+
+    P, Q = perifocal_basis(elements)
+    cos_nu, sin_nu = np.cos(nu)[..., None], np.sin(nu)[..., None]
+
+    position = r[..., None] * (cos_nu * P + sin_nu * Q)
+    velocity = speed[..., None] * (-sin_nu * P + (e[..., None] + cos_nu) * Q)
+    return position, velocity
+
+
+def propagate(elements: np.ndarray, jd, mu: float = GM_SUN) -> Tuple[np.ndarray, np.ndarray]:
+    """Heliocentric states for N orbits at T epochs
+
+    Args:
+        elements: (6,) or (N, 6) element array
+        jd: scalar or (T,) epochs
+
+    Returns:
+        positions and velocities shaped (T, N, 3); leading/trailing axes are
+        dropped for a single orbit or a scalar epoch.
+    """
+    elements = np.asarray(elements, dtype=np.float64)
+    jd_arr = np.asarray(jd, dtype=np.float64)
+
+    el = np.atleast_2d(elements)[None, :, :]
+    t = np.atleast_1d(jd_arr)[:, None]
+
+    nu = true_anomaly(el, t, mu)
+    el = np.broadcast_to(el, nu.shape + (6,))
+    position, velocity = state_at_anomaly(el, nu, mu)
+
+    if elements.ndim == 1:
+        position, velocity = position[:, 0], velocity[:, 0]
+    if jd_arr.ndim == 0:
+        position, velocity = position[0], velocity[0]
+    return position, velocity
+
+
+def state_to_elements(position: np.ndarray, velocity: np.ndarray, jd,
+                      mu: float = GM_SUN) -> np.ndarray:
+    """Osculating cometary elements (..., 6) from heliocentric states"""
+    r_vec = np.asarray(position, dtype=np.float64)
+    v_vec = np.asarray(velocity, dtype=np.float64)
+    jd = np.asarray(jd, dtype=np.float64)
+
+    r = np.linalg.norm(r_vec, axis=-1)
+    h_vec = np.cross(r_vec, v_vec)
+    h = np.linalg.norm(h_vec, axis=-1)
+    e_vec = np.cross(v_vec, h_vec) / mu - r_vec / r[..., None]
+    e = np.linalg.norm(e_vec, axis=-1)
+
+    p = h * h / mu
+    q = p / (1 + e)
+    inc = np.arccos(np.clip(h_vec[..., 2] / h, -1, 1))
+    om = np.arctan2(h_vec[..., 0], -h_vec[..., 1])
+
+    node = np.stack([np.cos(om), np.sin(om), np.zeros_like(om)], axis=-1)
+    w = np.arctan2(np.einsum('...k,...k->...', np.cross(node, e_vec), h_vec) / h,
+                   np.einsum('...k,...k->...', node, e_vec))
+    nu = np.arctan2(np.einsum('...k,...k->...', np.cross(e_vec, r_vec), h_vec) / h,
+                    np.einsum('...k,...k->...', e_vec, r_vec))
+
+    # Time since perihelion from the anomaly
+    dt = np.empty(np.shape(e))
+    elliptic = e < 1 - PARABOLIC_TOLERANCE
+    hyperbolic = e > 1 + PARABOLIC_TOLERANCE
+    parabolic = ~(elliptic | hyperbolic)
+    e_, q_, nu_ = np.broadcast_arrays(e, q, nu)
+
+    if np.any(elliptic):
+        ee, a = e_[elliptic], q_[elliptic] / (1 - e_[elliptic])
+        E = 2 * np.arctan2(np.sqrt(1 - ee) * np.sin(nu_[elliptic] / 2),
+                           np.sqrt(1 + ee) * np.cos(nu_[elliptic] / 2))
+        dt[elliptic] = (E - ee * np.sin(E)) / np.sqrt(mu / a ** 3)
+    if np.any(hyperbolic):
+        ee, a = e_[hyperbolic], q_[hyperbolic] / (e_[hyperbolic] - 1)
+        F = 2 * np.arctanh(np.sqrt((ee - 1) / (ee + 1)) * np.tan(nu_[hyperbolic] / 2))
+        dt[hyperbolic] = (ee * np.sinh(F) - F) / np.sqrt(mu / a ** 3)
+    if np.any(parabolic):
+        D = np.tan(nu_[parabolic] / 2)
+        dt[parabolic] = (D + D ** 3 / 3) / np.sqrt(mu / (2 * q_[parabolic] ** 3))
+
+    return np.stack([e, q, jd - dt,
+                     np.degrees(om) % 360, np.degrees(w) % 360, np.degrees(inc)], axis=-1)
+
+
+def elements_from_dict(values: Dict) -> np.ndarray:
+    """Element array from a {'e', 'q', 'tp', 'om', 'w', 'i'} mapping"""
+    return np.array([values[name] for name in ELEMENT_NAMES], dtype=np.float64)
+
+
+def elements_to_dict(elements: np.ndarray) -> Dict[str, float]:
+    """{'e', 'q', 'tp', 'om', 'w', 'i'} mapping from an element array"""
+    return {name: float(value) for name, value in zip(ELEMENT_NAMES, elements)}
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Time-Tiled Per-Object Data Files
+================================
+
+Shards the stored ephemerides into one small JSON file per body per calendar
+month, plus a manifest listing every tile's span, record count, byte size
+and SHA-256, so the tracker and Python tools fetch only the tiles a view
+needs instead of the monolithic SOLAR_SYSTEM_POSITIONS.json and
+3I_ATLAS_positions_parsed.json.
+
+Layout:
+- tiles/manifest.json            format tag, metadata and, per body, its span
+                                 and tile list (key, file, start_jd, end_jd,
+                                 count, bytes, sha256)
+- tiles/<body>/<YYYY-MM>.json    records in the VectorData layout: jd, ISO
+                                 date, position {x,y,z}, velocity {x,y,z}
+                                 (compact_json, 9 decimals)
+- tiles/<body>/<YYYY-MM>.delta.json
+                                 the same tile quantized and differenced by
+                                 delta_codec.py (--encoding delta)
+
+Method:
+- Tiles are rendered in memory and hashed; a tile is written (temp file +
+  os.replace) only when its hash differs from the manifest entry or its file
+  is missing, so an update that appends a day rewrites one tile per body
+- Tiles that no longer exist are deleted; bodies not being updated keep
+  their tiles; the manifest is written last, and only when its entries
+  changed (so its generated timestamp marks the last real change)
+- With --compress, .gz/.br siblings (precompress.py) are written in parallel
+  threads for every tile written and for the manifest
+
+Usage:
+    python3 data_tiles.py
+    python3 data_tiles.py --encoding delta --compress
+    python3 data_tiles.py --read --objects atlas earth --start 2025-10-01 --end 2025-11-15
+
+Author: 3IAtlas Development Team
+"""
+
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from compact_json import dumps
+from delta_codec import decode_series, encoded_bytes
+from precompress import precompress, sibling_paths
+from ephemeris import (EphemerisSeries, date_to_jd, jd_to_datetime, load_ephemerides,
+                       merge_ephemerides)
+
+FORMAT = '3iatlas-tiles/1'
+TILES_DIR = "../frontend/public/data/tiles"
+MANIFEST_NAME = 'manifest.json'
+
+# Tile file suffix by encoding
+ENCODINGS = {'json': '.json', 'delta': '.delta.json'}
+
+# The products the tracker loads today (densest series per body wins)
+SOURCE_FILES = [
+    "../frontend/public/data/3I_ATLAS_positions_parsed.json",
+    "../frontend/public/data/SOLAR_SYSTEM_POSITIONS.json",
+]
+
+
+def tile_key(jd: float) -> str:
+    """Calendar month of an epoch ("2025-10")"""
+    return jd_to_datetime(jd).strftime('%Y-%m')
+
+
+def _iso_date(jd: float) -> str:
+    moment = jd_to_datetime(jd) + timedelta(milliseconds=0.5)
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.') + f"{moment.microsecond // 1000:03d}Z"
+
+
+def split_tiles(series: EphemerisSeries) -> Dict[str, EphemerisSeries]:
+    """One body's series split by month"""
+    keys = np.array([tile_key(jd) for jd in series.jd])
+    return {key: EphemerisSeries(series.jd[keys == key], series.position[keys == key],
+                                 series.velocity[keys == key], name=series.name)
+            for key in sorted(set(keys))}
+
+
+def vector_records(series: EphemerisSeries) -> List[Dict]:
+    """Records in the frontend VectorData layout"""
+    return [{
+        'jd': float(jd),
+        'date': _iso_date(jd),
+        'position': {'x': float(pos[0]), 'y': float(pos[1]), 'z': float(pos[2])},
+        'velocity': {'x': float(vel[0]), 'y': float(vel[1]), 'z': float(vel[2])},
+    } for jd, pos, vel in zip(series.jd, series.position, series.velocity)]
+
+
+def render_tile(series: EphemerisSeries, encoding: str = 'json') -> bytes:
+    """File content of one tile"""
+    if encoding == 'delta':
+        return encoded_bytes(series)
+    return (dumps(vector_records(series)) + '\n').encode()
+
+
+def decode_tile(payload: bytes, encoding: str = 'json', name: str = '') -> EphemerisSeries:
+    """Series from one tile's file content"""
+    if encoding == 'delta':
+        return decode_series(json.loads(payload), name=name)
+    return EphemerisSeries.from_records(json.loads(payload), name=name)
+
+
+def load_manifest(directory: str = TILES_DIR) -> Dict:
+    """Tile manifest of a directory ({} when there is none)"""
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != FORMAT:
+        raise ValueError(f"{path} is not a {FORMAT} manifest")
+    return manifest
+
+
+def _write_atomic(path: str, payload: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(temp_path, path)
+
+
+def _remove_tile(directory: str, tile: Dict) -> None:
+    path = os.path.join(directory, tile['file'])
+    for stale in [path] + sibling_paths(path):
+        if os.path.exists(stale):
+            os.remove(stale)
+
+
+def write_tiles(ephemerides: Dict[str, EphemerisSeries], directory: str = TILES_DIR,
+                metadata: Optional[Dict] = None, encoding: str = 'json',
+                compress: bool = False) -> Dict[str, int]:
+    """Write changed tiles and the manifest; returns written/unchanged/removed counts
+
+    Bodies already in the manifest but not passed in are kept as they are.
+    Changing the encoding replaces the whole tile set with the bodies passed in.
+    """
+    manifest = load_manifest(directory)
+    previous = manifest.get('objects', {}) if manifest.get('encoding', 'json') == encoding else {}
+    for name, entry in manifest.get('objects', {}).items():
+        if name not in previous:
+            for tile in entry['tiles']:
+                _remove_tile(directory, tile)
+    stats = {'written': 0, 'unchanged': 0, 'removed': 0}
+    objects = {name: entry for name, entry in previous.items() if name not in ephemerides}
+    to_compress = []
+
+    for name, series in sorted(ephemerides.items()):
+        known = {tile['key']: tile for tile in previous.get(name, {}).get('tiles', [])}
+        tiles = []
+        for key, chunk in split_tiles(series).items():
+            payload = render_tile(chunk, encoding)
+            entry = {
+                'key': key,
+                'file': f"{name}/{key}{ENCODINGS[encoding]}",
+                'start_jd': float(chunk.jd[0]),
+                'end_jd': float(chunk.jd[-1]),
+                'count': len(chunk),
+                'bytes': len(payload),
+                'sha256': hashlib.sha256(payload).hexdigest(),
+            }
+            path = os.path.join(directory, entry['file'])
+            old = known.pop(key, None)
+            if old and old['sha256'] == entry['sha256'] and os.path.exists(path) \
+                    and os.path.getsize(path) == entry['bytes'] \
+                    and (not compress or os.path.exists(path + '.gz')):
+                stats['unchanged'] += 1
+            else:
+                _write_atomic(path, payload)
+                to_compress.append(path)
+                stats['written'] += 1
+            tiles.append(entry)
+
+        for stale in known.values():
+            _remove_tile(directory, stale)
+            stats['removed'] += 1
+
+        objects[name] = {'start_jd': float(series.jd[0]), 'end_jd': float(series.jd[-1]),
+                         'count': len(series), 'tiles': tiles}
+
+    # Compare with the previous manifest's timestamp; a new one only on change
+    updated = {
+        'format': FORMAT,
+        'tile': 'month',
+        'encoding': encoding,
+        'metadata': dict(metadata or {}, generated=manifest.get('metadata', {}).get('generated')),
+        'objects': dict(sorted(objects.items())),
+    }
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    if updated != manifest:
+        updated['metadata']['generated'] = datetime.now().isoformat()
+        _write_atomic(manifest_path, (json.dumps(updated, indent=2) + '\n').encode())
+        to_compress.append(manifest_path)
+    elif compress and not os.path.exists(manifest_path + '.gz'):
+        to_compress.append(manifest_path)
+    if compress:
+        precompress(to_compress)
+    return stats
+
+
+def select_tiles(manifest: Dict, name: str, start_jd: Optional[float] = None,
+                 end_jd: Optional[float] = None) -> List[Dict]:
+    """Manifest entries of one body's tiles overlapping [start_jd, end_jd]"""
+    tiles = manifest.get('objects', {}).get(name, {}).get('tiles', [])
+    return [tile for tile in tiles
+            if (start_jd is None or tile['end_jd'] >= start_jd)
+            and (end_jd is None or tile['start_jd'] <= end_jd)]
+
+
+def load_tiles(directory: str = TILES_DIR, objects: Optional[List[str]] = None,
+               start_jd: Optional[float] = None, end_jd: Optional[float] = None,
+               verify: bool = True) -> Dict[str, EphemerisSeries]:
+    """Series built from only the tiles overlapping the requested span
+
+    With verify, each tile's SHA-256 is checked against the manifest.
+    """
+    manifest = load_manifest(directory)
+    encoding = manifest.get('encoding', 'json')
+    series = {}
+    for name in manifest.get('objects', {}):
+        if objects is not None and name not in objects:
+            continue
+        chunks: List[EphemerisSeries] = []
+        for tile in select_tiles(manifest, name, start_jd, end_jd):
+            with open(os.path.join(directory, tile['file']), 'rb') as f:
+                payload = f.read()
+            if verify and hashlib.sha256(payload).hexdigest() != tile['sha256']:
+                raise ValueError(f"Checksum mismatch for tile {tile['file']}")
+            chunks.append(decode_tile(payload, encoding, name))
+        if chunks:
+            series[name] = EphemerisSeries(np.concatenate([chunk.jd for chunk in chunks]),
+                                           np.concatenate([chunk.position for chunk in chunks]),
+                                           np.concatenate([chunk.velocity for chunk in chunks]),
+                                           name=name)
+    return series
+
+
+def load_sources(paths: Optional[List[str]] = None) -> Dict[str, EphemerisSeries]:
+    """Every body of the source products that exist"""
+    paths = paths or SOURCE_FILES
+    return merge_ephemerides(*[load_ephemerides(path) for path in paths if os.path.exists(path)])
+
+
+def main():
+    """Rebuild the tiles from the stored products, or read a span back"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Per-object monthly data tiles")
+    parser.add_argument('--sources', nargs='+', default=None, help='Products to tile')
+    parser.add_argument('--directory', default=TILES_DIR, help='Tile directory')
+    parser.add_argument('--encoding', choices=sorted(ENCODINGS), default='json',
+                        help='Tile encoding (delta: quantized differences)')
+    parser.add_argument('--compress', action='store_true', help='Write .gz/.br siblings')
+    parser.add_argument('--read', action='store_true', help='Load tiles instead of writing')
+    parser.add_argument('--objects', nargs='+', default=None, help='Bodies to read')
+    parser.add_argument('--start', default=None, help='First date to read')
+    parser.add_argument('--end', default=None, help='Last date to read')
+    args = parser.parse_args()
+
+    if args.read:
+        start_jd = date_to_jd(args.start) if args.start else None
+        end_jd = date_to_jd(args.end) if args.end else None
+        manifest = load_manifest(args.directory)
+        series = load_tiles(args.directory, args.objects, start_jd, end_jd)
+        for name, values in series.items():
+            tiles = select_tiles(manifest, name, start_jd, end_jd)
+            size = sum(tile['bytes'] for tile in tiles)
+            print(f"  {name:10s} {len(tiles):2d} tiles, {len(values):5d} points, {size:,} bytes")
+        print(f"✓ Loaded {len(series)} bodies (checksums verified)")
+        return
+
+    ephemerides = load_sources(args.sources)
+    if not ephemerides:
+        print("✗ No source products found")
+        sys.exit(1)
+
+    stats = write_tiles(ephemerides, args.directory, encoding=args.encoding,
+                        compress=args.compress)
+    manifest = load_manifest(args.directory)
+    total = sum(tile['bytes'] for body in manifest['objects'].values() for tile in body['tiles'])
+    largest = max(tile['bytes'] for body in manifest['objects'].values() for tile in body['tiles'])
+    print(f"✓ {len(ephemerides)} bodies, {stats['written']} tiles written, "
+          f"{stats['unchanged']} unchanged, {stats['removed']} removed")
+    print(f"✓ {total:,} bytes in tiles (largest {largest:,}), saved to: {args.directory}")
+
+    if args.compress:
+        files = [os.path.join(args.directory, tile['file'])
+                 for body in manifest['objects'].values() for tile in body['tiles']]
+        files.append(os.path.join(args.directory, MANIFEST_NAME))
+        sources = sum(os.path.getsize(path) for path in (args.sources or SOURCE_FILES)
+                      if os.path.exists(path))
+        for suffix in ('.gz', '.br'):
+            if all(os.path.exists(path + suffix) for path in files):
+                sent = sum(os.path.getsize(path + suffix) for path in files)
+                print(f"✓ Transfer with {suffix}: {sent:,} bytes "
+                      f"({sources / sent:.1f}x less than the {sources:,}-byte sources)")
+
+
+if __name__ == "__main__":
+    main()
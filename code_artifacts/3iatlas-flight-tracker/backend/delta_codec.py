@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Quantized Delta Encoding for Trajectory Tiles
+=============================================
+
+Smooth trajectories become runs of small, repetitive integers once they are
+quantized and differenced, which gzip/brotli then shrink far below the raw
+float text.
+
+Method:
+- Each column (jd, position, velocity) is quantized relative to its first
+  sample: q = round((value - origin) / scale)
+- The integers are differenced `order` times (1: first differences,
+  2: second differences), keeping the leading terms so decoding is just
+  `order` cumulative sums; quantization happens before differencing, so
+  the error never accumulates beyond scale / 2
+- Scales: 1e-9 AU for positions (~150 m, the compact_json precision),
+  1e-11 AU/day for velocities and 1e-8 day for epochs
+
+Tile layout (JSON):
+    {"encoding": "delta/1", "order": 2, "count": n,
+     "jd": {"origin": jd0, "scale": 1e-8, "data": [...]},
+     "position": {"origin": [x, y, z], "scale": 1e-9, "data": [...]},
+     "velocity": {"origin": [vx, vy, vz], "scale": 1e-11, "data": [...]}}
+
+Usage:
+    from delta_codec import encode_series, decode_series
+    tile = encode_series(series)
+    series = decode_series(tile)
+
+    python3 delta_codec.py --input ../frontend/public/data/SOLAR_SYSTEM_POSITIONS.json
+
+Author: 3IAtlas Development Team
+"""
+
+import gzip
+import json
+import os
+import sys
+from typing import Dict
+
+import numpy as np
+
+from ephemeris import EphemerisSeries, load_ephemerides
+
+ENCODING = 'delta/1'
+DEFAULT_ORDER = 2
+
+SCALES = {
+    'jd': 1e-8,            # day (~1 ms)
+    'position': 1e-9,      # AU (~150 m)
+    'velocity': 1e-11,     # AU/day (~17 um/s)
+}
+
+
+def encode_column(values: np.ndarray, scale: float, order: int = DEFAULT_ORDER) -> Dict:
+    """Origin, scale and differenced integers of one (N,) or (N, 3) column"""
+    origin = values[0]
+    q = np.rint((values - origin) / scale).astype(np.int64)
+    for _ in range(order):
+        q = np.concatenate((q[:1], np.diff(q, axis=0)))
+    return {'origin': origin.tolist(), 'scale': scale, 'data': q.ravel().tolist()}
+
+
+def decode_column(column: Dict, count: int, order: int) -> np.ndarray:
+    """Inverse of encode_column"""
+    origin = np.asarray(column['origin'], dtype=np.float64)
+    q = np.asarray(column['data'], dtype=np.int64).reshape((count,) + origin.shape)
+    for _ in range(order):
+        q = np.cumsum(q, axis=0)
+    return origin + q * column['scale']
+
+
+def encode_series(series: EphemerisSeries, order: int = DEFAULT_ORDER) -> Dict:
+    """Delta-encoded tile of a series"""
+    return {
+        'encoding': ENCODING,
+        'order': order,
+        'count': len(series),
+        'jd': encode_column(series.jd, SCALES['jd'], order),
+        'position': encode_column(series.position, SCALES['position'], order),
+        'velocity': encode_column(series.velocity, SCALES['velocity'], order),
+    }
+
+
+def decode_series(tile: Dict, name: str = '') -> EphemerisSeries:
+    """Series from a delta-encoded tile"""
+    if tile.get('encoding') != ENCODING:
+        raise ValueError(f"Not a {ENCODING} tile")
+    count, order = tile['count'], tile['order']
+    return EphemerisSeries(decode_column(tile['jd'], count, order),
+                           decode_column(tile['position'], count, order),
+                           decode_column(tile['velocity'], count, order), name=name)
+
+
+def encoded_bytes(series: EphemerisSeries, order: int = DEFAULT_ORDER) -> bytes:
+    """Compact JSON text of a series' delta-encoded tile"""
+    return (json.dumps(encode_series(series, order), separators=(',', ':')) + '\n').encode()
+
+
+def main():
+    """Encode a stored product and report sizes and round-trip error"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Quantized delta encoding")
+    parser.add_argument('--input', required=True, help='Stored product to encode')
+    parser.add_argument('--order', type=int, default=DEFAULT_ORDER, choices=(1, 2),
+                        help='Difference order')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"✗ Not found: {args.input}")
+        sys.exit(1)
+
+    ephemerides = load_ephemerides(args.input)
+    raw = os.path.getsize(args.input)
+    encoded = compressed = 0
+    worst = 0.0
+    for name, series in ephemerides.items():
+        payload = encoded_bytes(series, args.order)
+        encoded += len(payload)
+        compressed += len(gzip.compress(payload, 9))
+        decoded = decode_series(json.loads(payload))
+        worst = max(worst, float(np.abs(decoded.position - series.position).max()))
+
+    print(f"✓ {len(ephemerides)} bodies: {raw:,} bytes -> {encoded:,} encoded, "
+          f"{compressed:,} gzip ({raw / compressed:.1f}x smaller)")
+    print(f"✓ Largest position error: {worst:.1e} AU")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Body-Centered Ephemerides Derived from Stored Data
+==================================================
+
+Every Horizons fetch uses CENTER='@sun'. Geocentric or planet-relative views
+(e.g. "3I/ATLAS as seen from Mars at the flyby") are derived locally instead:
+the stored heliocentric states are interpolated onto a common time grid and
+the center body's state is subtracted in one vectorized operation.
+
+No network access and no extra stored data: views are computed on demand,
+and only written out when --output is given.
+
+Usage:
+    python3 derived_centers.py --center mars --date 2025-10-03
+    python3 derived_centers.py --center earth --bodies atlas mars --output earth_view.json
+
+Author: 3IAtlas Development Team
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ephemeris import (
+    STORED_PRODUCTS, EphemerisSeries, date_to_jd, jd_to_datetime, load_stored, recenter
+)
+
+AU_TO_KM = 149597870.7
+
+
+def centered_view(ephemerides: Dict[str, EphemerisSeries], center: str,
+                  bodies: Optional[List[str]] = None, start_date: Optional[str] = None,
+                  end_date: Optional[str] = None,
+                  step_hours: Optional[float] = None) -> Dict[str, EphemerisSeries]:
+    """Center-relative series for the requested bodies and window
+
+    Without explicit dates and step the common grid of the stored series is
+    used.
+    """
+    bodies = bodies or [name for name in ephemerides if name != center]
+    missing = [name for name in bodies + [center] if name not in ephemerides]
+    if missing:
+        raise KeyError(f"Not in stored ephemerides: {', '.join(missing)}")
+
+    jd = None
+    if start_date or end_date or step_hours:
+        involved = [ephemerides[name] for name in bodies + [center]]
+        start = date_to_jd(start_date) if start_date else max(s.start for s in involved)
+        end = date_to_jd(end_date) if end_date else min(s.end for s in involved)
+        step = (step_hours or 24.0) / 24.0
+        jd = np.arange(start, end + 1e-9, step)
+
+    return recenter(ephemerides, center, bodies, jd)
+
+
+def main():
+    """Print or export a body-centered view"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Derive body-centered ephemerides from stored heliocentric data"
+    )
+    parser.add_argument('--center', default='earth', help='Center body (e.g. earth, mars, jupiter)')
+    parser.add_argument('--bodies', nargs='*', default=['atlas'], help='Bodies to express')
+    parser.add_argument('--date', default=None, help='Print the view at this date')
+    parser.add_argument('--start', default=None, help='Window start date')
+    parser.add_argument('--end', default=None, help='Window end date')
+    parser.add_argument('--step-hours', type=float, default=None, help='Grid step')
+    parser.add_argument('--output', default=None, help='Write the view as JSON')
+    args = parser.parse_args()
+
+    stored = load_stored()
+    try:
+        view = centered_view(stored, args.center, args.bodies, args.start, args.end,
+                             args.step_hours)
+    except (KeyError, ValueError) as e:
+        print(f"✗ {e}")
+        print(f"  Available bodies: {', '.join(sorted(stored))}")
+        sys.exit(1)
+
+    for name, series in view.items():
+        distance = np.linalg.norm(series.position, axis=1)
+        nearest = int(np.argmin(distance))
+        print(f"{name} from {args.center}: {len(series)} epochs, "
+              f"{distance.min():.4f}-{distance.max():.4f} AU "
+              f"(nearest on grid {jd_to_datetime(series.jd[nearest]):%Y-%m-%d %H:%M})")
+
+        if args.date:
+            pos, vel = series.interpolate(date_to_jd(args.date))
+            speed = np.linalg.norm(vel[0]) * AU_TO_KM / 86400.0
+            print(f"  {args.date}: [{pos[0, 0]:+.6f}, {pos[0, 1]:+.6f}, {pos[0, 2]:+.6f}] AU, "
+                  f"range {np.linalg.norm(pos[0]):.6f} AU, relative speed {speed:.2f} km/s")
+
+    if args.output:
+        product = {
+            'metadata': {
+                'generated': datetime.now().isoformat(),
+                'center': args.center,
+                'frame': f"{args.center}-centered J2000 ecliptic",
+                'units': {'distance': 'AU', 'velocity': 'AU/day', 'time': 'JD TDB'},
+                'derived_from': [os.path.basename(p) for p in STORED_PRODUCTS
+                                 if os.path.exists(p)],
+            },
+        }
+        for name, series in view.items():
+            product[name] = series.to_records()
+        with open(args.output, 'w') as f:
+            json.dump(product, f, indent=2)
+        print(f"✓ View saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
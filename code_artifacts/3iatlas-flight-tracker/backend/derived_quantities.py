@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Precomputed Derived Quantities
+==============================
+
+Adds the numbers the HUD shows to every stored record at build time, so the
+browser no longer recomputes them from raw AU/day vectors each frame and the
+backend's values are the authoritative ones.
+
+Columns (added next to 'position' and 'velocity'):
+- distance_au              heliocentric distance r
+- speed_kms                heliocentric speed |v| in km/s
+- earth_distance_au        range from Earth          (target only)
+- earth_range_rate_kms     d(range)/dt, + = receding (target only)
+- earth_light_time_min     one-way light time        (target only)
+- mars_*                   the same, from Mars       (target only)
+
+Method:
+- Each body's records are stacked into (N, 3) arrays once; every column is a
+  vectorized expression over those arrays
+- Observer states are Hermite-interpolated onto the target's own epochs;
+  epochs outside an observer's stored span get no observer columns
+
+Usage:
+    python3 derived_quantities.py                  # annotate trajectory_static.json
+    python3 derived_quantities.py --input ../frontend/public/data/SOLAR_SYSTEM_POSITIONS.json
+
+Author: 3IAtlas Development Team
+"""
+
+import json
+import sys
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from ephemeris import ephemerides_from_data, object_key, stack_records
+
+AU_TO_KM = 149597870.7
+SPEED_OF_LIGHT_KMS = 299792.458
+TRAJECTORY_FILE = "../frontend/public/data/trajectory_static.json"
+
+DEFAULT_TARGET = 'atlas'
+DEFAULT_OBSERVERS = ('earth', 'mars')
+
+# Stored precision: 1e-6 AU is 150 km, well below what the HUD displays
+AU_DECIMALS = 6
+KMS_DECIMALS = 3
+MINUTES_DECIMALS = 3
+
+# Column name suffix -> (unit, stored decimals)
+COLUMN_UNITS = {
+    'au': ('AU', AU_DECIMALS),
+    'kms': ('km/s', KMS_DECIMALS),
+    'min': ('minutes', MINUTES_DECIMALS),
+}
+
+
+def heliocentric_columns(position: np.ndarray, velocity: np.ndarray) -> Dict[str, np.ndarray]:
+    """r (AU) and |v| (km/s) for (N, 3) heliocentric states"""
+    return {
+        'distance_au': np.linalg.norm(position, axis=1),
+        'speed_kms': np.linalg.norm(velocity, axis=1) * AU_TO_KM / 86400.0,
+    }
+
+
+def observer_columns(position: np.ndarray, velocity: np.ndarray,
+                     observer_position: np.ndarray, observer_velocity: np.ndarray,
+                     observer: str) -> Dict[str, np.ndarray]:
+    """Range (AU), range-rate (km/s) and light time (min) from an observer"""
+    rel_pos = position - observer_position
+    rel_vel = velocity - observer_velocity
+    distance = np.linalg.norm(rel_pos, axis=1)
+    range_rate = np.einsum('ij,ij->i', rel_pos, rel_vel) / distance
+    return {
+        f'{observer}_distance_au': distance,
+        f'{observer}_range_rate_kms': range_rate * AU_TO_KM / 86400.0,
+        f'{observer}_light_time_min': distance * AU_TO_KM / SPEED_OF_LIGHT_KMS / 60.0,
+    }
+
+
+def _unit(column: str) -> str:
+    return COLUMN_UNITS[column.rsplit('_', 1)[-1]][0]
+
+
+def _rounded(column: str, values: np.ndarray) -> List[float]:
+    return np.round(values, COLUMN_UNITS[column.rsplit('_', 1)[-1]][1]).tolist()
+
+
+def attach_derived(data: Dict, target: str = DEFAULT_TARGET,
+                   observers: Sequence[str] = DEFAULT_OBSERVERS) -> Dict:
+    """Add derived columns to the records of a trajectory product in place
+
+    Every body gets distance_au and speed_kms; the target additionally gets
+    range, range-rate and light time from each observer present in data.
+    Returns a {column: unit} summary for the product metadata.
+    """
+    ephemerides = ephemerides_from_data(data)
+    written = {}
+
+    for name, records in data.items():
+        if not (isinstance(records, list) and records and isinstance(records[0], dict)
+                and 'position' in records[0] and 'velocity' in records[0]):
+            continue
+
+        jd, position, velocity = stack_records(records)
+        columns = heliocentric_columns(position, velocity)
+        inside = {}
+
+        if object_key(name) == target:
+            for observer in observers:
+                series = ephemerides.get(observer)
+                if series is None:
+                    continue
+                obs_pos, obs_vel = series.interpolate(jd)
+                extra = observer_columns(position, velocity, obs_pos, obs_vel, observer)
+                columns.update(extra)
+                inside.update(dict.fromkeys(extra, (jd >= series.start) & (jd <= series.end)))
+
+        for column, values in columns.items():
+            mask = inside.get(column)
+            for idx, value in enumerate(_rounded(column, values)):
+                if mask is None or mask[idx]:
+                    records[idx][column] = value
+            written[column] = _unit(column)
+
+    return written
+
+
+def annotate(data: Dict, target: str = DEFAULT_TARGET,
+             observers: Sequence[str] = DEFAULT_OBSERVERS) -> Dict:
+    """attach_derived() plus a 'derived_columns' entry in the metadata"""
+    columns = attach_derived(data, target, observers)
+    if 'metadata' in data and isinstance(data['metadata'], dict):
+        data['metadata']['derived_columns'] = columns
+    return data
+
+
+def main():
+    """Add derived columns to an existing trajectory product"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precompute HUD quantities in stored data")
+    parser.add_argument('--input', default=TRAJECTORY_FILE, help='Trajectory product to annotate')
+    parser.add_argument('--output', default=None, help='Write here instead of in place')
+    parser.add_argument('--target', default=DEFAULT_TARGET, help='Body that gets observer columns')
+    parser.add_argument('--observers', nargs='*', default=list(DEFAULT_OBSERVERS),
+                        help='Observer bodies for range, range-rate and light time')
+    args = parser.parse_args()
+
+    try:
+        with open(args.input, 'r') as f:
+            data = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"✗ Cannot read {args.input}: {e}")
+        sys.exit(1)
+
+    annotate(data, args.target, args.observers)
+    columns = data.get('metadata', {}).get('derived_columns', {})
+    print(f"✓ Derived columns: {', '.join(sorted(columns)) or 'none'}")
+
+    output = args.output or args.input
+    with open(output, 'w') as f:
+        json.dump(data, f, indent=2)
+    print(f"✓ Saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Stored Ephemeris Loading and Interpolation
+==========================================
+
+Loads the trajectory products written by the generators (trajectory_static.json,
+SOLAR_SYSTEM_POSITIONS.json, 3I_ATLAS_positions_parsed.json, or their
+columnar.py binary versions) into NumPy arrays
+and provides vectorized cubic Hermite interpolation of position and velocity.
+
+All stored vectors are heliocentric, J2000 ecliptic, in AU and AU/day.
+
+Author: 3IAtlas Development Team
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Julian Date of the Unix epoch (1970-01-01 00:00:00)
+JD_UNIX_EPOCH = 2440587.5
+
+# Stored products merged by load_stored() (paths relative to backend/)
+TRAJECTORY_FILE = "../frontend/public/data/trajectory_static.json"
+PLANETS_FILE = "../frontend/public/data/SOLAR_SYSTEM_POSITIONS.json"
+STORED_PRODUCTS = [TRAJECTORY_FILE, PLANETS_FILE]
+
+MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+
+
+def parse_date(date_str: str) -> datetime:
+    """Parse the date formats used across the stored products
+
+    Handles "2025-07-01", "2025-07-01 06:00:00", "2025-Jul-01 06:00:00.0000"
+    and "A.D. 2025-Jul-01 06:00:00.0000".
+    """
+    text = date_str.replace('A.D.', '').replace('TDB', '').strip()
+    date_part, _, time_part = text.partition(' ')
+
+    pieces = date_part.split('-')
+    if len(pieces) == 3 and pieces[1] in MONTHS:
+        date_part = f"{pieces[0]}-{MONTHS[pieces[1]]:02d}-{pieces[2]}"
+
+    time_part = time_part.strip() or '00:00:00'
+    if '.' in time_part:
+        time_part = time_part.split('.')[0]
+
+    return datetime.fromisoformat(f"{date_part} {time_part}")
+
+
+def datetime_to_jd(dt: datetime) -> float:
+    """Convert a naive UTC/TDB datetime to Julian Date"""
+    return JD_UNIX_EPOCH + (dt - datetime(1970, 1, 1)).total_seconds() / 86400.0
+
+
+def jd_to_datetime(jd: float) -> datetime:
+    """Convert Julian Date to a naive datetime"""
+    return datetime.utcfromtimestamp((jd - JD_UNIX_EPOCH) * 86400.0)
+
+
+def date_to_jd(date_str: str) -> float:
+    """Convert any supported date string to Julian Date"""
+    return datetime_to_jd(parse_date(date_str))
+
+
+def _vector(value) -> List[float]:
+    """Read a stored vector ({x,y,z}, {vx,vy,vz} or [x,y,z])"""
+    if isinstance(value, dict):
+        if 'x' in value:
+            return [value['x'], value['y'], value['z']]
+        return [value['vx'], value['vy'], value['vz']]
+    return list(value)
+
+
+def stack_records(records: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Epochs, positions and velocities of generator records as arrays
+
+    Unlike EphemerisSeries.from_records the record order is kept, so results
+    can be written back to the records one-to-one.
+    """
+    jd = np.array([point['jd'] if 'jd' in point else date_to_jd(point['date'])
+                   for point in records])
+    position = np.array([_vector(point['position']) for point in records], dtype=np.float64)
+    velocity = np.array([_vector(point['velocity']) for point in records], dtype=np.float64)
+    return jd, position, velocity
+
+
+class EphemerisSeries:
+    """Time series of heliocentric state vectors for one body"""
+
+    def __init__(self, jd: np.ndarray, position: np.ndarray, velocity: np.ndarray,
+                 name: str = ''):
+        order = np.argsort(jd)
+        jd = np.asarray(jd, dtype=np.float64)[order]
+        keep = np.concatenate(([True], np.diff(jd) > 0))
+
+        self.name = name
+        self.jd = jd[keep]
+        self.position = np.asarray(position, dtype=np.float64)[order][keep]
+        self.velocity = np.asarray(velocity, dtype=np.float64)[order][keep]
+
+    def __len__(self) -> int:
+        return len(self.jd)
+
+    @property
+    def start(self) -> float:
+        return float(self.jd[0])
+
+    @property
+    def end(self) -> float:
+        return float(self.jd[-1])
+
+    @classmethod
+    def from_records(cls, records: List[Dict], name: str = '') -> 'EphemerisSeries':
+        """Build a series from generator output records"""
+        jd = np.empty(len(records))
+        position = np.empty((len(records), 3))
+        velocity = np.empty((len(records), 3))
+
+        for idx, point in enumerate(records):
+            jd[idx] = point['jd'] if 'jd' in point else date_to_jd(point['date'])
+            position[idx] = _vector(point.get('position', point.get('position_au')))
+            velocity[idx] = _vector(point.get('velocity', point.get('velocity_au_per_day')))
+
+        return cls(jd, position, velocity, name=name)
+
+    def covers(self, jd) -> bool:
+        """True if every requested epoch lies inside the stored span"""
+        jd = np.asarray(jd)
+        return bool(np.all((jd >= self.jd[0]) & (jd <= self.jd[-1])))
+
+    def interpolate(self, jd) -> Tuple[np.ndarray, np.ndarray]:
+        """Cubic Hermite interpolation of position and velocity
+
+        Uses the stored velocities as the end-point derivatives, so the result
+        is C1-continuous across sample joins. Epochs outside the span are
+        clamped to the first/last interval (extrapolated).
+        """
+        jd = np.atleast_1d(np.asarray(jd, dtype=np.float64))
+        idx = np.clip(np.searchsorted(self.jd, jd) - 1, 0, len(self.jd) - 2)
+
+        t0 = self.jd[idx]
+        h = (self.jd[idx + 1] - t0)[:, None]
+        s = (jd - t0)[:, None] / h
+
+        p0, p1 = self.position[idx], self.position[idx + 1]
+        m0, m1 = self.velocity[idx] * h, self.velocity[idx + 1] * h
+
+        s2 = s * s
+        s3 = s2 * s
+        position = ((2 * s3 - 3 * s2 + 1) * p0 + (s3 - 2 * s2 + s) * m0 +
+                    (-2 * s3 + 3 * s2) * p1 + (s3 - s2) * m1)
+        velocity = ((6 * s2 - 6 * s) * p0 + (3 * s2 - 4 * s + 1) * m0 +
+                    (-6 * s2 + 6 * s) * p1 + (3 * s2 - 2 * s) * m1) / h
+
+        return position, velocity
+
+    def to_records(self, calculated: bool = False) -> List[Dict]:
+        """Export in the trajectory_static.json record layout"""
+        records = []
+        for jd, pos, vel in zip(self.jd, self.position, self.velocity):
+            point = {
+                'jd': float(jd),
+                'date': jd_to_datetime(jd).strftime('%Y-%m-%d %H:%M:%S'),
+                'position': {'x': float(pos[0]), 'y': float(pos[1]), 'z': float(pos[2])},
+                'velocity': {'x': float(vel[0]), 'y': float(vel[1]), 'z': float(vel[2])}
+            }
+            if calculated:
+                point['calculated'] = True
+            records.append(point)
+        return records
+
+
+def object_key(name: str) -> str:
+    """Normalize an object label to the keys used by the generators
+
+    "Mars (499)" -> "mars", "ATLAS (C/2025 N1)" -> "atlas", "3I/ATLAS" -> "atlas",
+    "3iatlas" (update_all_planets.py key) -> "atlas"
+    """
+    key = name.split('(')[0].strip().lower()
+    key = key.replace('3i/', '').replace('/', '').replace('-', '')
+    return 'atlas' if key == '3iatlas' else key
+
+
+def load_ephemerides(path: str, objects: Optional[List[str]] = None) -> Dict[str, EphemerisSeries]:
+    """Load every body stored in a trajectory product
+
+    Accepts the generator layout ({"atlas": [...], "earth": [...]}), the flat
+    parsed layout ([{"object": "Mars (499)", ...}, ...]), columnar.py
+    manifests and ephemeris_store.py SQLite stores (*.sqlite).
+    """
+    if path.endswith('.sqlite'):
+        from ephemeris_store import EphemerisStore
+        with EphemerisStore(path) as store:
+            names = [name for name in store.objects() if objects is None or name in objects]
+            return {name: store.series(name) for name in names}
+
+    with open(path, 'r') as f:
+        data = json.load(f)
+
+    from columnar import columns_from_manifest, is_columnar
+    if is_columnar(data):
+        columns = columns_from_manifest(data, os.path.dirname(path), objects)
+        return {name: EphemerisSeries(c['jd'], c['position'], c['velocity'], name=name)
+                for name, c in columns.items() if 'velocity' in c}
+    return ephemerides_from_data(data, objects)
+
+
+def ephemerides_from_data(data, objects: Optional[List[str]] = None) -> Dict[str, EphemerisSeries]:
+    """Series for every body in an already-loaded product (see load_ephemerides)"""
+    grouped: Dict[str, List[Dict]] = {}
+    if isinstance(data, list):
+        for point in data:
+            grouped.setdefault(object_key(point.get('object', 'atlas')), []).append(point)
+    else:
+        for name, records in data.items():
+            if (isinstance(records, list) and records and isinstance(records[0], dict)
+                    and 'position' in records[0] and 'velocity' in records[0]):
+                grouped[object_key(name)] = records
+
+    series = {}
+    for name, records in grouped.items():
+        if objects is not None and name not in objects:
+            continue
+        series[name] = EphemerisSeries.from_records(records, name=name)
+
+    return series
+
+
+def merge_ephemerides(*sources: Dict[str, EphemerisSeries]) -> Dict[str, EphemerisSeries]:
+    """Combine several loaded products, keeping the densest series per body"""
+    merged: Dict[str, EphemerisSeries] = {}
+    for source in sources:
+        for name, series in source.items():
+            if name not in merged or len(series) > len(merged[name]):
+                merged[name] = series
+    return merged
+
+
+def overlay_ephemerides(*sources: Dict[str, EphemerisSeries]) -> Dict[str, EphemerisSeries]:
+    """Combine several loaded products epoch by epoch, later sources winning
+
+    Every epoch of every source is kept; where sources share an epoch (to the
+    second) the state comes from the last one, e.g. a fresh fetch over stored
+    products that are denser but older.
+    """
+    merged: Dict[str, EphemerisSeries] = {}
+    for source in sources:
+        for name, series in source.items():
+            if name not in merged:
+                merged[name] = series
+                continue
+            base = merged[name]
+            keep = ~np.isin(np.round(base.jd * 86400.0), np.round(series.jd * 86400.0))
+            merged[name] = EphemerisSeries(np.concatenate([base.jd[keep], series.jd]),
+                                           np.concatenate([base.position[keep], series.position]),
+                                           np.concatenate([base.velocity[keep], series.velocity]),
+                                           name=series.name or base.name)
+    return merged
+
+
+def load_stored(paths: Optional[List[str]] = None) -> Dict[str, EphemerisSeries]:
+    """Every body from the stored products that exist (densest series wins)"""
+    paths = paths or STORED_PRODUCTS
+    return merge_ephemerides(*[load_ephemerides(path) for path in paths if os.path.exists(path)])
+
+
+def common_grid(series: List[EphemerisSeries], step: Optional[float] = None) -> np.ndarray:
+    """Time grid over the span covered by every series
+
+    The step defaults to the finest median sample spacing among the series.
+    """
+    start = max(s.start for s in series)
+    end = min(s.end for s in series)
+    if end < start:
+        raise ValueError(f"No common time span for {', '.join(s.name for s in series)}")
+    if step is None:
+        step = min(float(np.median(np.diff(s.jd))) for s in series if len(s) > 1)
+    return np.arange(start, end + 1e-9, step)
+
+
+def recenter(ephemerides: Dict[str, EphemerisSeries], center: str,
+             bodies: Optional[List[str]] = None, jd=None) -> Dict[str, EphemerisSeries]:
+    """Body-centered series derived from stored heliocentric states
+
+    Every body and the center are interpolated onto one grid (common_grid()
+    unless jd is given) and the center's state is subtracted from the stacked
+    (bodies, epochs, 3) arrays in one operation. Axes stay J2000 ecliptic.
+    """
+    if center not in ephemerides:
+        raise KeyError(f"Center body '{center}' is not in the stored ephemerides")
+
+    bodies = bodies or [name for name in ephemerides if name != center]
+    if jd is None:
+        jd = common_grid([ephemerides[name] for name in bodies + [center]])
+    jd = np.atleast_1d(np.asarray(jd, dtype=np.float64))
+
+    center_pos, center_vel = ephemerides[center].interpolate(jd)
+    sampled = [ephemerides[name].interpolate(jd) for name in bodies]
+    position = np.stack([pos for pos, _ in sampled]) - center_pos
+    velocity = np.stack([vel for _, vel in sampled]) - center_vel
+
+    return {name: EphemerisSeries(jd, position[k], velocity[k], name=f"{name}@{center}")
+            for k, name in enumerate(bodies)}
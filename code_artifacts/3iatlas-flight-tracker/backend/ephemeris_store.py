@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+SQLite Ephemeris Store
+======================
+
+Embedded, indexed storage for state vectors, so tools that read or change a
+few points (polling, rolling-window merges) run indexed queries and upserts
+instead of parsing and rewriting whole JSON products.
+
+Schema:
+- vectors(object, jd, x, y, z, vx, vy, vz, extra): primary key (object, jd),
+  WITHOUT ROWID so rows are clustered by object and epoch; extra holds any
+  additional record fields (derived columns, flags) and the original date
+  string as JSON, so generator/lists exports write dates back unchanged
+- objects(object, label): original labels, e.g. "Mars (499)", for exports
+- meta(key, value): product-level JSON values (milestones, metadata, ...);
+  keys starting with "_" are store bookkeeping and are never exported
+
+Method:
+- Imports accept every stored JSON layout (see ephemeris.load_ephemerides)
+  and upsert rows by (object, jd) in one transaction per call
+- Range and nearest-epoch queries return NumPy arrays
+- Exporters write the generator layout (trajectory_static.json), the flat
+  parsed layout (SOLAR_SYSTEM_POSITIONS.json), the ATLAS parsed layout
+  (3I_ATLAS_positions_parsed.json) and the list layout of the root
+  3iatlas_trajectory_data.json
+- Vectors are stored as given: keep one store per product so frames never mix
+- A store that mirrors a product is kept current with sync(): the product's
+  version (e.g. its mtime) is recorded under the "_snapshot_version" meta
+  key, and a different version re-seeds the store from the product
+
+Usage:
+    with EphemerisStore(path) as store:
+        store.upsert_records('atlas', records)
+        jd, position, velocity = store.range('atlas', start_jd, end_jd)
+
+    python3 ephemeris_store.py --import ../frontend/public/data/trajectory_static.json
+    python3 ephemeris_store.py --nearest atlas 2025-10-29
+    python3 ephemeris_store.py --export /tmp/static.json --layout generator
+
+Author: 3IAtlas Development Team
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from compact_json import write_json
+from ephemeris import EphemerisSeries, _vector, date_to_jd, jd_to_datetime, object_key
+
+STORE_FILE = "ephemeris_store.sqlite"
+
+LAYOUTS = ('generator', 'parsed', 'atlas-parsed', 'lists')
+
+# Record keys stored in vector columns rather than in extra (the date is
+# kept in extra as well, in its original format)
+VECTOR_KEYS = {'jd', 'object', 'position', 'velocity', 'position_au', 'velocity_au_per_day'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS vectors (
+    object TEXT NOT NULL,
+    jd REAL NOT NULL,
+    x REAL NOT NULL, y REAL NOT NULL, z REAL NOT NULL,
+    vx REAL NOT NULL, vy REAL NOT NULL, vz REAL NOT NULL,
+    extra TEXT,
+    PRIMARY KEY (object, jd)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS objects (object TEXT PRIMARY KEY, label TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+UPSERT = """
+INSERT INTO vectors (object, jd, x, y, z, vx, vy, vz, extra)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (object, jd) DO UPDATE SET
+    x = excluded.x, y = excluded.y, z = excluded.z,
+    vx = excluded.vx, vy = excluded.vy, vz = excluded.vz, extra = excluded.extra
+"""
+
+
+def _moment(jd: float):
+    """Datetime of an epoch rounded to the nearest second"""
+    moment = jd_to_datetime(jd) + timedelta(microseconds=500000)
+    return moment.replace(microsecond=0)
+
+
+class EphemerisStore:
+    """State vectors per (object, jd) in one SQLite file"""
+
+    def __init__(self, path: str = STORE_FILE):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def __enter__(self) -> 'EphemerisStore':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.db.close()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def upsert(self, name: str, jd: np.ndarray, position: np.ndarray, velocity: np.ndarray,
+               extra: Optional[List[Optional[Dict]]] = None) -> int:
+        """Insert or replace rows by (object, jd); returns the row count"""
+        jd = np.asarray(jd, dtype=np.float64)
+        rows = np.column_stack((jd, np.asarray(position, dtype=np.float64),
+                                np.asarray(velocity, dtype=np.float64))).tolist()
+        extras = [json.dumps(item) if item else None for item in (extra or [None] * len(rows))]
+        with self.db:
+            self.db.executemany(UPSERT, ((name, *row, item) for row, item in zip(rows, extras)))
+            self.db.execute("INSERT OR IGNORE INTO objects VALUES (?, ?)", (name, name))
+        return len(rows)
+
+    def upsert_records(self, name: str, records: List[Dict], label: Optional[str] = None) -> int:
+        """Upsert records in any stored layout for one object"""
+        if not records:
+            return 0
+        jd = [point['jd'] if 'jd' in point else date_to_jd(point['date']) for point in records]
+        position = [_vector(point.get('position', point.get('position_au'))) for point in records]
+        velocity = [_vector(point.get('velocity', point.get('velocity_au_per_day')))
+                    for point in records]
+        extra = [{key: value for key, value in point.items() if key not in VECTOR_KEYS} or None
+                 for point in records]
+        count = self.upsert(name, jd, position, velocity, extra)
+        if label:
+            self.set_label(name, label)
+        return count
+
+    def upsert_series(self, series: EphemerisSeries) -> int:
+        return self.upsert(series.name, series.jd, series.position, series.velocity)
+
+    def delete_before(self, name: str, jd: float) -> int:
+        """Drop an object's rows earlier than jd; returns the row count"""
+        with self.db:
+            return self.db.execute("DELETE FROM vectors WHERE object = ? AND jd < ?",
+                                   (name, jd)).rowcount
+
+    def set_label(self, name: str, label: str) -> None:
+        with self.db:
+            self.db.execute("INSERT INTO objects VALUES (?, ?) ON CONFLICT (object) "
+                            "DO UPDATE SET label = excluded.label", (name, label))
+
+    def clear(self) -> None:
+        """Drop every row, label and meta value"""
+        with self.db:
+            for table in ('vectors', 'objects', 'meta'):
+                self.db.execute(f"DELETE FROM {table}")
+
+    def set_meta(self, key: str, value) -> None:
+        with self.db:
+            self.db.execute("INSERT INTO meta VALUES (?, ?) ON CONFLICT (key) "
+                            "DO UPDATE SET value = excluded.value", (key, json.dumps(value)))
+
+    def sync(self, version, load: Callable[[], object]) -> Optional[Dict[str, int]]:
+        """Re-seed from a product when its version differs from the last sync
+
+        Every row, label and meta value is dropped and load() is imported.
+        Returns the import counts, or None when the store was current.
+        """
+        if self.get_meta('_snapshot_version') == version:
+            return None
+        self.clear()
+        counts = self.import_data(load())
+        self.mark_synced(version)
+        return counts
+
+    def mark_synced(self, version) -> None:
+        """Record the product version the store matches (e.g. after writing it)"""
+        self.set_meta('_snapshot_version', version)
+
+    def import_data(self, data) -> Dict[str, int]:
+        """Upsert every object of a loaded JSON product; other keys go to meta"""
+        counts: Dict[str, int] = {}
+        if isinstance(data, list):
+            grouped: Dict[str, Tuple[str, List[Dict]]] = {}
+            for point in data:
+                label = point.get('object', '3I/ATLAS')
+                grouped.setdefault(object_key(label), (label, []))[1].append(point)
+            for name, (label, records) in grouped.items():
+                counts[name] = self.upsert_records(name, records, label)
+            return counts
+
+        for key, value in data.items():
+            if isinstance(value, list) and value and isinstance(value[0], dict) \
+                    and ('velocity' in value[0] or 'velocity_au_per_day' in value[0]):
+                counts[object_key(key)] = self.upsert_records(object_key(key), value)
+            else:
+                self.set_meta(key, value)
+        return counts
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def objects(self) -> List[str]:
+        return [row[0] for row in self.db.execute("SELECT object FROM objects ORDER BY object")]
+
+    def label(self, name: str) -> str:
+        row = self.db.execute("SELECT label FROM objects WHERE object = ?", (name,)).fetchone()
+        return row[0] if row else name
+
+    def get_meta(self, key: str, default=None):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def meta_keys(self) -> List[str]:
+        return [row[0] for row in self.db.execute("SELECT key FROM meta ORDER BY key")]
+
+    def span(self, name: str) -> Tuple[Optional[float], Optional[float], int]:
+        """First epoch, last epoch and row count of an object"""
+        return self.db.execute("SELECT MIN(jd), MAX(jd), COUNT(*) FROM vectors WHERE object = ?",
+                               (name,)).fetchone()
+
+    def _rows(self, name: str, start_jd: Optional[float], end_jd: Optional[float],
+              columns: str) -> List[Tuple]:
+        start = -np.inf if start_jd is None else start_jd
+        end = np.inf if end_jd is None else end_jd
+        return self.db.execute(f"SELECT {columns} FROM vectors WHERE object = ? "
+                               "AND jd BETWEEN ? AND ? ORDER BY jd",
+                               (name, start, end)).fetchall()
+
+    def range(self, name: str, start_jd: Optional[float] = None,
+              end_jd: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """jd (N,), position (N, 3) and velocity (N, 3) within [start_jd, end_jd]"""
+        rows = np.array(self._rows(name, start_jd, end_jd, "jd, x, y, z, vx, vy, vz"),
+                        dtype=np.float64).reshape(-1, 7)
+        return rows[:, 0], rows[:, 1:4], rows[:, 4:7]
+
+    def series(self, name: str, start_jd: Optional[float] = None,
+               end_jd: Optional[float] = None) -> EphemerisSeries:
+        return EphemerisSeries(*self.range(name, start_jd, end_jd), name=name)
+
+    def nearest(self, name: str, jd) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Stored rows at the epochs nearest to each requested jd
+
+        Only the rows between the neighbours of the requested span are read.
+        """
+        jd = np.atleast_1d(np.asarray(jd, dtype=np.float64))
+        below = self.db.execute("SELECT MAX(jd) FROM vectors WHERE object = ? AND jd <= ?",
+                                (name, float(jd.min()))).fetchone()[0]
+        above = self.db.execute("SELECT MIN(jd) FROM vectors WHERE object = ? AND jd >= ?",
+                                (name, float(jd.max()))).fetchone()[0]
+        epochs, position, velocity = self.range(name, below, above)
+        if not len(epochs):
+            raise KeyError(f"No stored vectors for {name}")
+
+        index = np.clip(np.searchsorted(epochs, jd), 1, max(len(epochs) - 1, 1))
+        if len(epochs) > 1:
+            index -= (jd - epochs[index - 1]) < (epochs[index] - jd)
+        else:
+            index[:] = 0
+        return epochs[index], position[index], velocity[index]
+
+    def records(self, name: str, start_jd: Optional[float] = None,
+                end_jd: Optional[float] = None) -> List[Tuple]:
+        """Raw (jd, x, y, z, vx, vy, vz, extra) rows in epoch order"""
+        return self._rows(name, start_jd, end_jd, "jd, x, y, z, vx, vy, vz, extra")
+
+
+# ============================================================================
+# EXPORTERS
+# ============================================================================
+
+def _point(row: Tuple, layout: str, label: str = '') -> Dict:
+    jd, x, y, z, vx, vy, vz, extra = row
+    moment = _moment(jd)
+    if layout == 'generator':
+        point = {'jd': jd, 'date': moment.strftime('%Y-%m-%d %H:%M:%S'),
+                 'position': {'x': x, 'y': y, 'z': z}, 'velocity': {'x': vx, 'y': vy, 'z': vz}}
+    elif layout == 'lists':
+        point = {'jd': jd, 'date': moment.strftime('%Y-%m-%d %H:%M:%S'),
+                 'position': [x, y, z], 'velocity': [vx, vy, vz]}
+    elif layout == 'parsed':
+        point = {'date': moment.strftime('A.D. %Y-%b-%d %H:%M:%S.0000'), 'object': label,
+                 'position_au': {'x': x, 'y': y, 'z': z},
+                 'velocity_au_per_day': {'vx': vx, 'vy': vy, 'vz': vz}}
+    else:                                                   # atlas-parsed
+        point = {'jd': jd, 'date': moment.strftime('A.D. %Y-%b-%d %H:%M:%S.0000'),
+                 'position': {'x': x, 'y': y, 'z': z},
+                 'velocity': {'vx': vx, 'vy': vy, 'vz': vz}}
+    if extra and layout in ('generator', 'lists'):
+        point.update(json.loads(extra))
+    return point
+
+
+def export_data(store: EphemerisStore, layout: str = 'generator',
+                objects: Optional[Iterable[str]] = None, start_jd: Optional[float] = None,
+                end_jd: Optional[float] = None):
+    """A product in one of LAYOUTS built from the store
+
+    generator/lists: {object: [records], <meta keys>}; parsed: flat list with
+    object labels; atlas-parsed: flat list for a single object.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}' (expected one of {', '.join(LAYOUTS)})")
+    names = list(objects) if objects is not None else store.objects()
+
+    if layout == 'atlas-parsed':
+        name = names[0] if objects is not None else 'atlas'
+        return [_point(row, layout) for row in store.records(name, start_jd, end_jd)]
+    if layout == 'parsed':
+        return [_point(row, layout, store.label(name))
+                for name in names for row in store.records(name, start_jd, end_jd)]
+
+    data = {name: [_point(row, layout) for row in store.records(name, start_jd, end_jd)]
+            for name in names}
+    for key in store.meta_keys():
+        if not key.startswith('_'):
+            data.setdefault(key, store.get_meta(key))
+    return data
+
+
+def main():
+    """Import products into a store, query it or export a layout"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="SQLite ephemeris store")
+    parser.add_argument('--store', default=STORE_FILE, help='SQLite file')
+    parser.add_argument('--import', dest='imports', nargs='+', default=[],
+                        metavar='JSON', help='Products to upsert')
+    parser.add_argument('--range', nargs=3, metavar=('OBJECT', 'START', 'END'),
+                        help='Print the rows between two dates')
+    parser.add_argument('--nearest', nargs=2, metavar=('OBJECT', 'DATE'),
+                        help='Print the row nearest to a date')
+    parser.add_argument('--export', default=None, metavar='JSON', help='Write a product')
+    parser.add_argument('--layout', choices=LAYOUTS, default='generator', help='Export layout')
+    parser.add_argument('--objects', nargs='+', default=None, help='Objects to export')
+    args = parser.parse_args()
+
+    with EphemerisStore(args.store) as store:
+        for path in args.imports:
+            try:
+                with open(path, 'r') as f:
+                    counts = store.import_data(json.load(f))
+            except (FileNotFoundError, json.JSONDecodeError) as e:
+                print(f"✗ Cannot import {path}: {e}")
+                sys.exit(1)
+            print(f"✓ {os.path.basename(path)}: {sum(counts.values()):,} rows upserted "
+                  f"({', '.join(sorted(counts))})")
+
+        if args.range:
+            name, start, end = args.range
+            jd, position, _ = store.range(object_key(name), date_to_jd(start), date_to_jd(end))
+            for epoch, pos in zip(jd, position):
+                print(f"  {epoch:.5f}  {pos[0]: .9f} {pos[1]: .9f} {pos[2]: .9f}")
+            print(f"✓ {len(jd)} rows")
+
+        if args.nearest:
+            name, date = args.nearest
+            jd, position, velocity = store.nearest(object_key(name), date_to_jd(date))
+            print(f"✓ Nearest epoch {jd[0]:.5f}: position {np.round(position[0], 9).tolist()} AU, "
+                  f"velocity {np.round(velocity[0], 9).tolist()} AU/day")
+
+        if args.export:
+            size = write_json(args.export, export_data(store, args.layout, args.objects))
+            print(f"✓ {args.layout} layout saved to: {args.export} ({size:,} bytes)")
+
+        if not (args.imports or args.range or args.nearest or args.export):
+            for name in store.objects():
+                first, last, count = store.span(name)
+                print(f"  {name:10s} {count:6d} rows  JD {first:.2f} - {last:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Close-Approach and Perihelion Event Detection
+=============================================
+
+Derives the timeline events (planetary encounters and perihelion) from the
+trajectory data itself, so they follow every new orbit solution instead of
+being hard-coded.
+
+Method:
+- Distances from the target to every body are sampled on the stored grid in
+  one stacked (bodies, epochs) array; local minima are bracketed there
+- Each minimum is refined on the cubic Hermite interpolant by bisection on
+  the range-rate (r . v = 0), all brackets of a body at once
+- Events report exact time, distance and relative speed
+
+Distances and speeds are rotation invariant, so any common frame works
+(the backend's ecliptic vectors or the root generator's three.js lists).
+
+Usage:
+    python3 event_detection.py                     # print detected events
+    python3 event_detection.py --threshold 1.0     # report wider encounters
+
+Author: 3IAtlas Development Team
+"""
+
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ephemeris import EphemerisSeries, common_grid, jd_to_datetime, load_stored
+
+AU_TO_KM = 149597870.7
+
+# Encounters farther than this are not reported
+ENCOUNTER_THRESHOLD_AU = 0.5
+
+# Bisection iterations: a 2-day bracket shrinks below 1 ms
+REFINE_ITERATIONS = 40
+
+# Event IDs and names the frontend already knows
+ENCOUNTER_IDS = {'mars': 'mars_flyby', 'jupiter': 'jupiter_approach'}
+ENCOUNTER_NAMES = {'mars': 'Mars Flyby', 'jupiter': 'Jupiter Approach'}
+
+
+def _relative_states(target: EphemerisSeries, center: Optional[EphemerisSeries],
+                     jd: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Target state relative to center (the Sun if None)"""
+    pos, vel = target.interpolate(jd)
+    if center is not None:
+        center_pos, center_vel = center.interpolate(jd)
+        pos, vel = pos - center_pos, vel - center_vel
+    return pos, vel
+
+
+def _range_rate(target: EphemerisSeries, center: Optional[EphemerisSeries],
+                jd: np.ndarray) -> np.ndarray:
+    """d|r|/dt up to the positive factor |r|: r . v"""
+    pos, vel = _relative_states(target, center, jd)
+    return np.einsum('ij,ij->i', pos, vel)
+
+
+def refine_minima(target: EphemerisSeries, center: Optional[EphemerisSeries],
+                  lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Epochs of zero range-rate inside each [lo, hi] bracket (vectorized bisection)"""
+    lo, hi = np.array(lo, dtype=np.float64), np.array(hi, dtype=np.float64)
+    for _ in range(REFINE_ITERATIONS):
+        mid = 0.5 * (lo + hi)
+        approaching = _range_rate(target, center, mid) < 0
+        lo = np.where(approaching, mid, lo)
+        hi = np.where(approaching, hi, mid)
+    return 0.5 * (lo + hi)
+
+
+def find_minima(target: EphemerisSeries, bodies: Dict[str, Optional[EphemerisSeries]],
+                jd: np.ndarray) -> List[Dict]:
+    """Every interior distance minimum of target from each body, refined
+
+    A body of None means the Sun (perihelion).
+    """
+    names = list(bodies)
+    target_pos, target_vel = target.interpolate(jd)
+    body_pos = np.stack([np.zeros_like(target_pos) if bodies[n] is None
+                         else bodies[n].interpolate(jd)[0] for n in names])
+    distance = np.linalg.norm(target_pos - body_pos, axis=2)         # (B, T)
+
+    interior = (distance[:, 1:-1] < distance[:, :-2]) & (distance[:, 1:-1] <= distance[:, 2:])
+    minima = []
+    for b, name in enumerate(names):
+        k = np.nonzero(interior[b])[0] + 1
+        if not len(k):
+            continue
+        center = bodies[name]
+        refined = refine_minima(target, center, jd[k - 1], jd[k + 1])
+        pos, vel = _relative_states(target, center, refined)
+        for t, p, v in zip(refined, pos, vel):
+            minima.append({'body': name, 'jd': float(t),
+                           'distance_au': float(np.linalg.norm(p)),
+                           'speed_au_per_day': float(np.linalg.norm(v))})
+    return minima
+
+
+def _format_event(minimum: Dict) -> Dict:
+    """Timeline event record for a refined minimum"""
+    body, jd = minimum['body'], minimum['jd']
+    when = jd_to_datetime(jd)
+    distance = minimum['distance_au']
+    speed_kms = minimum['speed_au_per_day'] * AU_TO_KM / 86400.0
+
+    event = {
+        'date': when.strftime('%Y-%m-%d'),
+        'time_tdb': when.strftime('%Y-%m-%dT%H:%M:%S'),
+        'jd': round(jd, 6),
+        'distance_au': round(distance, 4),
+        'distance_km': round(distance * AU_TO_KM),
+    }
+
+    if body == 'sun':
+        event.update({
+            'id': 'perihelion',
+            'name': 'Perihelion',
+            'max_velocity_kms': round(speed_kms, 2),
+            'description': (f"Closest approach to the Sun at {distance:.3f} AU, "
+                            f"maximum velocity {speed_kms:.1f} km/s"),
+            'type': 'milestone',
+        })
+    else:
+        event.update({
+            'id': ENCOUNTER_IDS.get(body, f"{body}_approach"),
+            'name': ENCOUNTER_NAMES.get(body, f"{body.capitalize()} Close Approach"),
+            'relative_velocity_kms': round(speed_kms, 2),
+            'description': (f"Close approach to {body.capitalize()} at {distance:.3f} AU "
+                            f"({distance * AU_TO_KM / 1e6:.1f} million km), "
+                            f"relative speed {speed_kms:.1f} km/s"),
+            'type': 'encounter',
+        })
+    return event
+
+
+def detect_events(ephemerides: Dict[str, EphemerisSeries], target: str = 'atlas',
+                  bodies: Optional[List[str]] = None,
+                  threshold_au: float = ENCOUNTER_THRESHOLD_AU) -> List[Dict]:
+    """Perihelion and close-approach events of target, sorted by time"""
+    if target not in ephemerides:
+        return []
+
+    bodies = bodies or [name for name in ephemerides if name != target]
+    candidates: Dict[str, Optional[EphemerisSeries]] = {'sun': None}
+    candidates.update({name: ephemerides[name] for name in bodies if name in ephemerides})
+
+    # Sample on the target's own grid, restricted to the span every body covers
+    series = ephemerides[target]
+    jd = series.jd
+    for name, body in candidates.items():
+        if body is not None:
+            jd = jd[(jd >= body.start) & (jd <= body.end)]
+    if len(jd) < 3:
+        jd = common_grid([series] + [b for b in candidates.values() if b is not None])
+
+    events = []
+    for minimum in find_minima(series, candidates, jd):
+        if minimum['body'] == 'sun' or minimum['distance_au'] <= threshold_au:
+            events.append(_format_event(minimum))
+    return sorted(events, key=lambda event: event['jd'])
+
+
+def merge_with_defaults(defaults: List[Dict], detected: List[Dict],
+                        key: str = 'id') -> List[Dict]:
+    """Default events overridden by detected ones (matched on key)
+
+    Defaults nothing was detected for (e.g. discovery, or an encounter outside
+    the data span) are kept; new detections are added. Sorted by date.
+    """
+    found = {event[key]: event for event in detected}
+    merged = [dict(event, **found.pop(event[key], {})) for event in defaults]
+    merged.extend(found.values())
+    return sorted(merged, key=lambda event: event['date'])
+
+
+def event_position(series: EphemerisSeries, event: Dict) -> List[float]:
+    """Interpolated target position at an event's exact time"""
+    position, _ = series.interpolate(event['jd'])
+    return position[0].tolist()
+
+
+def main():
+    """Detect and print ATLAS events from the stored data"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Detect 3I/ATLAS close approaches")
+    parser.add_argument('--threshold', type=float, default=ENCOUNTER_THRESHOLD_AU,
+                        help='Largest encounter distance to report (AU)')
+    parser.add_argument('--target', default='atlas', help='Body whose events are detected')
+    args = parser.parse_args()
+
+    stored = load_stored()
+    if args.target not in stored:
+        print(f"✗ No {args.target} data in the stored products")
+        sys.exit(1)
+
+    t_start = time.perf_counter()
+    events = detect_events(stored, args.target, threshold_au=args.threshold)
+    elapsed = time.perf_counter() - t_start
+
+    print(f"✓ {len(events)} events from {len(stored) - 1} bodies in {elapsed * 1000:.1f} ms")
+    for event in events:
+        speed = event.get('max_velocity_kms', event.get('relative_velocity_kms'))
+        print(f"  {event['time_tdb']} TDB  {event['name']:22s} {event['distance_au']:.4f} AU  "
+              f"{speed:6.2f} km/s")
+
+
+if __name__ == "__main__":
+    main()
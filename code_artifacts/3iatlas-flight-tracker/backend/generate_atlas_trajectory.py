@@ -27,11 +27,14 @@ import time
 import math
 import os
 
+from compact_json import write_json
+
 # Constants
 AU_TO_KM = 149597870.7  # 1 AU in kilometers
 CACHE_FILE = "../frontend/public/data/trajectory_cache.json"
 STATIC_FILE = "../frontend/public/data/trajectory_static.json"
 EVENTS_FILE = "../frontend/public/data/timeline_events.json"
+SOLUTION_FILE = "atlas_orbit_solution.json"  # Written by orbit_fit.py
 
 # 3I/ATLAS identification
 ATLAS_DESIGNATIONS = ["C/2025 N1", "3I/ATLAS", "1004083"]  # SPK-ID: 1004083
@@ -42,7 +45,8 @@ DISCOVERY_DATE = "2025-07-01"
 CURRENT_DATE = "2025-10-20"
 FUTURE_DATE = "2026-03-31"  # Through Jupiter approach
 
-# Key events with dates
+# Key events with dates. Perihelion and encounter entries are defaults only:
+# event_detection.py recomputes them from the trajectory data.
 KEY_EVENTS = [
     {
         "id": "discovery",
@@ -142,6 +146,7 @@ class HorizonsAPIClient:
             'format': 'json',
             'OUT_UNITS': 'AU-D',
             'REF_SYSTEM': 'ICRF',
+            'REF_PLANE': 'ECLIPTIC',  # J2000 ecliptic (see frames.py)
             'VEC_TABLE': '2',
             'CSV_FORMAT': 'YES',
             'OBJ_DATA': 'NO'
@@ -236,19 +241,48 @@ class HorizonsAPIClient:
 class OrbitalMechanicsCalculator:
     """Fallback orbital mechanics calculations if API fails"""
 
-    # 3I/ATLAS orbital elements (from Horizons manual review)
+    # 3I/ATLAS orbital elements (JPL#26, used until orbit_fit.py has run)
     ATLAS_ELEMENTS = {
         'eccentricity': 6.139587836355706,
         'perihelion_au': 1.356419039495192,
         'perihelion_date': '2025-10-29.4814392594',
+        'perihelion_jd': 2460977.9814392594,
         'ascending_node': 322.1568699043938,  # degrees
         'arg_perihelion': 128.0099421020839,  # degrees
-        'inclination': 175.1131015287974  # degrees
+        'inclination': 175.1131015287974,  # degrees
+        'source': 'JPL#26'
     }
 
     # Gravitational parameter for Sun (AU^3/day^2)
     MU_SUN = 2.959122083e-4
 
+    # Elements loaded from SOLUTION_FILE (None until first use)
+    _fitted_elements: Optional[Dict] = None
+
+    @classmethod
+    def elements(cls) -> Dict:
+        """Latest fitted ATLAS elements, or the JPL#26 defaults"""
+        if cls._fitted_elements is None:
+            cls._fitted_elements = cls.ATLAS_ELEMENTS
+            try:
+                with open(SOLUTION_FILE, 'r') as f:
+                    solution = json.load(f)
+                fit = solution['elements']
+                cls._fitted_elements = {
+                    'eccentricity': fit['e'],
+                    'perihelion_au': fit['q'],
+                    'perihelion_date': HorizonsAPIClient._jd_to_iso(fit['tp']),
+                    'perihelion_jd': fit['tp'],
+                    'ascending_node': fit['om'],
+                    'arg_perihelion': fit['w'],
+                    'inclination': fit['i'],
+                    'source': f"least-squares fit ({solution['arc']['start']} to "
+                              f"{solution['arc']['end']}, rms {solution['residuals']['rms_km']:.0f} km)"
+                }
+            except (FileNotFoundError, json.JSONDecodeError, KeyError):
+                pass
+        return cls._fitted_elements
+
     @classmethod
     def calculate_position(cls, date_str: str) -> Dict:
         """Calculate approximate position using orbital elements and hyperbolic orbit equations"""
@@ -259,15 +293,17 @@ class OrbitalMechanicsCalculator:
         except:
             dt = datetime.strptime(date_str, '%Y-%m-%d')
 
-        # Perihelion date
-        perihelion_dt = datetime(2025, 10, 29, 11, 33, 16)  # Oct 29.4814
+        elements = cls.elements()
+
+        # Perihelion date (JD 2451545.0 = 2000-01-01 12:00:00)
+        perihelion_dt = datetime(2000, 1, 1, 12) + timedelta(days=elements['perihelion_jd'] - 2451545.0)
 
         # Time since perihelion (in days)
         t = (dt - perihelion_dt).total_seconds() / 86400.0
 
         # Orbital elements
-        e = cls.ATLAS_ELEMENTS['eccentricity']
-        q = cls.ATLAS_ELEMENTS['perihelion_au']
+        e = elements['eccentricity']
+        q = elements['perihelion_au']
 
         # Semi-major axis (negative for hyperbolic orbit)
         a = q / (1 - e)
@@ -280,10 +316,13 @@ class OrbitalMechanicsCalculator:
 
         # Solve hyperbolic Kepler's equation for eccentric anomaly F
         # For hyperbolic orbits: M = e * sinh(F) - F
-        # Using Newton's method
-        F = M  # Initial guess
-        for _ in range(10):
-            F = F - (e * math.sinh(F) - F - M) / (e * math.cosh(F) - 1)
+        # Using Newton's method, started near the asymptotic solution
+        F = math.copysign(math.log(2 * abs(M) / e + 1.8), M)
+        for _ in range(50):
+            step = (e * math.sinh(F) - F - M) / (e * math.cosh(F) - 1)
+            F -= step
+            if abs(step) < 1e-14:
+                break
 
         # True anomaly
         nu = 2.0 * math.atan(math.sqrt((e + 1) / (e - 1)) * math.tanh(F / 2))
@@ -296,9 +335,9 @@ class OrbitalMechanicsCalculator:
         y_orb = r * math.sin(nu)
 
         # Convert to degrees and then to radians
-        omega = math.radians(cls.ATLAS_ELEMENTS['ascending_node'])
-        w = math.radians(cls.ATLAS_ELEMENTS['arg_perihelion'])
-        i = math.radians(cls.ATLAS_ELEMENTS['inclination'])
+        omega = math.radians(elements['ascending_node'])
+        w = math.radians(elements['arg_perihelion'])
+        i = math.radians(elements['inclination'])
 
         # Rotation matrices to convert to ecliptic coordinates
         cos_omega = math.cos(omega)
@@ -317,14 +356,10 @@ class OrbitalMechanicsCalculator:
 
         z = (sin_w * sin_i) * x_orb + (cos_w * sin_i) * y_orb
 
-        # Calculate velocity (simplified)
-        # v = sqrt(mu * (2/r - 1/a))
-        v_mag = math.sqrt(cls.MU_SUN * (2.0 / abs(r) - 1.0 / a))
-
-        # Velocity direction (perpendicular to position in simplified model)
-        v_angle = nu + math.pi / 2
-        vx_orb = v_mag * math.cos(v_angle)
-        vy_orb = v_mag * math.sin(v_angle)
+        # Velocity in the orbital plane: v = sqrt(mu/p) * (-sin(nu), e + cos(nu))
+        v_scale = math.sqrt(cls.MU_SUN / (q * (1 + e)))
+        vx_orb = -v_scale * math.sin(nu)
+        vy_orb = v_scale * (e + math.cos(nu))
 
         # Apply rotation to velocity
         vx = (cos_omega * cos_w - sin_omega * sin_w * cos_i) * vx_orb + \
@@ -347,8 +382,10 @@ class OrbitalMechanicsCalculator:
     def generate_fallback_trajectory(cls, start_date: str, end_date: str,
                                     hours_step: int = 6) -> List[Dict]:
         """Generate fallback trajectory data using orbital mechanics"""
+        elements = cls.elements()
         print("⚠ Using fallback orbital mechanics calculations")
-        print("  Based on JPL orbital elements: e=6.14, q=1.356 AU, perihelion=Oct 29, 2025")
+        print(f"  Based on {elements['source']} elements: e={elements['eccentricity']:.4f}, "
+              f"q={elements['perihelion_au']:.4f} AU, perihelion={elements['perihelion_date']}")
 
         trajectory = []
         current = datetime.fromisoformat(start_date)
@@ -425,9 +462,31 @@ class OrbitalMechanicsCalculator:
 class TrajectoryDataGenerator:
     """Main class for generating trajectory data"""
 
-    def __init__(self):
+    def __init__(self, kernels: Optional[List[str]] = None):
         self.api_client = HorizonsAPIClient()
         self.fallback = OrbitalMechanicsCalculator()
+        self.kernels = self._load_kernels(kernels) if kernels else None
+
+    @staticmethod
+    def _load_kernels(paths: List[str]):
+        """Open local SPK kernels (see spk_reader.py)"""
+        try:
+            from spk_reader import load_kernels
+        except ImportError as e:
+            print(f"  SPK reader unavailable ({e})")
+            return None
+        return load_kernels(paths)
+
+    def _fetch_vectors(self, command: str, step_size: str) -> List[Dict]:
+        """Vectors from the local kernels if they cover the body, else from the API"""
+        if self.kernels is not None:
+            from spk_reader import try_kernel_vectors
+            vectors = try_kernel_vectors(self.kernels, command, DISCOVERY_DATE,
+                                         FUTURE_DATE, step_size)
+            if vectors:
+                return vectors
+        return self.api_client.fetch_vectors(command, DISCOVERY_DATE, FUTURE_DATE,
+                                             step_size=step_size)
 
     def generate_static_data(self, force_api: bool = False) -> Dict:
         """Generate pre-computed static trajectory data with proper caching"""
@@ -487,12 +546,15 @@ class TrajectoryDataGenerator:
 
         # Fetch 3I/ATLAS trajectory
         print("\n[1/4] Fetching 3I/ATLAS (C/2025 N1) trajectory...")
-        atlas_data = self.api_client.fetch_vectors(
-            ATLAS_SPK_ID, DISCOVERY_DATE, FUTURE_DATE, step_size="6h"
-        )
+        atlas_data = self._fetch_vectors(ATLAS_SPK_ID, "6h")
 
-        if not atlas_data:
+        if atlas_data:
+            self._refresh_orbit_solution(atlas_data)
+        else:
             print("⚠ API failed for 3I/ATLAS, using fallback...")
+            atlas_data = self._propagate_stored_atlas()
+
+        if not atlas_data:
             atlas_data = self.fallback.generate_fallback_trajectory(
                 DISCOVERY_DATE, FUTURE_DATE
             )
@@ -501,9 +563,7 @@ class TrajectoryDataGenerator:
 
         # Fetch Earth trajectory
         print("\n[2/4] Fetching Earth trajectory...")
-        earth_data = self.api_client.fetch_vectors(
-            "399", DISCOVERY_DATE, FUTURE_DATE, step_size="1d"
-        )
+        earth_data = self._fetch_vectors("399", "1d")
         if not earth_data:
             print("⚠ API failed for Earth, using calculated orbit...")
             earth_data = self.fallback.generate_planet_orbit(
@@ -513,9 +573,7 @@ class TrajectoryDataGenerator:
 
         # Fetch Mars trajectory
         print("\n[3/4] Fetching Mars trajectory...")
-        mars_data = self.api_client.fetch_vectors(
-            "499", DISCOVERY_DATE, FUTURE_DATE, step_size="1d"
-        )
+        mars_data = self._fetch_vectors("499", "1d")
         if not mars_data:
             print("⚠ API failed for Mars, using calculated orbit...")
             mars_data = self.fallback.generate_planet_orbit(
@@ -525,9 +583,7 @@ class TrajectoryDataGenerator:
 
         # Fetch Jupiter trajectory
         print("\n[4/4] Fetching Jupiter trajectory...")
-        jupiter_data = self.api_client.fetch_vectors(
-            "599", DISCOVERY_DATE, FUTURE_DATE, step_size="2d"
-        )
+        jupiter_data = self._fetch_vectors("599", "2d")
         if not jupiter_data:
             print("⚠ API failed for Jupiter, using calculated orbit...")
             jupiter_data = self.fallback.generate_planet_orbit(
@@ -544,20 +600,118 @@ class TrajectoryDataGenerator:
         print(f"Jupiter points:   {len(data['jupiter'])}")
         print("="*70 + "\n")
 
-        # Save to file
+        self._attach_derived(data)
+        self._attach_visuals(data)
+
+        # Save to file (compact, floats rounded to 1e-9)
         os.makedirs(os.path.dirname(STATIC_FILE), exist_ok=True)
-        with open(STATIC_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        size = write_json(STATIC_FILE, data)
 
-        print(f"✓ Static data saved to: {STATIC_FILE}\n")
+        print(f"✓ Static data saved to: {STATIC_FILE} ({size:,} bytes)")
+        self._save_columnar(data)
+        print()
 
         return data
 
+    def _attach_derived(self, data: Dict) -> None:
+        """Precompute HUD columns (r, speed, Earth/Mars range) in the records"""
+        try:
+            from derived_quantities import annotate
+        except ImportError as e:
+            print(f"  Derived columns unavailable ({e})")
+            return
+
+        annotate(data)
+        print(f"✓ Derived columns: {', '.join(data['metadata']['derived_columns'])}")
+
+    def _save_columnar(self, data: Dict) -> None:
+        """Write the binary columnar copy next to the static JSON"""
+        try:
+            from columnar import columnar_path, write_product
+        except ImportError as e:
+            print(f"  Columnar output unavailable ({e})")
+            return
+
+        data_path = write_product(data, columnar_path(STATIC_FILE))
+        print(f"✓ Columnar data saved to: {data_path} ({os.path.getsize(data_path):,} bytes)")
+
+    def _attach_visuals(self, data: Dict) -> None:
+        """Precompute comet tail directions and activity in the ATLAS records"""
+        try:
+            from comet_visuals import annotate as annotate_visuals
+        except ImportError as e:
+            print(f"  Comet visual columns unavailable ({e})")
+            return
+
+        annotate_visuals(data)
+        if 'comet_visuals' in data['metadata']:
+            print("✓ Comet visuals: anti_solar, dust_tail, dust_tail_au, activity")
+
+    def _refresh_orbit_solution(self, atlas_data: List[Dict]) -> None:
+        """Refit the fallback elements to freshly fetched ATLAS vectors"""
+        try:
+            from orbit_fit import refresh_solution
+        except ImportError as e:
+            print(f"  Orbit fit unavailable ({e})")
+            return
+
+        try:
+            solution = refresh_solution(atlas_data, SOLUTION_FILE)
+        except Exception as e:
+            print(f"  ⚠ Orbit fit failed: {e}")
+            return
+
+        if solution:
+            OrbitalMechanicsCalculator._fitted_elements = None
+            print(f"  ✓ Fallback elements refitted (rms {solution['residuals']['rms_km']:,.0f} km)")
+
+    def _propagate_stored_atlas(self) -> List[Dict]:
+        """Propagate the last fetched ATLAS state with the N-body integrator
+
+        Uses the previously stored trajectory for both the starting state and
+        the planet positions. Returns an empty list if that is not possible.
+        """
+        try:
+            from ephemeris import date_to_jd
+            from nbody_integrator import load_perturbers, nbody_trajectory
+        except ImportError as e:
+            print(f"  N-body propagation unavailable ({e})")
+            return []
+
+        try:
+            with open(STATIC_FILE, 'r') as f:
+                previous = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return []
+
+        fetched = [p for p in previous.get('atlas', []) if 'jd' in p and not p.get('calculated')]
+        planets = load_perturbers()
+        if not fetched or not planets:
+            return []
+
+        # Start from the fetched state closest to the current date
+        current_jd = date_to_jd(CURRENT_DATE)
+        start = min(fetched, key=lambda p: abs(p['jd'] - current_jd))
+        print(f"  Propagating stored state from {start['date']} "
+              f"(perturbers: {', '.join(sorted(planets))})")
+
+        try:
+            trajectory = nbody_trajectory(start, planets, DISCOVERY_DATE, FUTURE_DATE)
+        except Exception as e:
+            print(f"  ✗ N-body propagation failed: {e}")
+            return []
+
+        print(f"  Generated {len(trajectory)} N-body trajectory points")
+        return trajectory
+
     def generate_event_markers(self) -> None:
         """Generate timeline event markers with associated data"""
 
         print("Generating timeline event markers...")
 
+        events = self._timeline_events()
+        magnitudes = self._predicted_magnitudes(events)
+
         # Load educational content from knowledge base
         knowledge_base_path = "/home/ubuntu/Uploads/3I_ATLAS_KNOWLEDGE_BASE.md"
         educational_content = {}
@@ -567,15 +721,17 @@ class TrajectoryDataGenerator:
                 kb_content = f.read()
 
             # Extract relevant sections for each event
-            educational_content = self._extract_educational_content(kb_content)
+            educational_content = self._extract_educational_content(kb_content, magnitudes)
 
         except FileNotFoundError:
             print("⚠ Knowledge base not found, using basic descriptions")
 
         # Enrich events with educational content
         enriched_events = []
-        for event in KEY_EVENTS:
+        for event in events:
             enriched_event = event.copy()
+            if event['id'] in magnitudes:
+                enriched_event['predicted_magnitude'] = magnitudes[event['id']]
             enriched_event['educational_content'] = educational_content.get(
                 event['id'],
                 event.get('description', '')
@@ -589,7 +745,53 @@ class TrajectoryDataGenerator:
 
         print(f"✓ Event markers saved to: {EVENTS_FILE}\n")
 
-    def _extract_educational_content(self, kb_content: str) -> Dict[str, str]:
+    def _timeline_events(self) -> List[Dict]:
+        """KEY_EVENTS with perihelion and encounters detected from stored data"""
+        try:
+            from ephemeris import load_stored
+            from event_detection import detect_events, merge_with_defaults
+        except ImportError as e:
+            print(f"  Event detection unavailable ({e}), using default events")
+            return KEY_EVENTS
+
+        try:
+            detected = detect_events(load_stored())
+        except Exception as e:
+            print(f"  ⚠ Event detection failed: {e}")
+            return KEY_EVENTS
+
+        detected.extend(self._brightness_peaks())
+        for event in detected:
+            print(f"  ✓ {event['name']}: {event['time_tdb']} TDB, {event['distance_au']:.4f} AU")
+        return merge_with_defaults(KEY_EVENTS, detected)
+
+    def _brightness_peaks(self) -> List[Dict]:
+        """Peak-brightness events from the predicted magnitude curve"""
+        try:
+            from ephemeris import load_stored
+            from photometry import peak_events, stored_curve
+            curve = stored_curve(load_stored())
+        except Exception as e:
+            print(f"  ⚠ Brightness prediction unavailable ({e})")
+            return []
+        return peak_events(curve) if curve is not None else []
+
+    def _predicted_magnitudes(self, events: List[Dict]) -> Dict[str, float]:
+        """Predicted total magnitude at each event that has an exact epoch"""
+        timed = [event for event in events if 'jd' in event]
+        try:
+            from ephemeris import load_stored
+            from photometry import magnitudes_at
+            magnitudes = magnitudes_at(load_stored(), [event['jd'] for event in timed])
+        except Exception as e:
+            print(f"  ⚠ Brightness prediction unavailable ({e})")
+            return {}
+        if magnitudes is None:
+            return {}
+        return {event['id']: round(float(m), 1) for event, m in zip(timed, magnitudes)}
+
+    def _extract_educational_content(self, kb_content: str,
+                                     magnitudes: Optional[Dict[str, float]] = None) -> Dict[str, str]:
         """Extract relevant educational content from knowledge base"""
 
         content = {}
@@ -626,8 +828,16 @@ a unique opportunity for comparative observations.
 """
 
         # Perihelion content
+        magnitude = (magnitudes or {}).get('perihelion')
+        if magnitude is not None:
+            brightness = f"Coma brightens to a predicted total magnitude of {magnitude:.1f} (telescopic)"
+            if magnitude <= 6.0:
+                brightness = f"Coma brightens to naked-eye visibility (magnitude {magnitude:.1f})"
+        else:
+            brightness = "Coma brightens as solar heating peaks"
+
         if "perihelion" in kb_content.lower():
-            content['perihelion'] = """
+            content['perihelion'] = f"""
 **Perihelion: Closest Approach to the Sun**
 
 On October 29, 2025, 3I/ATLAS reaches perihelion at 1.356 AU from the Sun
@@ -636,7 +846,7 @@ velocity of approximately 68 km/s.
 
 **What Happens:**
 - Maximum solar heating causes intense volatile sublimation
-- Coma brightens to potentially naked-eye visibility (magnitude 6-7)
+- {brightness}
 - Greenish color from carbon compounds (CO, CO₂, CH₄)
 - Possible development of visible tail
 - Peak observing opportunity for ground-based telescopes
@@ -677,21 +887,19 @@ unknown.
         print("Implementation: cron job or scheduled task")
         print("="*70 + "\n")
 
-        # Load existing static data
+        # Last epoch from the indexed ephemeris store (no full JSON parse)
         try:
-            with open(STATIC_FILE, 'r') as f:
-                existing_data = json.load(f)
+            last_jd = self._last_stored_epoch()
         except FileNotFoundError:
             print("✗ No static data found. Run generation first.")
             return
 
-        # Get last date in dataset
-        if existing_data['atlas']:
-            last_date = existing_data['atlas'][-1]['date']
-            print(f"Last data point: {last_date}")
+        if last_jd is not None:
+            from ephemeris import jd_to_datetime
+            last_dt = jd_to_datetime(last_jd)
+            print(f"Last data point: {last_dt.strftime('%Y-%m-%d %H:%M:%S')}")
 
             # Calculate next date to fetch (after last date)
-            last_dt = datetime.fromisoformat(last_date.split()[0])
             next_start = (last_dt + timedelta(days=1)).strftime('%Y-%m-%d')
             next_end = (last_dt + timedelta(days=7)).strftime('%Y-%m-%d')
 
@@ -700,6 +908,20 @@ unknown.
         else:
             print("✗ No existing ATLAS data to update.")
 
+    def _last_stored_epoch(self) -> Optional[float]:
+        """Last ATLAS epoch, re-importing STATIC_FILE into the store when it changed"""
+        from ephemeris_store import STORE_FILE, EphemerisStore
+
+        def read_static() -> Dict:
+            with open(STATIC_FILE, 'r') as f:
+                return json.load(f)
+
+        with EphemerisStore(STORE_FILE) as store:
+            counts = store.sync(os.stat(STATIC_FILE).st_mtime_ns, read_static)
+            if counts is not None:
+                print(f"✓ Ephemeris store refreshed: {sum(counts.values())} vectors")
+            return store.span('atlas')[1]
+
 
 def main():
     """Main execution function"""
@@ -724,10 +946,25 @@ def main():
         action='store_true',
         help='Only generate event markers'
     )
+    parser.add_argument(
+        '--spk',
+        action='store_true',
+        help='Evaluate vectors from local SPK kernels (downloaded once if missing)'
+    )
 
     args = parser.parse_args()
 
-    generator = TrajectoryDataGenerator()
+    kernels = None
+    if args.spk:
+        from spk_reader import (ATLAS_KERNEL_FILE, DEFAULT_KERNELS, PLANET_KERNEL_FILE,
+                                PLANET_KERNEL_URL, download_file, download_horizons_spk)
+        if not os.path.exists(PLANET_KERNEL_FILE):
+            download_file(PLANET_KERNEL_URL, PLANET_KERNEL_FILE)
+        if args.force or not os.path.exists(ATLAS_KERNEL_FILE):
+            download_horizons_spk(ATLAS_SPK_ID, DISCOVERY_DATE, FUTURE_DATE, ATLAS_KERNEL_FILE)
+        kernels = DEFAULT_KERNELS
+
+    generator = TrajectoryDataGenerator(kernels)
 
     if args.events_only:
         generator.generate_event_markers()
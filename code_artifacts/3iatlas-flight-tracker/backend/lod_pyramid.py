@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Trajectory Level-of-Detail Pyramid
+==================================
+
+Builds nested, error-bounded decimations of every stored trajectory so the
+tracker can draw whole-system views from a few dozen vertices per body and
+fetch denser levels only when zoomed in.
+
+Method:
+- One Ramer-Douglas-Peucker pass in 3D ranks every sample by importance:
+  the chord distance at which RDP would split there, clamped to its parent
+  split so that importance never increases down the recursion
+- Level k keeps the samples whose importance exceeds LOD_TOLERANCES[k], so
+  levels are nested (each refines the previous) and every dropped sample
+  lies within the tolerance of the level's polyline
+- The exact error of each level (largest distance of a dropped sample from
+  its covering segment) is measured and stored in the index
+
+Output is one columnar.py product per level (trajectory_lod_L<k>.json +
+.bin, one object per body with jd and float32 position columns), so the
+client can fetch the coarse level first and finer ones only when zoomed in.
+The index trajectory_lod.json lists the level files and, per body, each
+level's tolerance, measured error and vertex count, coarsest first.
+
+Usage:
+    python3 lod_pyramid.py
+    python3 lod_pyramid.py --tolerances 0.05 0.01 0.002
+
+Author: 3IAtlas Development Team
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from columnar import write_columnar
+from ephemeris import EphemerisSeries, load_stored
+
+OUTPUT_FILE = "../frontend/public/data/trajectory_lod.json"
+
+INDEX_FORMAT = '3iatlas-lod/1'
+
+# Level tolerances in AU, coarsest first (0.02 AU is ~3 million km)
+LOD_TOLERANCES = (0.02, 0.005, 0.001, 0.0002)
+
+
+def segment_distances(points: np.ndarray, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """Distance of each point (N, 3) from segments start-end ((N, 3) or (3,))"""
+    chord = end - start
+    length2 = np.einsum('...k,...k->...', chord, chord)
+    t = np.einsum('...k,...k->...', points - start, chord) / np.where(length2 > 0, length2, 1.0)
+    nearest = start + np.clip(t, 0.0, 1.0)[..., None] * chord
+    return np.linalg.norm(points - nearest, axis=-1)
+
+
+def rdp_importance(points: np.ndarray) -> np.ndarray:
+    """RDP split distance of every sample, monotone down the recursion
+
+    End points get infinity. Keeping samples with importance > tolerance
+    reproduces RDP at that tolerance.
+    """
+    importance = np.zeros(len(points))
+    importance[[0, -1]] = np.inf
+    stack = [(0, len(points) - 1, np.inf)]
+    while stack:
+        first, last, parent = stack.pop()
+        if last - first < 2:
+            continue
+        distances = segment_distances(points[first + 1:last], points[first], points[last])
+        split = first + 1 + int(np.argmax(distances))
+        value = min(float(distances[split - first - 1]), parent)
+        importance[split] = value
+        stack.append((first, split, value))
+        stack.append((split, last, value))
+    return importance
+
+
+def level_error(points: np.ndarray, kept: np.ndarray) -> float:
+    """Largest distance of a dropped sample from the kept polyline"""
+    dropped = np.setdiff1d(np.arange(len(points)), kept)
+    if not len(dropped):
+        return 0.0
+    segment = np.searchsorted(kept, dropped) - 1
+    return float(segment_distances(points[dropped], points[kept[segment]],
+                                   points[kept[segment + 1]]).max())
+
+
+def build_levels(series: EphemerisSeries,
+                 tolerances: Sequence[float] = LOD_TOLERANCES) -> List[Dict]:
+    """Kept sample indices and measured error for each tolerance"""
+    importance = rdp_importance(series.position)
+    levels = []
+    for tolerance in tolerances:
+        kept = np.nonzero(importance > tolerance)[0]
+        levels.append({'tolerance_au': tolerance, 'indices': kept,
+                       'max_error_au': level_error(series.position, kept)})
+    return levels
+
+
+def level_path(path: str, level: int) -> str:
+    """Manifest path of one level next to the index (trajectory_lod_L<k>.json)"""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}_L{level}{ext}"
+
+
+def write_pyramid(path: str, stored: Dict[str, EphemerisSeries],
+                  tolerances: Sequence[float] = LOD_TOLERANCES) -> Dict[str, List[Dict]]:
+    """Write one columnar product per level plus the index; returns the body index"""
+    objects: List[Dict] = [{} for _ in tolerances]
+    index = {}
+    for name, series in sorted(stored.items()):
+        entries = []
+        for k, level in enumerate(build_levels(series, tolerances)):
+            kept = level['indices']
+            objects[k][name] = {'jd': series.jd[kept], 'position': series.position[kept]}
+            entries.append({'level': k, 'tolerance_au': level['tolerance_au'],
+                            'max_error_au': level['max_error_au'], 'count': len(kept)})
+        index[name] = entries
+
+    metadata = {
+        'generated': datetime.now().isoformat(),
+        'method': 'RDP importance (3D), nested levels',
+        'frame': 'heliocentric J2000 ecliptic',
+        'full_resolution': {name: len(series) for name, series in stored.items()},
+    }
+    levels = []
+    for k, tolerance in enumerate(tolerances):
+        manifest = level_path(path, k)
+        data_path = write_columnar(manifest, objects[k], dict(metadata, level=k),
+                                   position_dtype='<f4')
+        levels.append({'level': k, 'tolerance_au': tolerance,
+                       'manifest': os.path.basename(manifest),
+                       'bytes': os.path.getsize(data_path)})
+
+    with open(path, 'w') as f:
+        json.dump({'format': INDEX_FORMAT, 'metadata': metadata, 'levels': levels,
+                   'lod': index}, f, separators=(',', ':'))
+    return index
+
+
+def main():
+    """Build the LOD pyramid for the stored trajectories"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Error-bounded trajectory LOD pyramid")
+    parser.add_argument('--tolerances', type=float, nargs='+', default=list(LOD_TOLERANCES),
+                        help='Level tolerances in AU, coarsest first')
+    parser.add_argument('--output', default=OUTPUT_FILE, help='Manifest file to write')
+    args = parser.parse_args()
+
+    stored = load_stored()
+    if not stored:
+        print("✗ No stored ephemerides found")
+        sys.exit(1)
+
+    tolerances = sorted(args.tolerances, reverse=True)
+    index = write_pyramid(args.output, stored, tolerances)
+    for name, entries in index.items():
+        counts = ' / '.join(str(entry['count']) for entry in entries)
+        worst = max(entry['max_error_au'] / entry['tolerance_au'] for entry in entries)
+        print(f"  {name:10s} {len(stored[name]):5d} -> {counts}  (error <= {worst:.2f} x tolerance)")
+
+    data_paths = [os.path.splitext(level_path(args.output, k))[0] + '.bin'
+                  for k in range(len(tolerances))]
+    sizes = ' / '.join(f"{os.path.getsize(data_path):,}" for data_path in data_paths)
+    print(f"✓ {len(index)} bodies x {len(tolerances)} levels saved to: {args.output} "
+          f"({sizes} bytes per level)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+N-Body Propagation for 3I/ATLAS
+===============================
+
+Numerically integrates 3I/ATLAS (and any number of massless test particles)
+under the gravity of the Sun and the planets. Planet positions are taken from
+the stored Horizons ephemerides, so no network access is needed.
+
+Method:
+- Dormand-Prince 5(4) embedded Runge-Kutta with adaptive step size
+- Heliocentric equations of motion including the indirect planetary term
+- All particles advance together as one (N, 6) state array
+- Output epochs are filled by quintic Hermite dense output (position,
+  velocity and acceleration at both step ends), so the step size is driven
+  by accuracy, not by the output cadence
+
+Usage:
+    python3 nbody_integrator.py                      # propagate and compare
+    python3 nbody_integrator.py --start 2025-07-01   # start from another state
+
+Author: 3IAtlas Development Team
+"""
+
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ephemeris import (
+    TRAJECTORY_FILE, EphemerisSeries, date_to_jd, load_ephemerides, load_stored
+)
+
+# Gaussian gravitational constant squared (AU^3/day^2)
+GM_SUN = 2.959122082855911e-4
+
+# Sun/planet mass ratios (IAU 2009 / DE430); Earth includes the Moon
+PLANET_MASS_RATIOS = {
+    'mercury': 6023597.400,
+    'venus': 408523.719,
+    'earth': 328900.559,
+    'mars': 3098703.590,
+    'jupiter': 1047.348644,
+    'saturn': 3497.901768,
+    'uranus': 22902.981613,
+    'neptune': 19412.237346,
+}
+
+PLANET_GM = {name: GM_SUN / ratio for name, ratio in PLANET_MASS_RATIOS.items()}
+
+# Dormand-Prince 5(4) tableau
+DP_C = np.array([0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0])
+DP_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+]
+DP_B5 = np.array([35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.0])
+DP_B4 = np.array([5179 / 57600, 0.0, 7571 / 16695, 393 / 640, -92097 / 339200,
+                  187 / 2100, 1 / 40])
+DP_E = DP_B5 - DP_B4
+
+
+class PerturberTable:
+    """Planet positions resampled onto one uniform time grid
+
+    Evaluating every planet at a stage time then needs a single index
+    computation instead of one search per planet.
+    """
+
+    def __init__(self, planets: Dict[str, EphemerisSeries], start_jd: float,
+                 end_jd: float, grid_step: float = 0.25):
+        usable = {}
+        for name, series in planets.items():
+            if name not in PLANET_GM:
+                continue
+            if series.start > start_jd or series.end < end_jd:
+                print(f"  ⚠ {name} ephemeris does not cover the span, ignoring it")
+                continue
+            usable[name] = series
+
+        self.names = sorted(usable)
+        self.gm = np.array([PLANET_GM[name] for name in self.names])
+        self.step = grid_step
+
+        count = int(np.ceil((end_jd - start_jd) / grid_step)) + 2
+        self.start = start_jd - grid_step / 2
+        grid = self.start + grid_step * np.arange(count)
+
+        self.position = np.empty((count, len(self.names), 3))
+        self.velocity = np.empty((count, len(self.names), 3))
+        for col, name in enumerate(self.names):
+            pos, vel = usable[name].interpolate(grid)
+            self.position[:, col] = pos
+            self.velocity[:, col] = vel
+
+    def positions(self, jd: float) -> np.ndarray:
+        """Planet positions (P, 3) at one epoch"""
+        u = (jd - self.start) / self.step
+        idx = min(max(int(u), 0), len(self.position) - 2)
+        s = u - idx
+        h = self.step
+
+        s2 = s * s
+        s3 = s2 * s
+        return ((2 * s3 - 3 * s2 + 1) * self.position[idx] +
+                (s3 - 2 * s2 + s) * h * self.velocity[idx] +
+                (-2 * s3 + 3 * s2) * self.position[idx + 1] +
+                (s3 - s2) * h * self.velocity[idx + 1])
+
+
+class NBodyIntegrator:
+    """Adaptive Dormand-Prince integrator for test particles"""
+
+    def __init__(self, planets: Dict[str, EphemerisSeries], rtol: float = 1e-11,
+                 atol: float = 1e-13, max_step: float = 8.0):
+        self.planets = planets
+        self.rtol = rtol
+        self.atol = atol
+        self.max_step = max_step
+        self.table: Optional[PerturberTable] = None
+        self.steps = 0
+
+    def acceleration(self, jd: float, position: np.ndarray) -> np.ndarray:
+        """Heliocentric acceleration (N, 3) for particle positions (N, 3)"""
+        r2 = np.einsum('ij,ij->i', position, position)
+        accel = -GM_SUN * position / (r2 * np.sqrt(r2))[:, None]
+
+        if self.table is not None and self.table.names:
+            planets = self.table.positions(jd)
+            delta = planets[None, :, :] - position[:, None, :]
+            d2 = np.einsum('npk,npk->np', delta, delta)
+            accel += np.einsum('p,npk->nk', self.table.gm, delta / (d2 * np.sqrt(d2))[:, :, None])
+
+            # Indirect term: the Sun itself is accelerated by the planets
+            p2 = np.einsum('pk,pk->p', planets, planets)
+            accel -= (self.table.gm[:, None] * planets / (p2 * np.sqrt(p2))[:, None]).sum(axis=0)
+
+        return accel
+
+    def _derivative(self, jd: float, state: np.ndarray) -> np.ndarray:
+        deriv = np.empty_like(state)
+        deriv[:, :3] = state[:, 3:]
+        deriv[:, 3:] = self.acceleration(jd, state[:, :3])
+        return deriv
+
+    def _error_norm(self, error: np.ndarray, y0: np.ndarray, y1: np.ndarray) -> float:
+        scale = self.atol + self.rtol * np.maximum(np.abs(y0), np.abs(y1))
+        return float(np.sqrt(np.mean((error / scale) ** 2, axis=1)).max())
+
+    def _integrate(self, jd0: float, state: np.ndarray, targets: np.ndarray,
+                   out_pos: np.ndarray, out_vel: np.ndarray) -> None:
+        """Integrate in one direction, filling outputs for sorted targets"""
+        direction = 1.0 if targets[-1] >= jd0 else -1.0
+        t = jd0
+        y = state.copy()
+        f = self._derivative(t, y)
+        h = direction * min(0.5, self.max_step)
+        next_out = 0
+
+        while next_out < len(targets) and targets[next_out] == t:
+            out_pos[next_out], out_vel[next_out] = y[:, :3], y[:, 3:]
+            next_out += 1
+
+        while next_out < len(targets):
+            remaining = targets[-1] - t
+            if abs(h) > abs(remaining):
+                h = remaining
+
+            k = [f]
+            for stage in range(1, 7):
+                yi = y + h * sum(a * kj for a, kj in zip(DP_A[stage], k) if a != 0.0)
+                k.append(self._derivative(t + DP_C[stage] * h, yi))
+
+            y_new = y + h * sum(b * kj for b, kj in zip(DP_B5, k) if b != 0.0)
+            error = h * sum(e * kj for e, kj in zip(DP_E, k))
+            err = self._error_norm(error, y, y_new)
+
+            if err <= 1.0:
+                t_new = t + h
+                f_new = k[6]  # FSAL: derivative at the new state
+
+                # Fill every output epoch inside this step
+                while next_out < len(targets) and direction * (targets[next_out] - t_new) <= 0:
+                    s = (targets[next_out] - t) / h
+                    pos, vel = _quintic_hermite(s, h, y, f, y_new, f_new)
+                    out_pos[next_out], out_vel[next_out] = pos, vel
+                    next_out += 1
+
+                t, y, f = t_new, y_new, f_new
+                self.steps += 1
+
+            factor = 0.9 * err ** -0.2 if err > 0 else 5.0
+            h *= min(5.0, max(0.2, factor))
+            if abs(h) > self.max_step:
+                h = direction * self.max_step
+
+    def propagate(self, jd0: float, state: np.ndarray,
+                  jd_out: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Propagate states to the requested epochs
+
+        Args:
+            jd0: Epoch of the initial state(s)
+            state: (6,) or (N, 6) heliocentric ecliptic states (AU, AU/day)
+            jd_out: Output epochs (any order, may lie before or after jd0)
+
+        Returns:
+            positions and velocities shaped (T, 3) or (T, N, 3)
+        """
+        state = np.asarray(state, dtype=np.float64)
+        single = state.ndim == 1
+        states = np.atleast_2d(state)
+        jd_out = np.atleast_1d(np.asarray(jd_out, dtype=np.float64))
+
+        span_start = min(jd0, jd_out.min())
+        span_end = max(jd0, jd_out.max())
+        self.table = PerturberTable(self.planets, span_start, span_end)
+        self.steps = 0
+
+        out_pos = np.empty((len(jd_out), len(states), 3))
+        out_vel = np.empty((len(jd_out), len(states), 3))
+
+        order = np.argsort(jd_out)
+        backward = order[jd_out[order] < jd0][::-1]
+        forward = order[jd_out[order] >= jd0]
+
+        for indices in (forward, backward):
+            if len(indices) == 0:
+                continue
+            pos = np.empty((len(indices), len(states), 3))
+            vel = np.empty((len(indices), len(states), 3))
+            self._integrate(jd0, states, jd_out[indices], pos, vel)
+            out_pos[indices], out_vel[indices] = pos, vel
+
+        if single:
+            return out_pos[:, 0], out_vel[:, 0]
+        return out_pos, out_vel
+
+
+def _quintic_hermite(s: float, h: float, y0: np.ndarray, f0: np.ndarray,
+                     y1: np.ndarray, f1: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Dense output from position, velocity and acceleration at both ends"""
+    p0, v0, a0 = y0[:, :3], y0[:, 3:], f0[:, 3:]
+    p1, v1, a1 = y1[:, :3], y1[:, 3:], f1[:, 3:]
+
+    s2, s3 = s * s, s * s * s
+    s4, s5 = s3 * s, s3 * s2
+
+    position = ((1 - 10 * s3 + 15 * s4 - 6 * s5) * p0 +
+                (s - 6 * s3 + 8 * s4 - 3 * s5) * h * v0 +
+                (0.5 * s2 - 1.5 * s3 + 1.5 * s4 - 0.5 * s5) * h * h * a0 +
+                (0.5 * s3 - s4 + 0.5 * s5) * h * h * a1 +
+                (-4 * s3 + 7 * s4 - 3 * s5) * h * v1 +
+                (10 * s3 - 15 * s4 + 6 * s5) * p1)
+
+    velocity = ((-30 * s2 + 60 * s3 - 30 * s4) * p0 / h +
+                (1 - 18 * s2 + 32 * s3 - 15 * s4) * v0 +
+                (s - 4.5 * s2 + 6 * s3 - 2.5 * s4) * h * a0 +
+                (1.5 * s2 - 4 * s3 + 2.5 * s4) * h * a1 +
+                (-12 * s2 + 28 * s3 - 15 * s4) * v1 +
+                (30 * s2 - 60 * s3 + 30 * s4) * p1 / h)
+
+    return position, velocity
+
+
+def load_perturbers(paths: Optional[List[str]] = None) -> Dict[str, EphemerisSeries]:
+    """Planet ephemerides from every stored product that exists"""
+    return {name: series for name, series in load_stored(paths).items() if name in PLANET_GM}
+
+
+def propagate_record(record: Dict, planets: Dict[str, EphemerisSeries],
+                     jd_out: np.ndarray) -> EphemerisSeries:
+    """Propagate a single fetched state vector record to the given epochs"""
+    start = EphemerisSeries.from_records([record])
+    state = np.concatenate([start.position[0], start.velocity[0]])
+
+    integrator = NBodyIntegrator(planets)
+    position, velocity = integrator.propagate(start.start, state, jd_out)
+    return EphemerisSeries(jd_out, position, velocity, name='atlas')
+
+
+def nbody_trajectory(record: Dict, planets: Dict[str, EphemerisSeries],
+                     start_date: str, end_date: str, hours_step: int = 6) -> List[Dict]:
+    """Generate a trajectory in the trajectory_static.json layout"""
+    jd_start, jd_end = date_to_jd(start_date), date_to_jd(end_date)
+    jd_out = np.arange(jd_start, jd_end + 1e-9, hours_step / 24.0)
+
+    series = propagate_record(record, planets, jd_out)
+    records = series.to_records(calculated=True)
+    for point in records:
+        point['note'] = f"N-body propagation from JD {record['jd']}"
+    return records
+
+
+def main():
+    """Propagate a stored ATLAS state and compare against Horizons"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Offline N-body propagation of 3I/ATLAS"
+    )
+    parser.add_argument('--start', default=None,
+                        help='Date of the stored state to start from (default: first point)')
+    parser.add_argument('--particles', type=int, default=0,
+                        help='Also propagate this many perturbed test particles')
+    args = parser.parse_args()
+
+    stored = load_ephemerides(TRAJECTORY_FILE)
+    if 'atlas' not in stored:
+        print(f"✗ No ATLAS data in {TRAJECTORY_FILE}")
+        sys.exit(1)
+
+    atlas = stored['atlas']
+    planets = load_perturbers()
+    print(f"Perturbers: {', '.join(sorted(planets))}")
+
+    idx = 0
+    if args.start:
+        idx = int(np.argmin(np.abs(atlas.jd - date_to_jd(args.start))))
+    jd0 = atlas.jd[idx]
+    state = np.concatenate([atlas.position[idx], atlas.velocity[idx]])
+
+    states = state[None, :]
+    if args.particles:
+        rng = np.random.default_rng(1)
+        clones = state + rng.normal(scale=1e-6, size=(args.particles, 6))
+        states = np.vstack([states, clones])
+
+    integrator = NBodyIntegrator(planets)
+    t_start = time.perf_counter()
+    position, _ = integrator.propagate(jd0, states, atlas.jd)
+    elapsed = time.perf_counter() - t_start
+
+    error_km = np.linalg.norm(position[:, 0] - atlas.position, axis=1) * 149597870.7
+    print(f"✓ Propagated {len(states)} particle(s) over {atlas.end - atlas.start:.1f} days "
+          f"({len(atlas.jd)} epochs, {integrator.steps} steps) in {elapsed * 1000:.1f} ms")
+    print(f"  Max deviation from Horizons: {error_km.max():,.0f} km "
+          f"(median {np.median(error_km):,.0f} km)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Geocentric Observer Geometry from Stored Vectors
+================================================
+
+Computes what an OBSERVER-type Horizons query would return, but locally for
+every stored epoch at once: astrometric RA/Dec, observer range (delta) and
+range-rate, heliocentric distance, solar elongation and phase angle.
+
+Method:
+- Target and Earth heliocentric states come from the stored trajectory
+  products (ephemeris.py Hermite interpolation)
+- Light time is iterated on whole arrays: the target is re-evaluated at
+  t - delta/c for every epoch simultaneously (three passes converge to
+  well below a millisecond)
+- The geocentric astrometric vector is rotated ecliptic -> ICRF in one
+  matrix multiply (frames.py) and converted to RA/Dec
+- Elongation (Sun-Observer-Target) and phase (Sun-Target-Observer) are
+  angles between stacked vectors
+
+Astrometric positions include light time but not aberration or light
+deflection, matching the Horizons "R.A._(ICRF)_DEC" astrometric column.
+Epochs are TDB Julian Dates; UT tables need ~69 s of TT-UT added.
+
+Usage:
+    python3 observer_geometry.py --start 2025-10-01 --end 2025-10-31
+    python3 observer_geometry.py --validate ../../../3iatlasapps/horizons_results.txt
+
+Author: 3IAtlas Development Team
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List
+
+import numpy as np
+
+from ephemeris import EphemerisSeries, date_to_jd, jd_to_datetime, load_stored
+from frames import transform
+
+AU_TO_KM = 149597870.7
+SPEED_OF_LIGHT_KMS = 299792.458
+LIGHT_DAY_AU = SPEED_OF_LIGHT_KMS * 86400.0 / AU_TO_KM
+
+HORIZONS_TABLE = "../../../3iatlasapps/horizons_results.txt"
+
+# Light-time passes: each pass shrinks the error by ~v/c (1e-4)
+LIGHT_TIME_ITERATIONS = 3
+
+# TT - UT1 for 2025 (seconds), to compare against UT-tagged Horizons tables
+DELTA_T_2025 = 69.2
+
+
+def _angle(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Angle in degrees between row vectors of a and b"""
+    cos = np.einsum('ij,ij->i', a, b) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+    return np.degrees(np.arccos(np.clip(cos, -1.0, 1.0)))
+
+
+def light_time_states(target: EphemerisSeries, observer_position: np.ndarray,
+                      jd: np.ndarray):
+    """Target states at the emission epochs t - tau, with tau (days)
+
+    All epochs are iterated together; tau starts from the geometric range.
+    """
+    position, velocity = target.interpolate(jd)
+    tau = np.linalg.norm(position - observer_position, axis=1) / LIGHT_DAY_AU
+    for _ in range(LIGHT_TIME_ITERATIONS):
+        position, velocity = target.interpolate(jd - tau)
+        tau = np.linalg.norm(position - observer_position, axis=1) / LIGHT_DAY_AU
+    return position, velocity, tau
+
+
+def observer_geometry(target: EphemerisSeries, observer: EphemerisSeries,
+                      jd) -> Dict[str, np.ndarray]:
+    """Observer-table quantities for every epoch (arrays, one per column)
+
+    Columns: jd, ra_deg, dec_deg, delta_au, deldot_kms, r_au, elongation_deg,
+    phase_deg, light_time_min.
+    """
+    jd = np.atleast_1d(np.asarray(jd, dtype=np.float64))
+    obs_pos, obs_vel = observer.interpolate(jd)
+    tgt_pos, tgt_vel, tau = light_time_states(target, obs_pos, jd)
+
+    line_of_sight = tgt_pos - obs_pos                      # astrometric, ecliptic
+    delta = np.linalg.norm(line_of_sight, axis=1)
+    deldot = np.einsum('ij,ij->i', line_of_sight, tgt_vel - obs_vel) / delta
+
+    equatorial = transform(line_of_sight, 'ecliptic', 'icrf')
+    ra = np.degrees(np.arctan2(equatorial[:, 1], equatorial[:, 0])) % 360.0
+    dec = np.degrees(np.arcsin(equatorial[:, 2] / delta))
+
+    return {
+        'jd': jd,
+        'ra_deg': ra,
+        'dec_deg': dec,
+        'delta_au': delta,
+        'deldot_kms': deldot * AU_TO_KM / 86400.0,
+        'r_au': np.linalg.norm(tgt_pos, axis=1),
+        'elongation_deg': _angle(-obs_pos, line_of_sight),
+        'phase_deg': _angle(-tgt_pos, -line_of_sight),
+        'light_time_min': tau * 1440.0,
+    }
+
+
+def format_ra(ra_deg: float) -> str:
+    """Right ascension as "HH MM SS.ss" """
+    seconds = round(ra_deg / 15.0 * 3600.0, 2) % 86400.0
+    return f"{int(seconds // 3600):02d} {int(seconds % 3600 // 60):02d} {seconds % 60:05.2f}"
+
+
+def format_dec(dec_deg: float) -> str:
+    """Declination as "+DD MM SS.s" """
+    sign = '-' if dec_deg < 0 else '+'
+    seconds = round(abs(dec_deg) * 3600.0, 1)
+    return f"{sign}{int(seconds // 3600):02d} {int(seconds % 3600 // 60):02d} {seconds % 60:04.1f}"
+
+
+def to_records(table: Dict[str, np.ndarray]) -> List[Dict]:
+    """Observer table as JSON-ready records"""
+    records = []
+    for k, jd in enumerate(table['jd']):
+        records.append({
+            'jd': round(float(jd), 6),
+            'date': jd_to_datetime(jd).strftime('%Y-%m-%d %H:%M:%S'),
+            'ra': format_ra(table['ra_deg'][k]),
+            'dec': format_dec(table['dec_deg'][k]),
+            **{key: round(float(values[k]), 6) for key, values in table.items() if key != 'jd'}
+        })
+    return records
+
+
+def parse_horizons_observer(path: str) -> Dict[str, np.ndarray]:
+    """UT epochs, RA/Dec, T-mag, delta, elongation and phase of a Horizons OBSERVER table"""
+    rows = []
+    with open(path, 'r') as f:
+        inside = False
+        for line in f:
+            if line.startswith('$$SOE'):
+                inside = True
+            elif line.startswith('$$EOE'):
+                break
+            elif inside and line.strip():
+                rows.append(line.split())
+
+    jd, ra, dec, t_mag, delta, elongation, phase = [], [], [], [], [], [], []
+    for row in rows:
+        jd.append(date_to_jd(f"{row[0]} {row[1]}:00"))
+        h, m, s = (float(v) for v in row[2:5])
+        ra.append((h + m / 60.0 + s / 3600.0) * 15.0)
+        d, m, s = (float(v) for v in row[5:8])
+        dec.append((-1 if row[5].startswith('-') else 1) * (abs(d) + m / 60.0 + s / 3600.0))
+        t_mag.append(float(row[8]) if row[8] != 'n.a.' else np.nan)
+        delta.append(float(row[10]))
+        elongation.append(float(row[12]))
+        phase.append(float(row[14]))
+
+    return {'jd_ut': np.array(jd), 'ra_deg': np.array(ra), 'dec_deg': np.array(dec),
+            't_mag': np.array(t_mag), 'delta_au': np.array(delta),
+            'elongation_deg': np.array(elongation), 'phase_deg': np.array(phase)}
+
+
+def validate(stored: Dict[str, EphemerisSeries], path: str) -> Dict[str, float]:
+    """Largest differences from a Horizons geocentric OBSERVER table"""
+    reference = parse_horizons_observer(path)
+    table = observer_geometry(stored['atlas'], stored['earth'],
+                              reference['jd_ut'] + DELTA_T_2025 / 86400.0)
+
+    d_ra = (table['ra_deg'] - reference['ra_deg'] + 180.0) % 360.0 - 180.0
+    d_ra *= np.cos(np.radians(reference['dec_deg']))
+    return {
+        'epochs': len(reference['jd_ut']),
+        'ra_arcsec': float(np.max(np.abs(d_ra)) * 3600.0),
+        'dec_arcsec': float(np.max(np.abs(table['dec_deg'] - reference['dec_deg'])) * 3600.0),
+        'delta_km': float(np.max(np.abs(table['delta_au'] - reference['delta_au'])) * AU_TO_KM),
+        'elongation_deg': float(np.max(np.abs(table['elongation_deg'] - reference['elongation_deg']))),
+        'phase_deg': float(np.max(np.abs(table['phase_deg'] - reference['phase_deg']))),
+    }
+
+
+def main():
+    """Print, export or validate a local geocentric observing table"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Geocentric RA/Dec, elongation and phase")
+    parser.add_argument('--target', default='atlas', help='Observed body')
+    parser.add_argument('--observer', default='earth', help='Observing body')
+    parser.add_argument('--start', default=None, help='First epoch (default: stored span)')
+    parser.add_argument('--end', default=None, help='Last epoch')
+    parser.add_argument('--step-hours', type=float, default=24.0, help='Table step')
+    parser.add_argument('--output', default=None, help='Write the table as JSON')
+    parser.add_argument('--validate', default=None, metavar='HORIZONS_TXT',
+                        help='Compare against a Horizons OBSERVER table')
+    args = parser.parse_args()
+
+    stored = load_stored()
+    missing = [name for name in (args.target, args.observer) if name not in stored]
+    if missing:
+        print(f"✗ Not in stored ephemerides: {', '.join(missing)}")
+        sys.exit(1)
+
+    if args.validate:
+        errors = validate(stored, args.validate)
+        print(f"✓ Compared {errors['epochs']} epochs with {os.path.basename(args.validate)}:")
+        print(f"  RA {errors['ra_arcsec']:.2f}\"  Dec {errors['dec_arcsec']:.2f}\"  "
+              f"delta {errors['delta_km']:,.0f} km  elongation {errors['elongation_deg']:.4f}°  "
+              f"phase {errors['phase_deg']:.4f}°")
+        return
+
+    target, observer = stored[args.target], stored[args.observer]
+    start = date_to_jd(args.start) if args.start else max(target.start, observer.start)
+    end = date_to_jd(args.end) if args.end else min(target.end, observer.end)
+    jd = np.arange(start, end + 1e-9, args.step_hours / 24.0)
+
+    t_start = time.perf_counter()
+    table = observer_geometry(target, observer, jd)
+    elapsed = time.perf_counter() - t_start
+    print(f"✓ {len(jd)} epochs in {elapsed * 1000:.1f} ms")
+
+    if args.output:
+        product = {
+            'metadata': {
+                'generated': datetime.now().isoformat(),
+                'target': args.target,
+                'observer': args.observer,
+                'frame': 'astrometric ICRF (light-time corrected)',
+                'units': {'angles': 'deg', 'distance': 'AU', 'deldot': 'km/s',
+                          'light_time': 'minutes', 'time': 'JD TDB'},
+            },
+            'table': to_records(table),
+        }
+        with open(args.output, 'w') as f:
+            json.dump(product, f, indent=2)
+        print(f"✓ Table saved to: {args.output}")
+        return
+
+    print(f"{'Date (TDB)':17s} {'RA':>11s} {'Dec':>11s} {'delta AU':>10s} "
+          f"{'r AU':>8s} {'elong':>7s} {'phase':>7s}")
+    for record in to_records(table):
+        print(f"{record['date'][:16]:17s} {record['ra']:>11s} {record['dec']:>11s} "
+              f"{record['delta_au']:10.6f} {record['r_au']:8.4f} "
+              f"{record['elongation_deg']:7.3f} {record['phase_deg']:7.3f}")
+
+
+if __name__ == "__main__":
+    main()
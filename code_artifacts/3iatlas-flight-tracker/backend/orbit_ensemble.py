@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Orbit-Uncertainty Ensembles for 3I/ATLAS
+====================================================
+
+Samples thousands of orbit clones from the element covariance of the current
+solution and propagates them across the display window to build an
+uncertainty tube around the nominal trajectory.
+
+Method:
+- Clones are drawn from N(nominal, covariance) over (e, q, tp, om, w, i);
+  non-gravitational parameters in the SBDB solution (A1, A2, A3, DT) are
+  marginalized out
+- Each chunk of clones is propagated in one vectorized conic call
+- Chunks run in a process pool and write into a shared-memory
+  (clones, epochs, 3) array; the percentile reduction is split across the
+  pool by epoch block, so both phases scale with the number of cores
+- Output: per-epoch nominal position, radial-deviation percentiles and
+  per-axis percentile envelopes
+
+Covariance source: the JPL Small-Body Database (`--fetch`) or a saved SBDB
+response. Without one, illustrative diagonal sigmas are used and flagged as
+such in the output.
+
+Usage:
+    python3 orbit_ensemble.py --fetch                  # download covariance
+    python3 orbit_ensemble.py --clones 20000 --workers 8
+
+Author: 3IAtlas Development Team
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import requests
+
+from conic import ELEMENT_NAMES, elements_from_dict, propagate
+from ephemeris import date_to_jd, jd_to_datetime
+from orbit_fit import SOLUTION_FILE, load_solution
+from parallel import (
+    SharedArray, attached, balanced_chunk_size, chunk_ranges, close_all,
+    default_workers, run_chunks
+)
+
+SBDB_URL = "https://ssd-api.jpl.nasa.gov/sbdb.api"
+COVARIANCE_FILE = "atlas_covariance.json"
+OUTPUT_FILE = "../frontend/public/data/atlas_uncertainty.json"
+
+DISCOVERY_DATE = "2025-07-01"
+FUTURE_DATE = "2026-03-31"
+
+# Illustrative 1-sigma values when no covariance is available
+DEFAULT_SIGMAS = {'e': 1e-4, 'q': 1e-5, 'tp': 1e-3, 'om': 1e-4, 'w': 1e-3, 'i': 1e-4}
+
+# SBDB covariance labels -> our element names
+SBDB_LABELS = {'e': 'e', 'q': 'q', 'tp': 'tp', 'node': 'om', 'om': 'om',
+               'peri': 'w', 'w': 'w', 'i': 'i'}
+
+RADIAL_PERCENTILES = (50.0, 90.0, 99.0)
+AXIS_PERCENTILES = (5.0, 95.0)
+
+
+def fetch_sbdb_covariance(designation: str = "C/2025 N1",
+                          path: str = COVARIANCE_FILE) -> Optional[Dict]:
+    """Download the orbit covariance from the JPL Small-Body Database"""
+    params = {'sstr': designation, 'cov': 'mat', 'full-prec': 'true'}
+    try:
+        print(f"Fetching covariance for {designation} from SBDB...")
+        response = requests.get(SBDB_URL, params=params, timeout=30)
+        response.raise_for_status()
+        data = response.json()
+    except Exception as e:
+        print(f"✗ SBDB request failed: {e}")
+        return None
+
+    if 'covariance' not in data.get('orbit', {}):
+        print("✗ SBDB response has no covariance")
+        return None
+
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+    print(f"✓ Covariance saved to: {path}")
+    return data
+
+
+def load_covariance(path: str = COVARIANCE_FILE) -> Optional[Tuple[np.ndarray, np.ndarray, str]]:
+    """Nominal elements and 6x6 covariance from a saved SBDB response
+
+    Returns (nominal, covariance, description) in ELEMENT_NAMES order, or None.
+    Non-gravitational parameters are marginalized out (their rows and columns
+    dropped) and named in the description.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        data = json.load(f)
+
+    cov = data['orbit']['covariance']
+    positions = {SBDB_LABELS[label]: k for k, label in enumerate(cov['labels'])
+                 if label in SBDB_LABELS}
+    missing = [name for name in ELEMENT_NAMES if name not in positions]
+    if missing:
+        raise ValueError(f"SBDB covariance in {path} lacks {', '.join(missing)}")
+    matrix = np.array(cov['data'], dtype=np.float64)
+
+    # Element block in ELEMENT_NAMES order; non-gravitational rows/columns
+    # (A1, A2, A3, DT) are dropped, i.e. the marginal element covariance
+    order = [positions[name] for name in ELEMENT_NAMES]
+    matrix = matrix[np.ix_(order, order)]
+    nongrav = [label for label in cov['labels'] if label not in SBDB_LABELS]
+
+    values = {SBDB_LABELS.get(el['name']): float(el['value'])
+              for el in cov.get('elements', []) if el['name'] in SBDB_LABELS}
+    if all(name in values for name in ELEMENT_NAMES):
+        nominal = elements_from_dict(values)
+    else:
+        nominal = nominal_elements()[0]
+
+    source = data['orbit'].get('soln_date', 'unknown date')
+    description = f"SBDB covariance (solution {source}, epoch {cov.get('epoch')})"
+    if nongrav:
+        description += f", marginal over {', '.join(nongrav)}"
+    return nominal, matrix, description
+
+
+def nominal_elements(path: str = SOLUTION_FILE) -> Tuple[np.ndarray, str]:
+    """Elements of the fitted solution (orbit_fit.py writes SOLUTION_FILE)"""
+    solution = load_solution(path)
+    if not solution:
+        raise FileNotFoundError(f"No orbit solution in {path}; run orbit_fit.py first")
+    return elements_from_dict(solution['elements']), 'least-squares fit'
+
+
+def sample_clones(nominal: np.ndarray, covariance: np.ndarray, count: int,
+                  seed: Optional[int] = None) -> np.ndarray:
+    """Draw (count, 6) element sets; the first row is the nominal orbit"""
+    rng = np.random.default_rng(seed)
+    try:
+        factor = np.linalg.cholesky(covariance)
+    except np.linalg.LinAlgError:
+        # Covariance not numerically positive definite: use its eigen-decomposition
+        values, vectors = np.linalg.eigh(covariance)
+        factor = vectors * np.sqrt(np.clip(values, 0, None))
+
+    clones = nominal + rng.standard_normal((count, 6)) @ factor.T
+    clones[0] = nominal
+    return clones
+
+
+def _propagate_chunk(task: Tuple) -> None:
+    """Worker: propagate clones[start:stop] into the shared position array"""
+    clones_spec, jd_spec, out_spec, start, stop = task
+    with attached(clones_spec) as clones, attached(jd_spec) as jd, attached(out_spec) as out:
+        position, _ = propagate(clones[start:stop], jd)      # (T, n, 3)
+        out[start:stop] = position.transpose(1, 0, 2)
+
+
+def _reduce_epochs(task: Tuple) -> None:
+    """Worker: percentile envelopes for epochs[start:stop]"""
+    positions_spec, radial_spec, axis_spec, start, stop = task
+    with attached(positions_spec) as positions, attached(radial_spec) as radial, \
+            attached(axis_spec) as axis:
+        block = positions[:, start:stop]                       # (N, t, 3)
+        deviation = np.linalg.norm(block - block[0], axis=2)   # row 0 is nominal
+        radial[:, start:stop] = np.percentile(deviation, RADIAL_PERCENTILES, axis=0)
+        axis[:, start:stop] = np.percentile(block, AXIS_PERCENTILES, axis=0)
+
+
+def run_ensemble(clones: np.ndarray, jd: np.ndarray,
+                 workers: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Propagate all clones and reduce them to per-epoch envelopes
+
+    Returns nominal positions (T, 3), radial percentiles (P, T) and per-axis
+    percentile envelopes (2, T, 3).
+    """
+    workers = workers or default_workers()
+    shared: List[SharedArray] = []
+    try:
+        clones_sh = SharedArray.from_array(clones)
+        jd_sh = SharedArray.from_array(jd)
+        positions_sh = SharedArray((len(clones), len(jd), 3))
+        radial_sh = SharedArray((len(RADIAL_PERCENTILES), len(jd)))
+        axis_sh = SharedArray((len(AXIS_PERCENTILES), len(jd), 3))
+        shared = [clones_sh, jd_sh, positions_sh, radial_sh, axis_sh]
+
+        size = balanced_chunk_size(len(clones), workers, minimum=256)
+        run_chunks(_propagate_chunk, [
+            (clones_sh.spec(), jd_sh.spec(), positions_sh.spec(), start, stop)
+            for start, stop in chunk_ranges(len(clones), size)
+        ], workers)
+
+        size = balanced_chunk_size(len(jd), workers, minimum=8)
+        run_chunks(_reduce_epochs, [
+            (positions_sh.spec(), radial_sh.spec(), axis_sh.spec(), start, stop)
+            for start, stop in chunk_ranges(len(jd), size)
+        ], workers)
+
+        return {
+            'nominal': positions_sh.array[0].copy(),
+            'radial': radial_sh.array.copy(),
+            'axis': axis_sh.array.copy(),
+        }
+    finally:
+        close_all(shared)
+
+
+def build_uncertainty_tube(result: Dict[str, np.ndarray], jd: np.ndarray,
+                           metadata: Dict) -> Dict:
+    """Assemble the JSON product consumed by the frontend"""
+    epochs = []
+    for idx, t in enumerate(jd):
+        nominal = result['nominal'][idx]
+        lower, upper = result['axis'][0, idx], result['axis'][1, idx]
+        epochs.append({
+            'jd': float(t),
+            'date': jd_to_datetime(t).strftime('%Y-%m-%d %H:%M:%S'),
+            'nominal': {'x': float(nominal[0]), 'y': float(nominal[1]), 'z': float(nominal[2])},
+            'radius_au': {f"p{int(p)}": float(result['radial'][k, idx])
+                          for k, p in enumerate(RADIAL_PERCENTILES)},
+            'lower': {'x': float(lower[0]), 'y': float(lower[1]), 'z': float(lower[2])},
+            'upper': {'x': float(upper[0]), 'y': float(upper[1]), 'z': float(upper[2])},
+        })
+
+    return {'metadata': metadata, 'epochs': epochs}
+
+
+def main():
+    """Generate the ATLAS uncertainty tube"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Monte Carlo orbit-uncertainty ensemble for 3I/ATLAS"
+    )
+    parser.add_argument('--clones', type=int, default=10000, help='Number of clones')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes')
+    parser.add_argument('--step-hours', type=float, default=24.0, help='Output cadence')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed')
+    parser.add_argument('--fetch', action='store_true', help='Download covariance from SBDB first')
+    parser.add_argument('--output', default=OUTPUT_FILE, help='Output file')
+    args = parser.parse_args()
+
+    if args.fetch:
+        fetch_sbdb_covariance()
+
+    loaded = load_covariance()
+    if loaded:
+        nominal, covariance, source = loaded
+        print(f"✓ Using {source}")
+    else:
+        nominal, solution = nominal_elements()
+        covariance = np.diag([DEFAULT_SIGMAS[name] ** 2 for name in ELEMENT_NAMES])
+        source = f"illustrative diagonal sigmas around {solution} (no covariance file)"
+        print(f"⚠ No covariance found ({COVARIANCE_FILE}); using {source}")
+
+    jd = np.arange(date_to_jd(DISCOVERY_DATE), date_to_jd(FUTURE_DATE) + 1e-9,
+                   args.step_hours / 24.0)
+    clones = sample_clones(nominal, covariance, args.clones + 1, args.seed)
+    workers = args.workers or default_workers()
+
+    t_start = time.perf_counter()
+    result = run_ensemble(clones, jd, workers)
+    elapsed = time.perf_counter() - t_start
+
+    metadata = {
+        'generated': datetime.now().isoformat(),
+        'clones': args.clones,
+        'covariance_source': source,
+        'element_names': list(ELEMENT_NAMES),
+        'radial_percentiles': list(RADIAL_PERCENTILES),
+        'axis_percentiles': list(AXIS_PERCENTILES),
+        'units': {'distance': 'AU', 'time': 'JD TDB'},
+        'frame': 'heliocentric J2000 ecliptic',
+    }
+    product = build_uncertainty_tube(result, jd, metadata)
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(product, f, indent=2)
+
+    widest = result['radial'][-1].max() * 149597870.7
+    print(f"✓ Propagated {args.clones} clones x {len(jd)} epochs on {workers} worker(s) "
+          f"in {elapsed:.2f} s")
+    print(f"  Widest p{int(RADIAL_PERCENTILES[-1])} radius: {widest:,.0f} km")
+    print(f"✓ Uncertainty tube saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
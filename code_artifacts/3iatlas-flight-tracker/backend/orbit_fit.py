@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Least-Squares Orbit Fitting for 3I/ATLAS
+========================================
+
+Solves for the two-body conic that best matches the latest fetched Horizons
+vector series and persists it, so the fallback generators track the current
+orbit solution instead of hand-copied elements.
+
+Method:
+- Levenberg-Marquardt on heliocentric position residuals
+- Residuals for every epoch come from one vectorized conic propagation
+- The Jacobian is built by propagating the nominal and all six perturbed
+  element sets in a single batched call
+
+Usage:
+    python3 orbit_fit.py                 # fit stored trajectory_static.json
+    python3 orbit_fit.py --input FILE    # fit another stored product
+
+Author: 3IAtlas Development Team
+"""
+
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+
+from conic import ELEMENT_NAMES, elements_to_dict, propagate, state_to_elements
+from ephemeris import EphemerisSeries, jd_to_datetime, load_ephemerides
+
+AU_TO_KM = 149597870.7
+TRAJECTORY_FILE = "../frontend/public/data/trajectory_static.json"
+SOLUTION_FILE = "atlas_orbit_solution.json"
+
+# Finite-difference steps for e, q (AU), tp (days), om, w, i (deg)
+JACOBIAN_STEPS = np.array([1e-7, 1e-8, 1e-5, 1e-6, 1e-6, 1e-6])
+
+
+def _residuals(elements: np.ndarray, jd: np.ndarray, observed: np.ndarray) -> np.ndarray:
+    """Model minus observed positions for a batch of element sets (B, T*3)"""
+    model, _ = propagate(elements, jd)               # (T, B, 3)
+    return (model - observed[:, None, :]).transpose(1, 0, 2).reshape(len(elements), -1)
+
+
+def fit_elements(series: EphemerisSeries, initial: Optional[np.ndarray] = None,
+                 max_iterations: int = 50, tolerance: float = 1e-12) -> Dict:
+    """Fit conic elements to a fetched vector series
+
+    Args:
+        series: Heliocentric ecliptic vectors (AU, AU/day)
+        initial: Starting elements; defaults to the osculating elements at
+            the middle of the arc
+
+    Returns:
+        Dict with the fitted elements, residual statistics and iteration count
+    """
+    jd, observed = series.jd, series.position
+    if initial is None:
+        mid = len(jd) // 2
+        initial = state_to_elements(series.position[mid], series.velocity[mid], jd[mid])
+
+    params = np.asarray(initial, dtype=np.float64).copy()
+    damping = 1e-3
+    perturb = np.diag(JACOBIAN_STEPS)
+
+    batch = np.vstack([params, params + perturb])
+    residuals = _residuals(batch, jd, observed)
+    cost = float(residuals[0] @ residuals[0])
+
+    iteration = 0
+    for iteration in range(1, max_iterations + 1):
+        r0 = residuals[0]
+        J = ((residuals[1:] - r0) / JACOBIAN_STEPS[:, None]).T     # (T*3, 6)
+
+        JtJ = J.T @ J
+        Jtr = J.T @ r0
+        step = np.linalg.solve(JtJ + damping * np.diag(np.diag(JtJ)), -Jtr)
+
+        candidate = params + step
+        batch = np.vstack([candidate, candidate + perturb])
+        trial = _residuals(batch, jd, observed)
+        trial_cost = float(trial[0] @ trial[0])
+
+        if trial_cost < cost:
+            converged = cost - trial_cost < tolerance * max(cost, 1e-30)
+            params, residuals, cost = candidate, trial, trial_cost
+            damping = max(damping / 10, 1e-12)
+            if converged:
+                break
+        else:
+            damping *= 10
+            if damping > 1e8:
+                break
+
+    distance = np.linalg.norm(residuals[0].reshape(-1, 3), axis=1)
+    params[3] %= 360
+    params[4] %= 360
+
+    return {
+        'elements': elements_to_dict(params),
+        'residuals': {
+            'rms_km': float(np.sqrt(np.mean(distance ** 2)) * AU_TO_KM),
+            'max_km': float(distance.max() * AU_TO_KM),
+            'rms_au': float(np.sqrt(np.mean(distance ** 2))),
+        },
+        'arc': {
+            'start': jd_to_datetime(jd[0]).strftime('%Y-%m-%d %H:%M:%S'),
+            'end': jd_to_datetime(jd[-1]).strftime('%Y-%m-%d %H:%M:%S'),
+            'start_jd': float(jd[0]),
+            'end_jd': float(jd[-1]),
+            'points': int(len(jd)),
+        },
+        'iterations': iteration,
+    }
+
+
+def save_solution(solution: Dict, path: str = SOLUTION_FILE) -> None:
+    """Persist a fitted solution with its residual statistics"""
+    record = {
+        'generated': datetime.now().isoformat(),
+        'source': 'Least-squares conic fit to NASA JPL Horizons vectors',
+        'frame': 'heliocentric J2000 ecliptic',
+        'element_names': list(ELEMENT_NAMES),
+    }
+    record.update(solution)
+
+    with open(path, 'w') as f:
+        json.dump(record, f, indent=2)
+
+
+def load_solution(path: str = SOLUTION_FILE) -> Optional[Dict]:
+    """Load the persisted solution, or None if there is none"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def refresh_solution(records, path: str = SOLUTION_FILE) -> Optional[Dict]:
+    """Fit freshly fetched ATLAS records and persist the result"""
+    fetched = [p for p in records if not p.get('calculated')]
+    if len(fetched) < 10:
+        return None
+
+    solution = fit_elements(EphemerisSeries.from_records(fetched, name='atlas'))
+    save_solution(solution, path)
+    return solution
+
+
+def main():
+    """Fit the stored ATLAS vectors and save the solution"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Fit 3I/ATLAS conic elements to stored Horizons vectors"
+    )
+    parser.add_argument('--input', default=TRAJECTORY_FILE,
+                        help='Stored trajectory product to fit')
+    parser.add_argument('--output', default=SOLUTION_FILE,
+                        help='Where to write the fitted solution')
+    args = parser.parse_args()
+
+    stored = load_ephemerides(args.input)
+    if 'atlas' not in stored:
+        print(f"✗ No ATLAS data in {args.input}")
+        sys.exit(1)
+
+    solution = fit_elements(stored['atlas'])
+    save_solution(solution, args.output)
+
+    el = solution['elements']
+    res = solution['residuals']
+    print(f"✓ Fitted {solution['arc']['points']} points in {solution['iterations']} iterations")
+    print(f"  e={el['e']:.6f}  q={el['q']:.6f} AU  tp=JD {el['tp']:.5f}")
+    print(f"  Ω={el['om']:.4f}°  ω={el['w']:.4f}°  i={el['i']:.4f}°")
+    print(f"  Residuals: rms {res['rms_km']:,.0f} km, max {res['max_km']:,.0f} km")
+    print(f"✓ Solution saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Adaptive Analytic Orbit Paths
+=============================
+
+Builds complete orbit polylines from conic elements instead of drawing the
+sampled fetch points: closed ellipses for the planets and the 3I/ATLAS
+hyperbola out to a chosen heliocentric distance on both legs, beyond the
+fetched date window.
+
+Method:
+- Elements: the persisted orbit_fit.py solution for ATLAS, osculating
+  elements at the middle of the stored series for every other body
+- Ellipses are closed loops; open orbits are cut at a heliocentric radius
+- Sampling is in true anomaly. Every segment whose mid-anomaly point lies
+  farther than the tolerance from its chord (the sagitta) is split, one
+  vectorized pass per level, until every segment is within tolerance
+- The tolerance is screen-space: the AU covered by one pixel error in a
+  view of the given width, so vertices concentrate where curvature is high
+  (ATLAS perihelion) and asymptotes get only a few
+
+Usage:
+    python3 orbit_paths.py                          # orbit_paths.json, 0.5 px at 10 AU / 1920 px
+    python3 orbit_paths.py --view-au 3 --pixels 0.25 --max-radius 15
+
+Author: 3IAtlas Development Team
+"""
+
+import json
+import sys
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+
+from conic import elements_from_dict, state_at_anomaly, state_to_elements
+from ephemeris import EphemerisSeries, load_stored
+from orbit_fit import load_solution
+
+OUTPUT_FILE = "../frontend/public/data/orbit_paths.json"
+
+# Screen-space tolerance: PIXEL_ERROR px on a SCREEN_PIXELS-wide view of VIEW_WIDTH_AU
+VIEW_WIDTH_AU = 10.0
+SCREEN_PIXELS = 1920
+PIXEL_ERROR = 0.5
+
+# Parabolic and hyperbolic orbits are drawn out to this heliocentric distance
+MAX_RADIUS_AU = 10.0
+
+INITIAL_SEGMENTS = 8
+MAX_LEVELS = 24
+
+VERTEX_DECIMALS = 6
+
+
+def screen_tolerance(view_au: float = VIEW_WIDTH_AU, pixels: float = PIXEL_ERROR,
+                     screen_px: int = SCREEN_PIXELS) -> float:
+    """AU spanned by a pixel error in a view view_au wide"""
+    return view_au * pixels / screen_px
+
+
+def anomaly_range(elements: np.ndarray, max_radius: float = MAX_RADIUS_AU):
+    """(start, end, closed) true-anomaly span to draw for one orbit
+
+    Ellipses are drawn closed; parabolic and hyperbolic orbits are cut where
+    r = max_radius.
+    """
+    e, q = elements[0], elements[1]
+    p = q * (1 + e)
+    if e < 1:
+        return -np.pi, np.pi, True
+    if max_radius <= q:
+        raise ValueError(f"max radius {max_radius} AU is inside perihelion ({q:.3f} AU)")
+    limit = np.arccos(np.clip((p / max_radius - 1) / e, -1.0, 1.0))
+    return -limit, limit, False
+
+
+def _positions(elements: np.ndarray, nu: np.ndarray) -> np.ndarray:
+    return state_at_anomaly(elements, nu)[0]
+
+
+def _sagitta(elements: np.ndarray, nu: np.ndarray) -> np.ndarray:
+    """Distance of each segment's mid-anomaly point from its chord"""
+    ends = _positions(elements, nu)
+    middle = _positions(elements, 0.5 * (nu[:-1] + nu[1:]))
+    chord = ends[1:] - ends[:-1]
+    offset = middle - ends[:-1]
+    return (np.linalg.norm(np.cross(offset, chord), axis=1) /
+            np.maximum(np.linalg.norm(chord, axis=1), 1e-300))
+
+
+def adaptive_anomalies(elements: np.ndarray, tolerance: float, start: float,
+                       end: float) -> np.ndarray:
+    """True anomalies whose polyline stays within tolerance of the conic"""
+    nu = np.linspace(start, end, INITIAL_SEGMENTS + 1)
+    for _ in range(MAX_LEVELS):
+        split = _sagitta(elements, nu) > tolerance
+        if not np.any(split):
+            break
+        middle = 0.5 * (nu[:-1] + nu[1:])[split]
+        nu = np.sort(np.concatenate([nu, middle]))
+    return nu
+
+
+def orbit_path(elements: np.ndarray, tolerance: float,
+               max_radius: float = MAX_RADIUS_AU) -> Dict:
+    """Vertices (stored ecliptic frame) and statistics for one orbit"""
+    start, end, closed = anomaly_range(elements, max_radius)
+    nu = adaptive_anomalies(elements, tolerance, start, end)
+    if closed:
+        nu = nu[:-1]                   # drawn as a loop; -pi and pi coincide
+    vertices = _positions(elements, nu)
+
+    steps = np.diff(nu)
+    uniform = int(np.ceil((end - start) / steps.min())) + 1 if len(steps) else len(nu)
+    loop = np.append(nu, nu[0] + 2 * np.pi) if closed else nu
+    return {
+        'closed': closed,
+        'count': len(nu),
+        'uniform_count': uniform,
+        'max_error_au': float(_sagitta(elements, loop).max()),
+        'anomaly_range_deg': [float(np.degrees(start)), float(np.degrees(end))],
+        'vertices': np.round(vertices, VERTEX_DECIMALS).ravel().tolist(),
+    }
+
+
+def body_elements(series: EphemerisSeries, solution: Optional[Dict] = None) -> np.ndarray:
+    """Fitted elements when a solution is given, else osculating at mid-span"""
+    if solution is not None:
+        return elements_from_dict(solution['elements'])
+    k = len(series) // 2
+    return state_to_elements(series.position[k], series.velocity[k], series.jd[k])
+
+
+def build_paths(tolerance: float, max_radius: float = MAX_RADIUS_AU) -> Dict[str, Dict]:
+    """Orbit paths for every stored body, keyed like the stored products"""
+    stored = load_stored()
+    solution = load_solution()
+    paths = {}
+    for name in sorted(stored):
+        elements = body_elements(stored[name], solution if name == 'atlas' else None)
+        path = orbit_path(elements, tolerance, max_radius)
+        path['elements'] = dict(zip(('e', 'q', 'tp', 'om', 'w', 'i'),
+                                    (round(float(v), 9) for v in elements)))
+        paths[name] = path
+    return paths
+
+
+def main():
+    """Build orbit polylines for the stored bodies"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Curvature-adaptive analytic orbit paths")
+    parser.add_argument('--view-au', type=float, default=VIEW_WIDTH_AU,
+                        help='Width of the reference view in AU')
+    parser.add_argument('--pixels', type=float, default=PIXEL_ERROR,
+                        help='Allowed deviation in pixels at that view')
+    parser.add_argument('--screen-px', type=int, default=SCREEN_PIXELS,
+                        help='Reference screen width in pixels')
+    parser.add_argument('--max-radius', type=float, default=MAX_RADIUS_AU,
+                        help='Heliocentric distance where open orbits are cut (AU)')
+    parser.add_argument('--output', default=OUTPUT_FILE, help='Output JSON file')
+    args = parser.parse_args()
+
+    tolerance = screen_tolerance(args.view_au, args.pixels, args.screen_px)
+    paths = build_paths(tolerance, args.max_radius)
+    if not paths:
+        print("✗ No stored ephemerides found")
+        sys.exit(1)
+
+    for name, path in paths.items():
+        shape = 'closed' if path['closed'] else 'open'
+        print(f"  {name:10s} {shape:6s} {path['count']:5d} vertices "
+              f"(uniform: {path['uniform_count']:6d})  max error {path['max_error_au']:.2e} AU")
+
+    product = {
+        'metadata': {
+            'generated': datetime.now().isoformat(),
+            'frame': 'heliocentric J2000 ecliptic',
+            'tolerance_au': tolerance,
+            'max_radius_au': args.max_radius,
+            'layout': 'vertices are flat [x, y, z, ...] in AU',
+        },
+        'paths': paths,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(product, f, separators=(',', ':'))
+    total = sum(path['count'] for path in paths.values())
+    print(f"✓ {len(paths)} orbits, {total} vertices, tolerance {tolerance:.2e} AU")
+    print(f"✓ Saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
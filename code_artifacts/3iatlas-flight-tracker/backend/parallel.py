@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Process-Pool Helpers with Shared-Memory Arrays
+==============================================
+
+Large batch jobs (orbit ensembles, catalog propagation, visibility grids)
+split their work into chunks that run in a process pool. Inputs and outputs
+live in shared memory, so workers read and write NumPy arrays in place and
+nothing bulky is pickled between processes.
+
+Author: 3IAtlas Development Team
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class SharedArray:
+    """NumPy array backed by a named shared-memory block
+
+    The owning process creates it; workers attach with the lightweight
+    descriptor returned by spec().
+    """
+
+    def __init__(self, shape: Tuple[int, ...], dtype=np.float64,
+                 name: Optional[str] = None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        size = max(int(np.prod(self.shape)) * self.dtype.itemsize, 1)
+
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf)
+
+    @classmethod
+    def from_array(cls, values: np.ndarray) -> 'SharedArray':
+        shared = cls(values.shape, values.dtype)
+        shared.array[...] = values
+        return shared
+
+    def spec(self) -> Dict:
+        """Picklable descriptor for attaching from a worker"""
+        return {'name': self.shm.name, 'shape': self.shape, 'dtype': self.dtype.str}
+
+    def close(self) -> None:
+        self.array = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+@contextmanager
+def attached(spec: Dict):
+    """Attach to a shared array inside a worker"""
+    shared = SharedArray(spec['shape'], spec['dtype'], name=spec['name'])
+    try:
+        yield shared.array
+    finally:
+        shared.close()
+
+
+def chunk_ranges(count: int, chunk_size: int) -> List[Tuple[int, int]]:
+    """Split range(count) into [start, stop) chunks"""
+    return [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+
+def default_workers() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+def run_chunks(worker: Callable, tasks: Sequence, workers: Optional[int] = None) -> List:
+    """Run worker(task) for every task, in a process pool when it helps
+
+    Workers must be module-level functions. With a single worker (or a single
+    task) everything runs in-process, which keeps small jobs free of pool
+    start-up cost.
+    """
+    workers = workers or default_workers()
+    if workers == 1 or len(tasks) <= 1:
+        return [worker(task) for task in tasks]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(worker, tasks))
+
+
+def balanced_chunk_size(count: int, workers: int, per_worker: int = 4,
+                        minimum: int = 1) -> int:
+    """Chunk size giving each worker a few chunks for load balancing"""
+    return max(minimum, -(-count // (workers * per_worker)))
+
+
+def close_all(arrays: Iterable[SharedArray]) -> None:
+    for shared in arrays:
+        shared.close()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Comet Total-Magnitude Prediction
+================================
+
+Predicts the total (nucleus + coma) visual magnitude of 3I/ATLAS over the
+whole trajectory from the M1/k1 photometric parameters, instead of fetching
+T-mag with OBSERVER-type Horizons queries.
+
+Method:
+- r and delta come from observer_geometry.py (light-time corrected), for
+  every epoch at once
+- Horizons' comet magnitude law, vectorized:
+
+      T-mag = M1 + 5 log10(delta) + k1 log10(r)
+
+  k1 is Horizons' slope parameter, i.e. 2.5 n for an activity index n
+  (k1 = 4.5 means brightness ~ r^-1.8)
+- Brightness peaks are the local minima of the magnitude curve, refined by
+  a parabola through the bracketing samples
+
+M1 = 12.3 and k1 = 4.5 are the values in the JPL#26 solution header
+(3iatlasapps/horizons_results.txt); with the stored vectors this reproduces
+the Horizons T-mag column to ~0.001 mag.
+
+Usage:
+    python3 photometry.py                              # curve summary and peaks
+    python3 photometry.py --output brightness_curve.json
+    python3 photometry.py --validate ../../../3iatlasapps/horizons_results.txt
+
+Author: 3IAtlas Development Team
+"""
+
+import json
+import re
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ephemeris import EphemerisSeries, jd_to_datetime, load_stored
+from observer_geometry import DELTA_T_2025, observer_geometry, parse_horizons_observer
+
+# Total-magnitude parameters for 3I/ATLAS (JPL#26)
+M1_ATLAS = 12.3
+K1_ATLAS = 4.5
+
+# Naked-eye limit under dark skies
+NAKED_EYE_LIMIT = 6.0
+
+CURVE_STEP_HOURS = 6.0
+
+
+def total_magnitude(r_au, delta_au, m1: float = M1_ATLAS, k1: float = K1_ATLAS) -> np.ndarray:
+    """Comet total magnitude m = M1 + 5 log10(delta) + k1 log10(r)"""
+    return m1 + 5.0 * np.log10(delta_au) + k1 * np.log10(r_au)
+
+
+def read_photometric_parameters(path: str) -> Tuple[float, float]:
+    """M1 and k1 from a Horizons output header"""
+    with open(path, 'r') as f:
+        text = f.read()
+    match = re.search(r'M1=\s*([-\d.]+).*?k1=\s*([-\d.]+)', text)
+    if not match:
+        raise ValueError(f"No M1/k1 parameters in {path}")
+    return float(match.group(1)), float(match.group(2))
+
+
+def brightness_curve(target: EphemerisSeries, observer: EphemerisSeries, jd,
+                     m1: float = M1_ATLAS, k1: float = K1_ATLAS) -> Dict[str, np.ndarray]:
+    """Observer geometry plus a 'magnitude' column for every epoch"""
+    table = observer_geometry(target, observer, jd)
+    table['magnitude'] = total_magnitude(table['r_au'], table['delta_au'], m1, k1)
+    return table
+
+
+def _parabola_vertex(jd: np.ndarray, values: np.ndarray, k: np.ndarray):
+    """Vertex (epoch, value) of the parabola through samples k-1, k, k+1
+
+    Assumes a uniform step, as produced by brightness_curve callers.
+    """
+    y0, y1, y2 = values[k - 1], values[k], values[k + 1]
+    curvature = y0 - 2 * y1 + y2
+    offset = np.where(curvature > 0, 0.5 * (y0 - y2) / np.where(curvature > 0, curvature, 1), 0)
+    step = jd[k + 1] - jd[k]
+    return jd[k] + offset * step, y1 - 0.25 * (y0 - y2) * offset
+
+
+def peak_events(curve: Dict[str, np.ndarray], target_name: str = '3I/ATLAS') -> List[Dict]:
+    """Timeline events for each brightness maximum (magnitude minimum)"""
+    magnitude, jd = curve['magnitude'], curve['jd']
+    interior = (magnitude[1:-1] < magnitude[:-2]) & (magnitude[1:-1] <= magnitude[2:])
+    k = np.nonzero(interior)[0] + 1
+    peak_jd, peak_mag = _parabola_vertex(jd, magnitude, k)
+
+    events = []
+    for n, (t, m) in enumerate(zip(peak_jd, peak_mag)):
+        when = jd_to_datetime(t)
+        nearest = int(k[n])
+        visibility = "naked-eye" if m <= NAKED_EYE_LIMIT else "telescopic"
+        events.append({
+            'id': 'peak_brightness' if n == 0 else f'peak_brightness_{n + 1}',
+            'name': 'Peak Brightness',
+            'date': when.strftime('%Y-%m-%d'),
+            'time_tdb': when.strftime('%Y-%m-%dT%H:%M:%S'),
+            'jd': round(float(t), 6),
+            'magnitude': round(float(m), 2),
+            'distance_au': round(float(curve['delta_au'][nearest]), 4),
+            'r_au': round(float(curve['r_au'][nearest]), 4),
+            'elongation_deg': round(float(curve['elongation_deg'][nearest]), 1),
+            'description': (f"{target_name} is brightest from Earth at predicted total "
+                            f"magnitude {m:.1f} ({visibility}), "
+                            f"{curve['elongation_deg'][nearest]:.0f}° from the Sun"),
+            'type': 'milestone',
+        })
+    return events
+
+
+def magnitudes_at(stored: Dict[str, EphemerisSeries], jd, target: str = 'atlas',
+                  observer: str = 'earth', m1: float = M1_ATLAS,
+                  k1: float = K1_ATLAS) -> Optional[np.ndarray]:
+    """Predicted magnitudes at given epochs, or None without target/observer data"""
+    if target not in stored or observer not in stored:
+        return None
+    return brightness_curve(stored[target], stored[observer], jd, m1, k1)['magnitude']
+
+
+def stored_curve(stored: Dict[str, EphemerisSeries], target: str = 'atlas',
+                 observer: str = 'earth', step_hours: float = CURVE_STEP_HOURS,
+                 m1: float = M1_ATLAS, k1: float = K1_ATLAS) -> Optional[Dict[str, np.ndarray]]:
+    """Brightness curve over the span both stored series cover"""
+    if target not in stored or observer not in stored:
+        return None
+    start = max(stored[target].start, stored[observer].start)
+    end = min(stored[target].end, stored[observer].end)
+    jd = np.arange(start, end + 1e-9, step_hours / 24.0)
+    return brightness_curve(stored[target], stored[observer], jd, m1, k1)
+
+
+def validate(stored: Dict[str, EphemerisSeries], path: str) -> Dict[str, float]:
+    """Largest difference from the T-mag column of a Horizons OBSERVER table"""
+    m1, k1 = read_photometric_parameters(path)
+    reference = parse_horizons_observer(path)
+    predicted = magnitudes_at(stored, reference['jd_ut'] + DELTA_T_2025 / 86400.0, m1=m1, k1=k1)
+    error = np.abs(predicted - reference['t_mag'])
+    return {'epochs': len(error), 'm1': m1, 'k1': k1,
+            'max_mag': float(error.max()), 'rms_mag': float(np.sqrt(np.mean(error ** 2)))}
+
+
+def main():
+    """Predict the brightness curve and its peaks"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Comet total-magnitude prediction")
+    parser.add_argument('--m1', type=float, default=M1_ATLAS, help='Total absolute magnitude')
+    parser.add_argument('--k1', type=float, default=K1_ATLAS, help='Horizons slope parameter')
+    parser.add_argument('--step-hours', type=float, default=CURVE_STEP_HOURS, help='Curve step')
+    parser.add_argument('--output', default=None, help='Write the curve and peaks as JSON')
+    parser.add_argument('--validate', default=None, metavar='HORIZONS_TXT',
+                        help='Compare against the T-mag column of a Horizons table')
+    args = parser.parse_args()
+
+    stored = load_stored()
+    if args.validate:
+        if 'atlas' not in stored or 'earth' not in stored:
+            print("✗ Stored ATLAS and Earth data are required")
+            sys.exit(1)
+        result = validate(stored, args.validate)
+        print(f"✓ M1={result['m1']} k1={result['k1']}: {result['epochs']} epochs, "
+              f"max |dm| {result['max_mag']:.3f}, rms {result['rms_mag']:.3f} mag")
+        return
+
+    curve = stored_curve(stored, step_hours=args.step_hours, m1=args.m1, k1=args.k1)
+    if curve is None:
+        print("✗ Stored ATLAS and Earth data are required")
+        sys.exit(1)
+
+    peaks = peak_events(curve)
+    print(f"✓ {len(curve['jd'])} epochs, magnitude {curve['magnitude'].min():.2f}"
+          f"-{curve['magnitude'].max():.2f}")
+    for event in peaks:
+        print(f"  {event['time_tdb']} TDB  m = {event['magnitude']:.2f}  "
+              f"delta {event['distance_au']:.3f} AU  r {event['r_au']:.3f} AU  "
+              f"elongation {event['elongation_deg']:.0f}°")
+
+    if args.output:
+        product = {
+            'metadata': {
+                'generated': datetime.now().isoformat(),
+                'model': 'm = M1 + 5 log10(delta) + k1 log10(r)',
+                'm1': args.m1,
+                'k1': args.k1,
+                'observer': 'geocenter',
+                'units': {'distance': 'AU', 'time': 'JD TDB'},
+            },
+            'curve': [
+                {'jd': round(float(t), 6),
+                 'date': jd_to_datetime(t).strftime('%Y-%m-%d %H:%M:%S'),
+                 'magnitude': round(float(m), 3),
+                 'r_au': round(float(r), 6),
+                 'delta_au': round(float(d), 6),
+                 'elongation_deg': round(float(e), 3)}
+                for t, m, r, d, e in zip(curve['jd'], curve['magnitude'], curve['r_au'],
+                                         curve['delta_au'], curve['elongation_deg'])
+            ],
+            'peaks': peaks,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(product, f, indent=2)
+        print(f"✓ Curve saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Time-Sliced Spatial Index for Close-Approach Search
+===================================================
+
+Answers "which bodies come within 0.5 AU of ATLAS" and "all pairwise close
+approaches" for anything from the 13 stored objects to full small-body
+catalogs, without O(N^2 T) loops or an (N, N, T) distance tensor.
+
+Method:
+- Positions are columnar: one (epochs, bodies, 3) array on a shared grid
+- Epochs are cut into blocks. Per block, each body is reduced to the center
+  and radius of the sphere enclosing its sampled positions
+- Those spheres are binned on a uniform 3D grid (cell = threshold + the two
+  largest sphere diameters) and sorted by cell key; neighbouring cells are
+  found with np.searchsorted, giving the candidate pairs of the block
+- Only candidate pairs are evaluated on the block's epochs (in chunks);
+  local minima of d^2 are refined with a parabola through the samples
+
+Sources: the stored trajectory products (interpolated onto a common grid),
+or a catalog_propagation.py manifest, to which ATLAS is added from the
+stored data.
+
+Usage:
+    python3 proximity_index.py --threshold 0.5                     # ATLAS vs stored bodies
+    python3 proximity_index.py --all-pairs --threshold 0.3
+    python3 proximity_index.py --small-bodies ../frontend/public/data/small_bodies.json --threshold 0.05
+
+Author: 3IAtlas Development Team
+"""
+
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from catalog_propagation import SMALL_BODIES_OBJECT
+from columnar import columns_from_manifest, read_manifest
+from ephemeris import EphemerisSeries, common_grid, jd_to_datetime, load_stored
+
+AU_TO_KM = 149597870.7
+
+DEFAULT_THRESHOLD_AU = 0.5
+BLOCK_EPOCHS = 4
+
+# Candidate pairs evaluated per vectorized chunk
+PAIR_CHUNK = 100000
+
+# Query bodies expanded against the grid at once
+QUERY_CHUNK = 50000
+
+# The 27-cell neighbourhood of a cell, and the half of it (own cell plus the
+# 13 lexicographically positive neighbours) that sees every pair once
+NEIGHBOUR_OFFSETS = np.array([(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                              for dz in (-1, 0, 1)])
+HALF_OFFSETS = NEIGHBOUR_OFFSETS[13:]
+
+
+def columnar_positions(ephemerides: Dict[str, EphemerisSeries],
+                       names: Optional[List[str]] = None,
+                       jd: Optional[np.ndarray] = None) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """(names, jd, positions (epochs, bodies, 3)) on one time grid"""
+    names = names or sorted(ephemerides)
+    if jd is None:
+        jd = common_grid([ephemerides[name] for name in names])
+    positions = np.stack([ephemerides[name].interpolate(jd)[0] for name in names], axis=1)
+    return names, jd, positions
+
+
+def load_small_bodies(manifest_path: str) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Names, epochs and float32 positions written by catalog_propagation.py"""
+    manifest = read_manifest(manifest_path)
+    columns = columns_from_manifest(manifest, os.path.dirname(manifest_path))[SMALL_BODIES_OBJECT]
+    return manifest['names'], np.array(columns['jd']), np.asarray(columns['position'])
+
+
+def _bounding_spheres(block: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Center and radius enclosing each body's positions in a block (epochs, bodies, 3)"""
+    low, high = block.min(axis=0), block.max(axis=0)
+    center = 0.5 * (low + high)
+    radius = np.linalg.norm(block - center, axis=2).max(axis=0)
+    return center, radius
+
+
+def _block_candidates(center: np.ndarray, radius: np.ndarray, threshold: float,
+                      queries: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Pairs (i, j) whose block spheres come within threshold
+
+    queries restricts i to the given bodies (e.g. ATLAS only); otherwise
+    every pair is returned once.
+    """
+    reach = threshold + 2.0 * float(np.max(radius))
+    cell = np.floor(center / reach).astype(np.int64)
+    cell -= cell.min(axis=0) - 1
+    dims = cell.max(axis=0) + 2
+    keys = (cell[:, 0] * dims[1] + cell[:, 1]) * dims[2] + cell[:, 2]
+
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    query_all = queries is None
+    queries = np.arange(len(center)) if query_all else np.asarray(queries)
+    stencil = HALF_OFFSETS if query_all else NEIGHBOUR_OFFSETS
+    offsets = (stencil[:, 0] * dims[1] + stencil[:, 1]) * dims[2] + stencil[:, 2]
+
+    first, second = [], []
+    for start in range(0, len(queries), QUERY_CHUNK):
+        body = queries[start:start + QUERY_CHUNK]
+        neighbour = keys[body][:, None] + offsets[None, :]            # (Q, 27)
+        lo = np.searchsorted(sorted_keys, neighbour, side='left').ravel()
+        hi = np.searchsorted(sorted_keys, neighbour, side='right').ravel()
+        counts = hi - lo
+        if not counts.sum():
+            continue
+
+        i = np.repeat(np.repeat(body, len(offsets)), counts)
+        slots = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        j = order[np.repeat(lo, counts) + slots]
+
+        if query_all:
+            # Pairs inside one cell are seen from both bodies: keep i < j
+            own_cell = np.repeat(np.tile(offsets == 0, len(body)), counts)
+            keep = ~own_cell | (i < j)
+        else:
+            keep = i != j
+        i, j = i[keep], j[keep]
+        gap = np.linalg.norm(center[i] - center[j], axis=1) - radius[i] - radius[j]
+        near = gap <= threshold
+        first.append(i[near])
+        second.append(j[near])
+
+    if not first:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(first), np.concatenate(second)
+
+
+def _pair_minima(window: np.ndarray, jd: np.ndarray, i: np.ndarray, j: np.ndarray,
+                 inner: slice, threshold: float) -> Tuple[np.ndarray, ...]:
+    """Refined distance minima of pairs (i, j) inside window epochs `inner`"""
+    d2 = np.sum((window[:, i].astype(np.float64) - window[:, j]) ** 2, axis=2)   # (W, P)
+    is_min = (d2[1:-1] <= d2[:-2]) & (d2[1:-1] < d2[2:])
+    k, pair = np.nonzero(is_min)
+    k += 1
+    keep = (k >= inner.start) & (k < inner.stop)
+    k, pair = k[keep], pair[keep]
+
+    y0, y1, y2 = d2[k - 1, pair], d2[k, pair], d2[k + 1, pair]
+    curvature = y0 - 2 * y1 + y2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        offset = np.where(curvature > 0, 0.5 * (y0 - y2) / curvature, 0.0)
+    offset = np.clip(offset, -1.0, 1.0)
+    minimum = np.maximum(y1 - 0.25 * (y0 - y2) * offset, 0.0)
+    step = np.where(offset >= 0, jd[np.minimum(k + 1, len(jd) - 1)] - jd[k], jd[k] - jd[k - 1])
+
+    distance = np.sqrt(minimum)
+    close = distance <= threshold
+    return i[pair[close]], j[pair[close]], (jd[k] + offset * step)[close], distance[close]
+
+
+def close_approaches(positions: np.ndarray, jd: np.ndarray,
+                     threshold: float = DEFAULT_THRESHOLD_AU,
+                     targets: Optional[List[int]] = None,
+                     block_epochs: int = BLOCK_EPOCHS) -> Dict[str, np.ndarray]:
+    """Every close approach below threshold, as flat arrays
+
+    positions is (epochs, bodies, 3). With targets only pairs involving
+    those body indices are searched. Returns 'i', 'j', 'jd' and
+    'distance_au', sorted by time.
+    """
+    epochs = len(jd)
+    found = {'i': [], 'j': [], 'jd': [], 'distance_au': []}
+
+    for start in range(1, epochs - 1, block_epochs):
+        stop = min(start + block_epochs, epochs - 1)
+        window = positions[start - 1:stop + 1]
+        center, radius = _bounding_spheres(window)
+        i, j = _block_candidates(center, radius, threshold, targets)
+        if not len(i):
+            continue
+
+        window_jd = jd[start - 1:stop + 1]
+        for chunk in range(0, len(i), PAIR_CHUNK):
+            part = slice(chunk, chunk + PAIR_CHUNK)
+            for key, values in zip(found, _pair_minima(window, window_jd, i[part], j[part],
+                                                       slice(1, stop - start + 1), threshold)):
+                found[key].append(values)
+
+    result = {key: np.concatenate(values) if values else np.zeros(0)
+              for key, values in found.items()}
+    order = np.argsort(result['jd'])
+    return {key: values[order] for key, values in result.items()}
+
+
+def closest_per_pair(approaches: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Keep only the closest approach of each pair"""
+    if not len(approaches['i']):
+        return approaches
+    i, j = approaches['i'].astype(np.int64), approaches['j'].astype(np.int64)
+    low, high = np.minimum(i, j), np.maximum(i, j)
+    order = np.lexsort((approaches['distance_au'], high, low))
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (low[order][1:] != low[order][:-1]) | (high[order][1:] != high[order][:-1])
+    keep = order[first]
+    keep = keep[np.argsort(approaches['distance_au'][keep])]
+    return {key: values[keep] for key, values in approaches.items()}
+
+
+def to_records(names: List[str], approaches: Dict[str, np.ndarray]) -> List[Dict]:
+    """JSON-ready approach records"""
+    return [{
+        'body_a': names[int(i)],
+        'body_b': names[int(j)],
+        'jd': round(float(t), 6),
+        'time_tdb': jd_to_datetime(t).strftime('%Y-%m-%dT%H:%M:%S'),
+        'distance_au': round(float(d), 6),
+        'distance_km': round(float(d) * AU_TO_KM),
+    } for i, j, t, d in zip(approaches['i'], approaches['j'], approaches['jd'],
+                            approaches['distance_au'])]
+
+
+def main():
+    """Search the stored bodies or a propagated catalog for close approaches"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Close approaches via a time-sliced grid index")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD_AU,
+                        help='Largest distance to report (AU)')
+    parser.add_argument('--target', default='atlas', help='Body to search around')
+    parser.add_argument('--all-pairs', action='store_true', help='Search every pair of bodies')
+    parser.add_argument('--small-bodies', default=None, metavar='MANIFEST',
+                        help='catalog_propagation.py manifest to search instead')
+    parser.add_argument('--block-epochs', type=int, default=BLOCK_EPOCHS, help='Epochs per slice')
+    parser.add_argument('--output', default=None, help='Write approaches as JSON')
+    args = parser.parse_args()
+
+    stored = load_stored()
+    t_start = time.perf_counter()
+    if args.small_bodies:
+        names, jd, positions = load_small_bodies(args.small_bodies)
+        if args.target in stored and not args.all_pairs:
+            span = (jd >= stored[args.target].start) & (jd <= stored[args.target].end)
+            jd, positions = jd[span], positions[span]
+            target = stored[args.target].interpolate(jd)[0].astype(positions.dtype)
+            positions = np.concatenate([positions, target[:, None, :]], axis=1)
+            names = list(names) + [args.target]
+    else:
+        names, jd, positions = columnar_positions(stored)
+    t_load = time.perf_counter() - t_start
+
+    targets = None
+    if not args.all_pairs:
+        if args.target not in names:
+            print(f"✗ {args.target} is not among the loaded bodies")
+            sys.exit(1)
+        targets = [names.index(args.target)]
+
+    t_start = time.perf_counter()
+    approaches = close_approaches(positions, jd, args.threshold, targets, args.block_epochs)
+    closest = closest_per_pair(approaches)
+    elapsed = time.perf_counter() - t_start
+
+    print(f"✓ {positions.shape[1]:,} bodies x {len(jd):,} epochs loaded in {t_load:.2f} s")
+    print(f"✓ {len(approaches['jd'])} approaches below {args.threshold} AU "
+          f"({len(closest['jd'])} pairs) in {elapsed:.2f} s")
+
+    records = to_records(names, closest)
+    for record in records[:30]:
+        print(f"  {record['time_tdb']} TDB  {record['body_a']} - {record['body_b']}: "
+              f"{record['distance_au']:.4f} AU")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'threshold_au': args.threshold,
+                       'closest_per_pair': records,
+                       'approaches': to_records(names, approaches)}, f, indent=2)
+        print(f"✓ Approaches saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+Native SPK (DAF) Kernel Reader
+==============================
+
+Reads binary SPICE SPK kernels with NumPy only, so one kernel download can
+replace every per-cadence vector fetch from Horizons.
+
+Supported segment types:
+- Type 2  Chebyshev position (JPL planetary ephemerides, e.g. de440s.bsp)
+- Type 3  Chebyshev position and velocity
+- Type 1/21  (Extended) modified difference arrays (Horizons small-body SPKs)
+
+The kernel is memory-mapped; segment data is only touched for the epochs
+requested. Evaluation is vectorized over epochs, and states are chained
+through segment centers so any body can be returned relative to the Sun.
+Output is heliocentric J2000 ecliptic in AU and AU/day, matching the stored
+Horizons vectors.
+
+Usage:
+    python3 spk_reader.py KERNEL.bsp                  # list segments
+    python3 spk_reader.py --download-atlas            # fetch ATLAS SPK from Horizons
+
+Author: 3IAtlas Development Team
+"""
+
+import base64
+import os
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import requests
+
+from chebyshev_store import _chebyshev_matrix
+from ephemeris import EphemerisSeries, date_to_jd
+from frames import transform
+
+HORIZONS_API_URL = "https://ssd.jpl.nasa.gov/api/horizons.api"
+PLANET_KERNEL_URL = "https://naif.jpl.nasa.gov/pub/naif/generic_kernels/spk/planets/de440s.bsp"
+ATLAS_KERNEL_FILE = "atlas.bsp"
+PLANET_KERNEL_FILE = "de440s.bsp"
+DEFAULT_KERNELS = [PLANET_KERNEL_FILE, ATLAS_KERNEL_FILE]
+
+AU_TO_KM = 149597870.7
+SECONDS_PER_DAY = 86400.0
+J2000_JD = 2451545.0
+
+SUN = 10
+SSB = 0
+
+# NAIF frame codes
+FRAME_J2000 = 1
+FRAME_ECLIPJ2000 = 17
+
+RECORD_BYTES = 1024
+
+
+def jd_to_et(jd) -> np.ndarray:
+    """Julian Date (TDB) to SPICE ephemeris time (TDB seconds past J2000)"""
+    return (np.asarray(jd, dtype=np.float64) - J2000_JD) * SECONDS_PER_DAY
+
+
+class SPKSegment:
+    """One SPK segment: a state table for target relative to center"""
+
+    def __init__(self, kernel: 'SPKKernel', name: str, start_et: float, end_et: float,
+                 target: int, center: int, frame: int, data_type: int,
+                 start_addr: int, end_addr: int):
+        self.kernel = kernel
+        self.name = name
+        self.start_et = start_et
+        self.end_et = end_et
+        self.target = target
+        self.center = center
+        self.frame = frame
+        self.data_type = data_type
+        self.start_addr = start_addr
+        self.end_addr = end_addr
+        self._params = None
+
+    def __repr__(self) -> str:
+        return (f"SPKSegment(target={self.target}, center={self.center}, frame={self.frame}, "
+                f"type={self.data_type}, JD {self.start_et / SECONDS_PER_DAY + J2000_JD:.1f}-"
+                f"{self.end_et / SECONDS_PER_DAY + J2000_JD:.1f})")
+
+    @property
+    def data(self) -> np.ndarray:
+        """The segment's double-precision words (memory-mapped)"""
+        return self.kernel.words[self.start_addr - 1:self.end_addr]
+
+    def covers(self, et: np.ndarray) -> np.ndarray:
+        return (et >= self.start_et) & (et <= self.end_et)
+
+    def states(self, et: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Position (km) and velocity (km/s) at ephemeris times, in the segment frame"""
+        et = np.atleast_1d(np.asarray(et, dtype=np.float64))
+        if self.data_type in (2, 3):
+            return self._chebyshev_states(et)
+        if self.data_type in (1, 21):
+            return self._difference_line_states(et)
+        raise ValueError(f"SPK segment type {self.data_type} is not supported")
+
+    # -- Types 2 and 3 -----------------------------------------------------
+
+    def _chebyshev_states(self, et: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        data = self.data
+        init, intlen, rsize, count = data[-4:]
+        rsize, count = int(rsize), int(count)
+        components = 3 if self.data_type == 2 else 6
+        degree = (rsize - 2) // components - 1
+
+        records = data[:rsize * count].reshape(count, rsize)
+        idx = np.clip(np.floor((et - init) / intlen).astype(np.int64), 0, count - 1)
+
+        # Gather only the records touched, then evaluate every epoch at once
+        selected = np.asarray(records[idx])                    # (T, rsize)
+        mid, radius = selected[:, 0], selected[:, 1]
+        coeffs = selected[:, 2:].reshape(len(et), components, degree + 1)
+
+        T, dT = _chebyshev_matrix((et - mid) / radius, degree)
+        position = np.einsum('tck,kt->tc', coeffs[:, :3], T)
+        if components == 3:
+            velocity = np.einsum('tck,kt->tc', coeffs[:, :3], dT) / radius[:, None]
+        else:
+            velocity = np.einsum('tck,kt->tc', coeffs[:, 3:], T)
+
+        return position, velocity
+
+    # -- Types 1 and 21 ----------------------------------------------------
+
+    def _difference_line_layout(self) -> Tuple[int, int]:
+        """(number of records, difference line dimension)
+
+        Layout (SPKR01/SPKR21): N difference lines of 4 * MAXDIM + 11 words,
+        N final epochs, a directory of every 100th epoch, then the trailer:
+        [N] for type 1 (MAXDIM = 15), [MAXDIM, N] for type 21.
+        """
+        if self._params is None:
+            data = self.data
+            if self.data_type == 1:
+                maxdim, count, trailer = 15, int(data[-1]), 1
+            else:
+                maxdim, count, trailer = int(data[-2]), int(data[-1]), 2
+            expected = count * (4 * maxdim + 12) + (count - 1) // 100 + trailer
+            if count < 1 or expected != len(data):
+                raise ValueError(f"Type {self.data_type} segment for body {self.target} has "
+                                 f"{len(data)} words, expected {expected} "
+                                 f"(N = {count}, MAXDIM = {maxdim})")
+            self._params = (count, maxdim)
+        return self._params
+
+    def _difference_line_states(self, et: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        count, maxdim = self._difference_line_layout()
+        dlsize = 4 * maxdim + 11
+        data = self.data
+
+        lines = data[:count * dlsize].reshape(count, dlsize)
+        epochs = data[count * dlsize:count * dlsize + count]
+
+        # Each record covers up to and including its final epoch
+        idx = np.clip(np.searchsorted(epochs, et, side='left'), 0, count - 1)
+
+        position = np.empty((len(et), 3))
+        velocity = np.empty((len(et), 3))
+        for record in np.unique(idx):
+            sel = idx == record
+            position[sel], velocity[sel] = _evaluate_mda(lines[record], maxdim, et[sel])
+
+        return position, velocity
+
+
+def _evaluate_mda(line: np.ndarray, maxdim: int, et: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Evaluate one modified-difference-array line at many epochs
+
+    Port of the SPICE SPKE01/SPKE21 algorithm, vectorized over epochs.
+    Index comments use the 1-based names from the SPICE source.
+    """
+    tl = line[0]
+    g = line[1:maxdim + 1]
+    refpos = line[maxdim + 1:maxdim + 7:2]
+    refvel = line[maxdim + 2:maxdim + 7:2]
+    dt = line[maxdim + 7:4 * maxdim + 7].reshape(3, maxdim)     # DT(J, I) -> dt[I, J]
+    kqmax1 = int(line[4 * maxdim + 7])
+    kq = line[4 * maxdim + 8:4 * maxdim + 11].astype(int)
+
+    delta = et - tl
+    mq2 = kqmax1 - 2
+    ks = kqmax1 - 1
+
+    # FC(J+1), WC(J) for J = 1..MQ2 (stored 1-based)
+    fc = np.zeros((kqmax1 + 1, len(et)))
+    wc = np.zeros((kqmax1 + 1, len(et)))
+    tp = delta.copy()
+    for j in range(1, mq2 + 1):
+        fc[j + 1] = tp / g[j - 1]
+        wc[j] = delta / g[j - 1]
+        tp = delta + g[j - 1]
+
+    # W(J) = 1/J for J = 1..KQMAX1 (stored 1-based)
+    w = np.zeros((kqmax1 + 2, len(et)))
+    for j in range(1, kqmax1 + 1):
+        w[j] = 1.0 / j
+
+    jx = 0
+    ks1 = ks - 1
+    while ks >= 2:
+        jx += 1
+        for j in range(1, jx + 1):
+            w[j + ks] = fc[j + 1] * w[j + ks1] - wc[j] * w[j + ks]
+        ks = ks1
+        ks1 -= 1
+
+    position = np.empty((len(et), 3))
+    for i in range(3):
+        total = np.zeros(len(et))
+        for j in range(kq[i], 0, -1):
+            total += dt[i, j - 1] * w[j + ks]
+        position[:, i] = refpos[i] + delta * (refvel[i] + delta * total)
+
+    for j in range(1, jx + 1):
+        w[j + ks] = fc[j + 1] * w[j + ks1] - wc[j] * w[j + ks]
+    ks -= 1
+
+    velocity = np.empty((len(et), 3))
+    for i in range(3):
+        total = np.zeros(len(et))
+        for j in range(kq[i], 0, -1):
+            total += dt[i, j - 1] * w[j + ks]
+        velocity[:, i] = refvel[i] + delta * total
+
+    return position, velocity
+
+
+class SPKKernel:
+    """A memory-mapped DAF/SPK file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(RECORD_BYTES)
+
+        idword = header[:8].decode('ascii', 'replace')
+        if not idword.startswith('DAF/SPK'):
+            raise ValueError(f"{path} is not a DAF/SPK file ({idword!r})")
+
+        fmt = header[88:96].decode('ascii', 'replace')
+        endian = '>' if fmt.startswith('BIG') else '<'
+        self.int_dtype = np.dtype(endian + 'i4')
+        self.words = np.memmap(path, dtype=endian + 'f8', mode='r')
+
+        nd, ni = np.frombuffer(header[8:16], dtype=self.int_dtype)
+        forward = int(np.frombuffer(header[76:80], dtype=self.int_dtype)[0])
+        self.internal_name = header[16:76].decode('ascii', 'replace').strip()
+        self.segments = self._read_summaries(int(nd), int(ni), forward)
+
+    def _read_summaries(self, nd: int, ni: int, record: int) -> List[SPKSegment]:
+        summary_words = nd + (ni + 1) // 2
+        per_record = RECORD_BYTES // 8
+        raw = self.words.view(np.uint8)
+        segments = []
+
+        while record > 0:
+            base = (record - 1) * per_record
+            control = self.words[base:base + 3]
+            next_record, count = int(control[0]), int(control[2])
+            names = raw[record * RECORD_BYTES:(record + 1) * RECORD_BYTES].tobytes()
+
+            for k in range(count):
+                start = base + 3 + k * summary_words
+                doubles = self.words[start:start + nd]
+                ints = np.frombuffer(self.words[start + nd:start + summary_words].tobytes(),
+                                     dtype=self.int_dtype)[:ni]
+                name = names[k * summary_words * 8:(k + 1) * summary_words * 8]
+                segments.append(SPKSegment(
+                    self, name.decode('ascii', 'replace').strip(),
+                    float(doubles[0]), float(doubles[1]), *[int(v) for v in ints[:6]]
+                ))
+            record = next_record
+
+        return segments
+
+
+class SPKKernelSet:
+    """Several kernels queried together; later kernels take priority"""
+
+    def __init__(self, paths: List[str]):
+        self.kernels = [SPKKernel(path) for path in paths]
+        self.segments = [seg for kernel in self.kernels for seg in kernel.segments]
+
+    def bodies(self) -> List[int]:
+        return sorted({seg.target for seg in self.segments})
+
+    def has(self, body: int, barycenter_fallback: bool = False) -> bool:
+        try:
+            self.resolve(body, barycenter_fallback)
+        except KeyError:
+            return False
+        return True
+
+    def resolve(self, body: int, barycenter_fallback: bool = False) -> int:
+        """Body ID to evaluate for a requested body
+
+        A planet center (e.g. 599) missing from the kernels is replaced by its
+        system barycenter (5) only when barycenter_fallback is set; the two
+        differ by up to a few hundred km. Raises KeyError otherwise.
+        """
+        targets = {seg.target for seg in self.segments}
+        if body in targets or body == SSB:
+            return body
+        if (barycenter_fallback and 100 < body < 1000 and body % 100 == 99
+                and body // 100 in targets):
+            return body // 100
+        raise KeyError(f"Body {body} is not in the loaded kernels")
+
+    def _state_to_ssb(self, body: int, et: np.ndarray) -> Tuple[np.ndarray, np.ndarray, int]:
+        """State of body relative to the root of its segment chain"""
+        position = np.zeros((len(et), 3))
+        velocity = np.zeros((len(et), 3))
+        current = body
+
+        while current != SSB:
+            candidates = [seg for seg in self.segments if seg.target == current]
+            if not candidates:
+                break
+
+            filled = np.zeros(len(et), dtype=bool)
+            center = None
+            for seg in reversed(candidates):
+                sel = seg.covers(et) & ~filled
+                if not sel.any():
+                    continue
+                if center is None:
+                    center = seg.center
+                elif seg.center != center:
+                    continue
+                pos, vel = seg.states(et[sel])
+                if seg.frame == FRAME_ECLIPJ2000:
+                    pos, vel = transform(pos, 'ecliptic', 'icrf'), transform(vel, 'ecliptic', 'icrf')
+                elif seg.frame != FRAME_J2000:
+                    raise ValueError(f"Unsupported SPK frame {seg.frame} for body {current}")
+                position[sel] += pos
+                velocity[sel] += vel
+                filled |= sel
+
+            if center is None or not filled.all():
+                raise ValueError(f"Kernels do not cover body {current} at all requested epochs")
+            current = center
+
+        return position, velocity, current
+
+    def states(self, body: int, jd, center: int = SUN,
+               barycenter_fallback: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """Heliocentric (or center-relative) J2000 ecliptic states in AU, AU/day"""
+        resolved = self.resolve(body, barycenter_fallback)
+        center = self.resolve(center)
+
+        et = jd_to_et(np.atleast_1d(jd))
+        pos_b, vel_b, root_b = self._state_to_ssb(resolved, et)
+        if resolved == center:
+            pos_c, vel_c, root_c = np.zeros_like(pos_b), np.zeros_like(vel_b), root_b
+        else:
+            pos_c, vel_c, root_c = self._state_to_ssb(center, et)
+        if root_b != root_c:
+            raise ValueError(f"Bodies {body} and {center} do not share a common center")
+
+        position = transform(pos_b - pos_c, 'icrf', 'ecliptic') / AU_TO_KM
+        velocity = transform(vel_b - vel_c, 'icrf', 'ecliptic') / AU_TO_KM * SECONDS_PER_DAY
+        return position, velocity
+
+
+def step_to_days(step_size: str) -> float:
+    """Horizons step string ("6h", "1d", "30m") to days"""
+    value, unit = float(step_size[:-1]), step_size[-1]
+    return value * {'d': 1.0, 'h': 1 / 24, 'm': 1 / 1440}[unit]
+
+
+def kernel_vectors(kernels: SPKKernelSet, body: int, start_date: str, stop_date: str,
+                   step_size: str = "6h", barycenter_fallback: bool = False) -> List[Dict]:
+    """Vector records in the fetch_vectors() layout, evaluated from kernels"""
+    jd = np.arange(date_to_jd(start_date), date_to_jd(stop_date) + 1e-9, step_to_days(step_size))
+    position, velocity = kernels.states(body, jd, barycenter_fallback=barycenter_fallback)
+    return EphemerisSeries(jd, position, velocity).to_records()
+
+
+def load_kernels(paths: List[str]) -> Optional[SPKKernelSet]:
+    """Open the kernels that exist on disk; None if there are none"""
+    existing = [path for path in paths if os.path.exists(path)]
+    if not existing:
+        return None
+    try:
+        kernels = SPKKernelSet(existing)
+    except (OSError, ValueError) as e:
+        print(f"⚠ Could not read SPK kernels: {e}")
+        return None
+    print(f"✓ Loaded SPK kernels: {', '.join(os.path.basename(p) for p in existing)}")
+    return kernels
+
+
+def try_kernel_vectors(kernels: Optional[SPKKernelSet], command: str, start_date: str,
+                       stop_date: str, step_size: str,
+                       barycenter_fallback: bool = False) -> List[Dict]:
+    """Kernel vectors for a Horizons COMMAND, or [] if the kernels cannot supply them"""
+    if kernels is None or not command.isdigit():
+        return []
+    body = int(command)
+    if not kernels.has(body, barycenter_fallback):
+        return []
+    if kernels.resolve(body, barycenter_fallback) != body:
+        print(f"⚠ Body {body} is not in the SPK kernels; using system barycenter {body // 100}")
+    try:
+        vectors = kernel_vectors(kernels, body, start_date, stop_date, step_size,
+                                 barycenter_fallback)
+    except (KeyError, ValueError) as e:
+        print(f"⚠ SPK evaluation failed for {command}: {e}")
+        return []
+    print(f"✓ Evaluated {len(vectors)} vectors from SPK kernels")
+    return vectors
+
+
+def download_horizons_spk(command: str, start_date: str, stop_date: str,
+                          path: str = ATLAS_KERNEL_FILE) -> Optional[str]:
+    """Download a small-body SPK from Horizons (one file per orbit solution)"""
+    params = {
+        'format': 'json',
+        'EPHEM_TYPE': 'SPK',
+        'OBJ_DATA': 'NO',
+        'COMMAND': f"'DES={command};'",
+        'START_TIME': start_date,
+        'STOP_TIME': stop_date,
+    }
+    try:
+        print(f"Downloading SPK for {command} from Horizons...")
+        response = requests.get(HORIZONS_API_URL, params=params, timeout=120)
+        response.raise_for_status()
+        data = response.json()
+    except Exception as e:
+        print(f"✗ SPK download failed: {e}")
+        return None
+
+    if 'spk' not in data:
+        print(f"✗ No SPK in response: {data.get('error', data.get('result', ''))[:200]}")
+        return None
+
+    with open(path, 'wb') as f:
+        f.write(base64.b64decode(data['spk']))
+    print(f"✓ SPK saved to: {path}")
+    return path
+
+
+def download_file(url: str, path: str) -> Optional[str]:
+    """Download a generic kernel (e.g. the DE planetary ephemeris)"""
+    try:
+        print(f"Downloading {url}...")
+        with requests.get(url, stream=True, timeout=120) as response:
+            response.raise_for_status()
+            with open(path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=1 << 20):
+                    f.write(chunk)
+    except Exception as e:
+        print(f"✗ Download failed: {e}")
+        return None
+    print(f"✓ Saved to: {path}")
+    return path
+
+
+def main():
+    """List kernel contents or download kernels"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Read SPICE SPK kernels")
+    parser.add_argument('kernels', nargs='*', help='SPK files to summarize')
+    parser.add_argument('--download-atlas', action='store_true',
+                        help=f'Download the 3I/ATLAS SPK from Horizons to {ATLAS_KERNEL_FILE}')
+    parser.add_argument('--download-planets', action='store_true',
+                        help='Download de440s.bsp from NAIF')
+    parser.add_argument('--start', default='2025-07-01', help='SPK start date')
+    parser.add_argument('--stop', default='2026-03-31', help='SPK stop date')
+    args = parser.parse_args()
+
+    if args.download_atlas:
+        download_horizons_spk('1004083', args.start, args.stop)
+    if args.download_planets:
+        download_file(PLANET_KERNEL_URL, PLANET_KERNEL_FILE)
+
+    for path in args.kernels:
+        kernel = SPKKernel(path)
+        print(f"\n{path} ({kernel.internal_name})")
+        for seg in kernel.segments:
+            print(f"  {seg}")
+
+    if not (args.kernels or args.download_atlas or args.download_planets):
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
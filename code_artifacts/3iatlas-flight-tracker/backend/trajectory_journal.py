@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Journaled, Lock-Protected Trajectory Files
+==========================================
+
+Keeps a JSON trajectory product consistent when scheduled updates crash or
+overlap. Each update appends only its new points to a journal next to the
+snapshot; the snapshot itself is rewritten only when the journal is
+compacted.
+
+Layout:
+- <name>.json          snapshot, replaced atomically (temp file in the same
+                       directory, fsync, os.replace), never edited in place
+- <name>.json.journal  JSON Lines, one entry per update run, appended and
+                       fsynced; a torn last line from a crash is ignored
+- <name>.json.lock     advisory fcntl lock held for a whole update, so a cron
+                       run and a workflow run cannot interleave
+
+Method:
+- Readers load the snapshot and replay the journal entries in order
+- Compaction writes the replayed state as the new snapshot, then empties the
+  journal; replaying an entry twice must be harmless (merges keyed by epoch),
+  so a crash between the two steps loses nothing
+- An unreadable snapshot or journal raises ValueError instead of being
+  treated as empty, so an update never overwrites good data with a fresh start
+
+Usage:
+    from trajectory_journal import append_entry, compact, file_lock, read_entries
+    with file_lock(path):
+        append_entry(path, {'objects': {'atlas': new_points}})
+
+    python3 trajectory_journal.py --file /home/ubuntu/3iatlas_trajectory_data.json
+
+Author: 3IAtlas Development Team
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+from compact_json import dumps, write_json
+
+# Compact once this many update runs are journaled (twice-daily runs: 3 days)
+COMPACT_AFTER_ENTRIES = 6
+# Or once the journal reaches this fraction of the snapshot size
+COMPACT_SIZE_RATIO = 0.25
+
+LOCK_TIMEOUT = 600.0       # seconds to wait for another run to finish
+LOCK_POLL = 0.5
+
+
+def journal_path(path: str) -> str:
+    return path + '.journal'
+
+
+def lock_path(path: str) -> str:
+    return path + '.lock'
+
+
+@contextmanager
+def file_lock(path: str, timeout: float = LOCK_TIMEOUT):
+    """Hold an exclusive advisory lock for a product (no-op without fcntl)"""
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+
+    with open(lock_path(path), 'a') as handle:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"{lock_path(path)} is held by another update")
+                time.sleep(LOCK_POLL)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _fsync_directory(directory: str) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_json(path: str, data: Any) -> int:
+    """Publish a product via temp file + os.replace; returns its size"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                     dir=directory)
+    os.close(fd)
+    if os.path.exists(path):
+        mode = os.stat(path).st_mode & 0o777
+    else:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    try:
+        os.chmod(temp_path, mode)
+        size = write_json(temp_path, data)
+        with open(temp_path, 'rb+') as f:
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    _fsync_directory(directory)
+    return size
+
+
+def load_snapshot(path: str) -> Dict:
+    """Snapshot contents ({} only when the file does not exist yet)"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{path} is corrupt ({e})") from e
+
+
+def append_entry(path: str, entry: Dict) -> int:
+    """Append one update run to the journal; returns the bytes written"""
+    line = (dumps(entry) + '\n').encode()
+    with open(journal_path(path), 'ab+') as f:
+        size = f.seek(0, os.SEEK_END)
+        if size:
+            f.seek(size - 1)
+            if f.read(1) != b'\n':              # drop a torn line left by a crash
+                f.seek(0)
+                f.truncate(f.read().rfind(b'\n') + 1)
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+    return len(line)
+
+
+def read_entries(path: str) -> List[Dict]:
+    """Journal entries in order (a torn final line is skipped)"""
+    try:
+        with open(journal_path(path), 'rb') as f:
+            lines = f.read().split(b'\n')
+    except FileNotFoundError:
+        return []
+
+    entries = []
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            entries.append(json.loads(line))
+        except json.JSONDecodeError as e:
+            if number == len(lines):          # crash during the last append
+                break
+            raise ValueError(f"{journal_path(path)} line {number} is corrupt ({e})") from e
+    return entries
+
+
+def needs_compaction(path: str, max_entries: int = COMPACT_AFTER_ENTRIES,
+                     size_ratio: float = COMPACT_SIZE_RATIO) -> bool:
+    """True when the journal is long or large relative to the snapshot"""
+    journal = journal_path(path)
+    if not os.path.exists(journal):
+        return False
+    if len(read_entries(path)) >= max_entries:
+        return True
+    snapshot = os.path.getsize(path) if os.path.exists(path) else 0
+    return os.path.getsize(journal) >= size_ratio * snapshot
+
+
+def compact(path: str, data: Dict) -> int:
+    """Publish replayed data as the snapshot and empty the journal"""
+    size = atomic_write_json(path, data)
+    journal = journal_path(path)
+    if os.path.exists(journal):
+        temp_path = journal + '.tmp'
+        open(temp_path, 'wb').close()
+        os.replace(temp_path, journal)
+    return size
+
+
+def main():
+    """Summarize a journaled product"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Journaled trajectory product status")
+    parser.add_argument('--file', required=True, help='Snapshot path')
+    args = parser.parse_args()
+
+    try:
+        snapshot = load_snapshot(args.file)
+        entries = read_entries(args.file)
+    except ValueError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    journal = journal_path(args.file)
+    journal_bytes = os.path.getsize(journal) if os.path.exists(journal) else 0
+    print(f"✓ Snapshot: {len(snapshot)} keys, "
+          f"{os.path.getsize(args.file) if os.path.exists(args.file) else 0:,} bytes")
+    print(f"✓ Journal: {len(entries)} entries, {journal_bytes:,} bytes"
+          f"{' (compaction due)' if needs_compaction(args.file) else ''}")
+
+
+if __name__ == "__main__":
+    main()
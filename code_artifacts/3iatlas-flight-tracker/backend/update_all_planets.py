@@ -20,7 +20,15 @@ import os
 # Add parent directory to path to import the generator
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from generate_atlas_trajectory import HorizonsAPIClient, OrbitalMechanicsCalculator
+from generate_atlas_trajectory import HorizonsAPIClient, OrbitalMechanicsCalculator, KEY_EVENTS
+from ephemeris import ephemerides_from_data, overlay_ephemerides
+from event_detection import detect_events, merge_with_defaults
+from derived_quantities import annotate
+from comet_visuals import annotate as annotate_visuals
+from columnar import columnar_path, write_product
+from data_tiles import SOURCE_FILES, TILES_DIR, load_sources, write_tiles
+from photometry import peak_events, stored_curve
+from spk_reader import load_kernels, try_kernel_vectors
 import json
 from datetime import datetime
 
@@ -68,6 +76,16 @@ CONFIG = {
 
     # Use fallback calculations if API fails?
     "use_fallback": True,
+
+    # Local SPK kernels (paths relative to this script); bodies they cover are
+    # evaluated locally instead of fetched. Download with:
+    #   python3 spk_reader.py --download-planets --download-atlas
+    "spk_kernels": ["de440s.bsp", "atlas.bsp"],
+
+    # de440s.bsp has Jupiter-Neptune system barycenters (5-8), not the planet
+    # centers (599-899). True: use the barycenter (logged, up to a few hundred
+    # km off); False: fetch those planets from the API
+    "spk_barycenter_fallback": False,
 }
 
 # ============================================================================
@@ -86,6 +104,9 @@ def main():
     api_client = HorizonsAPIClient()
     fallback_calc = OrbitalMechanicsCalculator()
 
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    kernels = load_kernels([os.path.join(script_dir, path) for path in CONFIG["spk_kernels"]])
+
     # Prepare data structure
     data = {
         "metadata": {
@@ -111,13 +132,22 @@ def main():
 
         print(f"\n[{idx}/{len(CONFIG['objects'])}] Fetching {obj_name}...")
 
-        # Fetch from Horizons API
-        vectors = api_client.fetch_vectors(
+        # Evaluate from local SPK kernels, else fetch from Horizons API
+        vectors = try_kernel_vectors(
+            kernels,
             spk_id,
             CONFIG["start_date"],
             CONFIG["end_date"],
-            step_size=step_size
+            step_size,
+            CONFIG["spk_barycenter_fallback"]
         )
+        if not vectors:
+            vectors = api_client.fetch_vectors(
+                spk_id,
+                CONFIG["start_date"],
+                CONFIG["end_date"],
+                step_size=step_size
+            )
 
         # Use fallback if API failed and fallback is enabled
         if not vectors and CONFIG["use_fallback"]:
@@ -155,6 +185,11 @@ def main():
         print(f"{obj_name:20s}: {point_count:5d} points")
     print("="*70 + "\n")
 
+    # Precompute HUD columns (r, speed, Earth/Mars range and light time)
+    annotate(data)
+    # Tail directions and activity scale for the comet renderer
+    annotate_visuals(data)
+
     # Save trajectory data
     output_path = os.path.join(os.path.dirname(__file__), CONFIG["output_trajectory"])
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
@@ -164,9 +199,22 @@ def main():
 
     print(f"✅ Trajectory data saved to: {output_path}")
 
+    # Binary columnar copy for typed-array loading
+    columnar_data = write_product(data, columnar_path(output_path))
+    print(f"✅ Columnar data saved to: {columnar_data}")
+
+    # Monthly per-object tiles (quantized deltas + .gz/.br); only changed tiles are rewritten.
+    # This run's states replace the stored products' at shared epochs, even where
+    # the stored series is denser (e.g. daily Jupiter vs this 2-day fetch)
+    base_dir = os.path.dirname(__file__)
+    sources = load_sources([os.path.join(base_dir, path) for path in SOURCE_FILES])
+    tile_stats = write_tiles(overlay_ephemerides(sources, ephemerides_from_data(data)),
+                             os.path.join(base_dir, TILES_DIR), encoding='delta', compress=True)
+    print(f"✅ Data tiles: {tile_stats['written']} written, {tile_stats['unchanged']} unchanged")
+
     # Generate timeline events
     events_path = os.path.join(os.path.dirname(__file__), CONFIG["output_events"])
-    generate_timeline_events(events_path)
+    generate_timeline_events(events_path, data)
 
     print(f"✅ Timeline events saved to: {events_path}")
 
@@ -181,47 +229,23 @@ def main():
     print("="*70 + "\n")
 
 
-def generate_timeline_events(output_path):
-    """Generate timeline event markers"""
-    events = {
-        "events": [
-            {
-                "id": "discovery",
-                "name": "Discovery",
-                "date": "2025-07-01",
-                "description": "3I/ATLAS discovered by ATLAS telescope in Chile",
-                "type": "milestone"
-            },
-            {
-                "id": "mars_flyby",
-                "name": "Mars Flyby",
-                "date": "2025-10-03",
-                "distance_au": 0.19,
-                "description": "Close approach to Mars at 0.19 AU",
-                "type": "encounter"
-            },
-            {
-                "id": "perihelion",
-                "name": "Perihelion",
-                "date": "2025-10-29",
-                "distance_au": 1.356,
-                "max_velocity_kms": 68.0,
-                "description": "Closest approach to the Sun at 1.356 AU",
-                "type": "milestone"
-            },
-            {
-                "id": "jupiter_approach",
-                "name": "Jupiter Approach",
-                "date": "2026-03-16",
-                "distance_au": 0.36,
-                "description": "Close approach to Jupiter at 0.36 AU",
-                "type": "encounter"
-            }
-        ]
-    }
+def generate_timeline_events(output_path, data=None):
+    """Generate timeline event markers
+
+    Perihelion, close approaches and peak brightness are derived from the
+    generated data; KEY_EVENTS supplies discovery and the defaults.
+    """
+    events = KEY_EVENTS
+    if data:
+        ephemerides = ephemerides_from_data(data)
+        detected = detect_events(ephemerides)
+        curve = stored_curve(ephemerides)
+        if curve is not None:
+            detected.extend(peak_events(curve))
+        events = merge_with_defaults(KEY_EVENTS, detected)
 
     with open(output_path, 'w') as f:
-        json.dump(events, f, indent=2)
+        json.dump({"events": events}, f, indent=2)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Multi-Site Visibility Windows
+=============================
+
+Answers "when can I see it from my city" for thousands of observing sites at
+once: intervals when 3I/ATLAS is above a minimum altitude while the Sun is
+below a twilight altitude.
+
+Method:
+- Geocentric RA/Dec of ATLAS (light-time corrected, observer_geometry.py)
+  and of the Sun (from the stored Earth vectors) are computed once for the
+  whole epoch grid; topocentric parallax (< 10" at > 1 AU) is neglected
+- Local sidereal time and both altitudes are evaluated as (sites, epochs)
+  arrays, one block of sites at a time to bound memory
+- The visibility mask is collapsed to per-site intervals with a single
+  np.diff/np.nonzero pass; interval edges are refined by linear
+  interpolation of the limiting altitude margin between samples
+- Site blocks run in a process pool (parallel.py) when more than one
+  worker is available
+
+Sites come from a CSV (name, lat, lon; east longitude positive), a regular
+--grid, or the built-in city list.
+
+Usage:
+    python3 visibility.py                                   # built-in cities
+    python3 visibility.py --sites cities.csv --min-altitude 15 --twilight -18
+    python3 visibility.py --grid 2 --step-hours 1 --workers 8 --output visibility.json
+
+Author: 3IAtlas Development Team
+"""
+
+import csv
+import json
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ephemeris import JD_UNIX_EPOCH, EphemerisSeries, date_to_jd, load_stored
+from frames import transform
+from observer_geometry import DELTA_T_2025, observer_geometry
+from parallel import balanced_chunk_size, chunk_ranges, default_workers, run_chunks
+
+# Altitude limits (degrees)
+MIN_ALTITUDE = 10.0
+NAUTICAL_TWILIGHT = -12.0
+
+# Sites evaluated per (sites, epochs) block
+SITE_BLOCK = 256
+
+# Example sites: name -> (latitude, east longitude)
+CITIES = {
+    'Santiago': (-33.45, -70.67),
+    'Sydney': (-33.87, 151.21),
+    'Johannesburg': (-26.20, 28.05),
+    'Honolulu': (21.31, -157.86),
+    'Mexico City': (19.43, -99.13),
+    'Cairo': (30.04, 31.24),
+    'Tokyo': (35.68, 139.69),
+    'Los Angeles': (34.05, -118.24),
+    'New York': (40.71, -74.01),
+    'Madrid': (40.42, -3.70),
+    'London': (51.51, -0.13),
+    'Reykjavik': (64.15, -21.94),
+}
+
+
+def gmst_deg(jd_ut: np.ndarray) -> np.ndarray:
+    """Greenwich mean sidereal time in degrees (IAU 1982, UT1 Julian Date)"""
+    d = jd_ut - 2451545.0
+    t = d / 36525.0
+    return (280.46061837 + 360.98564736629 * d + 0.000387933 * t * t) % 360.0
+
+
+def sun_radec(earth: EphemerisSeries, jd: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Geocentric RA/Dec of the Sun (degrees) from the Earth's heliocentric vectors"""
+    position, _ = earth.interpolate(jd)
+    equatorial = transform(-position, 'ecliptic', 'icrf')
+    ra = np.degrees(np.arctan2(equatorial[:, 1], equatorial[:, 0])) % 360.0
+    dec = np.degrees(np.arcsin(equatorial[:, 2] / np.linalg.norm(equatorial, axis=1)))
+    return ra, dec
+
+
+def altitude(lat_deg: np.ndarray, lst_deg: np.ndarray, ra_deg: np.ndarray,
+             dec_deg: np.ndarray) -> np.ndarray:
+    """Altitude (degrees) for (sites, 1) latitudes and (sites, epochs) sidereal times"""
+    lat, dec = np.radians(lat_deg), np.radians(dec_deg)
+    hour_angle = np.radians(lst_deg - ra_deg)
+    sin_alt = np.sin(lat) * np.sin(dec) + np.cos(lat) * np.cos(dec) * np.cos(hour_angle)
+    return np.degrees(np.arcsin(np.clip(sin_alt, -1.0, 1.0)))
+
+
+def _intervals(margin: np.ndarray, jd: np.ndarray, target_alt: np.ndarray):
+    """Per-site visible intervals from a (sites, epochs) margin (> 0 = visible)
+
+    Returns (site, start_jd, end_jd, max_altitude) arrays.
+    """
+    visible = margin > 0
+    padded = np.pad(visible, ((0, 0), (1, 1)))
+    edges = np.diff(padded.astype(np.int8), axis=1)
+    site, start = np.nonzero(edges == 1)          # first visible sample
+    _, stop = np.nonzero(edges == -1)             # one past the last visible sample
+    if not len(site):
+        return site, jd[:0], jd[:0], jd[:0]
+
+    # Peak altitude inside each interval
+    flat = target_alt.ravel()
+    offsets = site * margin.shape[1]
+    bounds = np.stack([offsets + start, offsets + stop - 1], axis=1).ravel()
+    peak = np.maximum.reduceat(flat, bounds)[::2]
+    peak = np.maximum(peak, flat[offsets + stop - 1])
+
+    # Linear interpolation of the margin's zero crossing next to each edge
+    last = margin.shape[1] - 1
+    before = np.maximum(start - 1, 0)
+    end = stop - 1
+    after = np.minimum(end + 1, last)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        m0, m1 = margin[site, before], margin[site, start]
+        frac = np.where((start > 0) & (m1 != m0), m1 / (m1 - m0), 0.0)
+        start_jd = jd[start] - frac * (jd[start] - jd[before])
+
+        m0, m1 = margin[site, end], margin[site, after]
+        frac = np.where((end < last) & (m1 != m0), m0 / (m0 - m1), 0.0)
+        end_jd = jd[end] + frac * (jd[after] - jd[end])
+
+    return site, start_jd, end_jd, peak
+
+
+def _visibility_block(task: Tuple) -> Tuple:
+    """Worker: visible intervals for one block of sites"""
+    (lat, lon, jd, gmst, target_ra, target_dec, sun_ra, sun_dec,
+     min_altitude, twilight, site_offset) = task
+
+    result = ([], [], [], [])
+    for start, stop in chunk_ranges(len(lat), SITE_BLOCK):
+        lst = gmst[None, :] + lon[start:stop, None]
+        site_lat = lat[start:stop, None]
+        target_alt = altitude(site_lat, lst, target_ra, target_dec)
+        sun_alt = altitude(site_lat, lst, sun_ra, sun_dec)
+        margin = np.minimum(target_alt - min_altitude, twilight - sun_alt)
+
+        site, start_jd, end_jd, peak = _intervals(margin, jd, target_alt)
+        for values, part in zip(result, (site + start + site_offset, start_jd, end_jd, peak)):
+            values.append(part)
+
+    return tuple(np.concatenate(values) for values in result)
+
+
+def visibility_windows(target: EphemerisSeries, earth: EphemerisSeries, sites: np.ndarray,
+                       jd: np.ndarray, min_altitude: float = MIN_ALTITUDE,
+                       twilight: float = NAUTICAL_TWILIGHT,
+                       workers: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Visible intervals for every site over the epoch grid
+
+    sites is an (N, 2) array of latitude and east longitude in degrees; jd
+    are TDB Julian Dates. Returns flat arrays 'site', 'start_jd', 'end_jd'
+    and 'max_altitude_deg', sorted by site then time.
+    """
+    jd = np.asarray(jd, dtype=np.float64)
+    sites = np.asarray(sites, dtype=np.float64).reshape(-1, 2)
+
+    geometry = observer_geometry(target, earth, jd)
+    sun_ra, sun_dec = sun_radec(earth, jd)
+    gmst = gmst_deg(jd - DELTA_T_2025 / 86400.0)
+
+    workers = workers or default_workers()
+    size = balanced_chunk_size(len(sites), workers, minimum=SITE_BLOCK)
+    tasks = [(sites[start:stop, 0], sites[start:stop, 1], jd, gmst,
+              geometry['ra_deg'], geometry['dec_deg'], sun_ra, sun_dec,
+              min_altitude, twilight, start)
+             for start, stop in chunk_ranges(len(sites), size)]
+
+    parts = run_chunks(_visibility_block, tasks, workers)
+    keys = ('site', 'start_jd', 'end_jd', 'max_altitude_deg')
+    return {key: np.concatenate([part[k] for part in parts]) for k, key in enumerate(keys)}
+
+
+def read_sites(path: str) -> Tuple[List[str], np.ndarray]:
+    """Site names and (N, 2) lat/lon from a CSV with name, lat, lon columns"""
+    names, coords = [], []
+    with open(path, 'r', newline='') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            row = {key.strip().lower(): value for key, value in row.items() if key}
+            lat = float(row.get('lat', row.get('latitude')))
+            lon = float(row.get('lon', row.get('longitude')))
+            names.append(row.get('name') or f"{lat:.2f},{lon:.2f}")
+            coords.append((lat, lon))
+    return names, np.array(coords).reshape(-1, 2)
+
+
+def grid_sites(step_deg: float, max_latitude: float = 70.0) -> Tuple[List[str], np.ndarray]:
+    """Regular lat/lon grid of sites"""
+    lat = np.arange(-max_latitude, max_latitude + 1e-9, step_deg)
+    lon = np.arange(-180.0, 180.0, step_deg)
+    grid = np.stack(np.meshgrid(lat, lon, indexing='ij'), axis=-1).reshape(-1, 2)
+    return [f"{a:.1f},{b:.1f}" for a, b in grid], grid
+
+
+def _date_strings(jd: np.ndarray) -> List[str]:
+    """"YYYY-MM-DD HH:MM" for an array of Julian Dates, without a Python loop"""
+    minutes = np.round((jd - JD_UNIX_EPOCH) * 1440.0).astype('datetime64[m]')
+    return [text.replace('T', ' ') for text in np.datetime_as_string(minutes, unit='m')]
+
+
+def to_records(names: List[str], sites: np.ndarray, windows: Dict[str, np.ndarray]) -> List[Dict]:
+    """Per-site JSON records with their visibility windows"""
+    records = [{'name': name, 'lat': float(lat), 'lon': float(lon), 'windows': []}
+               for name, (lat, lon) in zip(names, sites)]
+    starts = _date_strings(windows['start_jd'])
+    ends = _date_strings(windows['end_jd'])
+    hours = np.round((windows['end_jd'] - windows['start_jd']) * 24.0, 2).tolist()
+    peaks = np.round(windows['max_altitude_deg'], 1).tolist()
+
+    for k, site in enumerate(windows['site'].tolist()):
+        records[site]['windows'].append({'start': starts[k], 'end': ends[k],
+                                         'hours': hours[k], 'max_altitude_deg': peaks[k]})
+    return records
+
+
+def main():
+    """Compute visibility windows for a set of sites"""
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description="3I/ATLAS visibility windows per site")
+    parser.add_argument('--sites', default=None, help='CSV with name, lat, lon columns')
+    parser.add_argument('--grid', type=float, default=None, metavar='DEG',
+                        help='Use a regular lat/lon grid with this spacing instead')
+    parser.add_argument('--start', default=None, help='First epoch (default: stored span)')
+    parser.add_argument('--end', default=None, help='Last epoch')
+    parser.add_argument('--step-hours', type=float, default=1.0, help='Epoch cadence')
+    parser.add_argument('--min-altitude', type=float, default=MIN_ALTITUDE,
+                        help='Lowest usable ATLAS altitude (deg)')
+    parser.add_argument('--twilight', type=float, default=NAUTICAL_TWILIGHT,
+                        help='Sun altitude limit (deg): -6 civil, -12 nautical, -18 astronomical')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes')
+    parser.add_argument('--output', default=None, help='Write per-site windows as JSON')
+    args = parser.parse_args()
+
+    stored = load_stored()
+    if 'atlas' not in stored or 'earth' not in stored:
+        print("✗ Stored ATLAS and Earth data are required")
+        sys.exit(1)
+
+    if args.sites:
+        names, sites = read_sites(args.sites)
+    elif args.grid:
+        names, sites = grid_sites(args.grid)
+    else:
+        names, sites = list(CITIES), np.array(list(CITIES.values()))
+
+    atlas, earth = stored['atlas'], stored['earth']
+    start = date_to_jd(args.start) if args.start else max(atlas.start, earth.start)
+    end = date_to_jd(args.end) if args.end else min(atlas.end, earth.end)
+    jd = np.arange(start, end + 1e-9, args.step_hours / 24.0)
+
+    t_start = time.perf_counter()
+    windows = visibility_windows(atlas, earth, sites, jd, args.min_altitude,
+                                 args.twilight, args.workers)
+    elapsed = time.perf_counter() - t_start
+
+    print(f"✓ {len(sites):,} sites x {len(jd):,} epochs: {len(windows['site']):,} windows "
+          f"in {elapsed:.2f} s")
+
+    records = to_records(names, sites, windows)
+    if args.output:
+        product = {
+            'metadata': {
+                'generated': datetime.now().isoformat(),
+                'target': '3I/ATLAS',
+                'min_altitude_deg': args.min_altitude,
+                'sun_altitude_limit_deg': args.twilight,
+                'step_hours': args.step_hours,
+                'time': 'TDB',
+            },
+            'sites': records,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(product, f, separators=(',', ':'))
+        print(f"✓ Windows saved to: {args.output}")
+        return
+
+    for record in records[:20]:
+        hours = sum(window['hours'] for window in record['windows'])
+        first = record['windows'][0]['start'] if record['windows'] else '-'
+        print(f"  {record['name']:20s} {len(record['windows']):4d} windows, "
+              f"{hours:7.1f} h total, first {first}")
+
+
+if __name__ == "__main__":
+    main()
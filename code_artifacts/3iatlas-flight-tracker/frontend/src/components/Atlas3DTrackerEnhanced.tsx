@@ -32,11 +32,20 @@ import { TelemetryHUD } from "./TelemetryHUD";
 import { TexturePreloader } from "./TexturePreloader";
 
 // Type imports
+import { LodPyramid, loadLodPyramid } from "@/lib/lod-pyramid";
 import {
   fetchSolarSystemData,
   SolarSystemObjectKey,
 } from "@/lib/solar-system-data";
-import { TimelineEvent, TrajectoryData, VectorData } from "@/types/trajectory";
+import {
+  CameraTrack,
+  CameraTracksData,
+  OrbitPath,
+  OrbitPathsData,
+  TimelineEvent,
+  TrajectoryData,
+  VectorData,
+} from "@/types/trajectory";
 
 type ViewMode = /* 'explorer' | */ "true-scale" | "ride-atlas"; // Explorer commented out
 type MissionId = "discovery" | "mars_flyby" | "perihelion" | "jupiter_approach";
@@ -60,6 +69,9 @@ export function Atlas3DTrackerEnhanced({
     {}
   );
   const [events, setEvents] = useState<TimelineEvent[]>([]);
+  const [orbitPaths, setOrbitPaths] = useState<Record<string, OrbitPath>>({});
+  const [cameraTracks, setCameraTracks] = useState<Record<string, CameraTrack>>({});
+  const [trajectoryLod, setTrajectoryLod] = useState<LodPyramid>();
   const [currentIndex, setCurrentIndex] = useState(0);
   const [isPlaying, setIsPlaying] = useState(autoPlay);
   const [speed, setSpeed] = useState(initialSpeed);
@@ -150,6 +162,29 @@ export function Atlas3DTrackerEnhanced({
         console.log("✅ Events data loaded:", eventsJson.events?.length || 0);
         setEvents(eventsJson.events);
 
+        // Analytic orbit paths are optional (backend/orbit_paths.py)
+        const orbitResponse = await fetch("/data/orbit_paths.json").catch(() => null);
+        if (orbitResponse?.ok) {
+          const orbitJson: OrbitPathsData = await orbitResponse.json();
+          console.log("✅ Orbit paths loaded:", Object.keys(orbitJson.paths));
+          setOrbitPaths(orbitJson.paths);
+        }
+
+        // Smooth per-mode camera tracks are optional (backend/camera_paths.py)
+        const cameraResponse = await fetch("/data/camera_tracks.json").catch(() => null);
+        if (cameraResponse?.ok) {
+          const cameraJson: CameraTracksData = await cameraResponse.json();
+          console.log("✅ Camera tracks loaded:", Object.keys(cameraJson.tracks));
+          setCameraTracks(cameraJson.tracks);
+        }
+
+        // Error-bounded LOD pyramid is optional (backend/lod_pyramid.py)
+        const lod = await loadLodPyramid("/data/trajectory_lod.json").catch(() => null);
+        if (lod) {
+          console.log("✅ Trajectory LOD loaded:", Object.keys(lod.index));
+          setTrajectoryLod(lod);
+        }
+
         // Load planet data using existing infrastructure
         console.log("🪐 Loading planet data...");
         const planetObjects: SolarSystemObjectKey[] = [
@@ -615,6 +650,9 @@ export function Atlas3DTrackerEnhanced({
               setCinematicActive={setCinematicActive}
               setCinematicEvent={setCinematicEvent}
               cinematicEvent={cinematicEvent}
+              orbitPaths={orbitPaths}
+              cameraTracks={cameraTracks}
+              trajectoryLod={trajectoryLod}
             />
 
             {/* Post-processing effects for cinematic quality */}
@@ -6,11 +6,12 @@
  */
 
 import { usePlanetTextures } from "@/hooks/usePlanetTextures";
-import { VectorData } from '@/types/trajectory';
+import { OrbitPath, VectorData } from '@/types/trajectory';
 import { Billboard, Text } from '@react-three/drei';
 import { useFrame, useThree } from '@react-three/fiber';
 import { useMemo, useRef } from 'react';
 import * as THREE from "three";
+import { OrbitPathLine } from './TrajectoryTrail';
 
 interface CelestialBodyProps {
   name: string;
@@ -186,6 +187,7 @@ interface PlanetProps {
   radius: number;
   color: string;
   showOrbit?: boolean;
+  orbitPath?: OrbitPath;
 }
 
 export function Planet({
@@ -195,6 +197,7 @@ export function Planet({
   radius,
   color,
   showOrbit = true,
+  orbitPath,
 }: PlanetProps) {
   const { map, normal, clouds, rings } = usePlanetTextures(name);
 
@@ -251,8 +254,13 @@ export function Planet({
         </mesh>
       )}
 
+      {/* Full analytic orbit when precomputed */}
+      {showOrbit && orbitPath && (
+        <OrbitPathLine path={orbitPath} color={color} opacity={0.2} />
+      )}
+
       {/* Orbital path (simplified) */}
-      {showOrbit && (
+      {showOrbit && !orbitPath && (
         <line>
           <bufferGeometry>
             <bufferAttribute
@@ -2,7 +2,9 @@
  * Comet3D Component
  * =============================
  * 3D model of 3I/ATLAS with nucleus and tail
- * Tail points away from the Sun (solar wind), not opposite velocity
+ * Tail points away from the Sun (solar wind), not opposite velocity.
+ * When the backend's precomputed dust-tail direction and activity scale are
+ * supplied they are used as-is instead of being derived per frame.
  */
 
 import { Billboard, Text } from "@react-three/drei";
@@ -17,6 +19,8 @@ interface Comet3DProps {
   scale?: number;
   tailLength?: number;
   sunPosition?: [number, number, number];
+  tailDirection?: [number, number, number]; // scene axes, from comet_visuals.py
+  activity?: number; // 0-1, 1 at perihelion
 }
 
 export function Comet3D({
@@ -25,6 +29,8 @@ export function Comet3D({
   scale = 0.3,
   tailLength = 2.0,
   sunPosition = [0, 0, 0],
+  tailDirection,
+  activity,
 }: Comet3DProps) {
   const groupRef = useRef<THREE.Group>(null);
 
@@ -60,7 +66,9 @@ export function Comet3D({
     if (!groupRef.current) return;
     const comet = new THREE.Vector3(...position);
     const sun = new THREE.Vector3(...sunPosition);
-    const awayFromSun = comet.clone().sub(sun).normalize();
+    const awayFromSun = tailDirection
+      ? new THREE.Vector3(...tailDirection).normalize()
+      : comet.clone().sub(sun).normalize();
     groupRef.current.lookAt(comet.clone().add(awayFromSun));
 
     // Enhanced distance-reactive emissive intensity with perihelion flare
@@ -73,10 +81,15 @@ export function Comet3D({
     // Base emissive intensity from distance
     let emissiveIntensity = THREE.MathUtils.clamp(2 / dist, 0.25, 1.25);
 
-    // Perihelion brightness boost based on distance
-    if (distanceAU < 2.0) emissiveIntensity = Math.max(emissiveIntensity, 1.0);
-    if (distanceAU < 1.5) emissiveIntensity = Math.max(emissiveIntensity, 1.3);
-    if (distanceAU < 1.4) emissiveIntensity = Math.max(emissiveIntensity, 1.6); // perihelion flare
+    if (activity !== undefined) {
+      // Precomputed (q / r)^n activity: 0.25 far out, 1.6 at perihelion
+      emissiveIntensity = THREE.MathUtils.lerp(0.25, 1.6, activity);
+    } else {
+      // Perihelion brightness boost based on distance
+      if (distanceAU < 2.0) emissiveIntensity = Math.max(emissiveIntensity, 1.0);
+      if (distanceAU < 1.5) emissiveIntensity = Math.max(emissiveIntensity, 1.3);
+      if (distanceAU < 1.4) emissiveIntensity = Math.max(emissiveIntensity, 1.6); // perihelion flare
+    }
 
     // Date-based visibility adjustments
     const now = new Date();
@@ -15,13 +15,20 @@ import { Planet, Sun } from './CelestialBodies';
 import { Comet3D, HighlightGlow } from './Comet3D';
 import { CinematicCamera } from './FollowCamera';
 import { Starfield } from './Starfield';
-import { FullTrajectoryLine, TrajectoryTrail } from './TrajectoryTrail';
+import {
+  FullTrajectoryLine,
+  LodTrajectoryLine,
+  OrbitPathLine,
+  TrajectoryTrail,
+} from './TrajectoryTrail';
 
 import {
   SOLAR_SYSTEM_OBJECTS,
   SolarSystemObjectKey,
 } from "@/lib/solar-system-data";
-import { TrajectoryData, VectorData } from "@/types/trajectory";
+import { CameraTrack, OrbitPath, TrajectoryData, VectorData } from "@/types/trajectory";
+import { jdAtIndex, sampleCameraTrack } from "@/lib/camera-tracks";
+import type { LodPyramid } from "@/lib/lod-pyramid";
 import { PlanetLocators } from "./PlanetLocators";
 
 type OrbitControlsWithState = OrbitControlsImpl & { userIsInteracting?: boolean };
@@ -47,6 +54,9 @@ interface SceneContentProps {
   setCinematicActive?: (active: boolean) => void;
   setCinematicEvent?: (event: any) => void;
   cinematicEvent?: any;
+  orbitPaths?: Record<string, OrbitPath>;
+  cameraTracks?: Record<string, CameraTrack>;
+  trajectoryLod?: LodPyramid;
 }
 
 export function SceneContent({
@@ -65,6 +75,9 @@ export function SceneContent({
   setCinematicActive,
   setCinematicEvent,
   cinematicEvent,
+  orbitPaths,
+  cameraTracks,
+  trajectoryLod,
 }: SceneContentProps) {
   const { camera } = useThree();
 
@@ -214,6 +227,29 @@ export function SceneContent({
     };
   }, [viewMode, cometPosition, camera.position]);
 
+  // Precomputed tail direction and activity, blended between the two frames
+  // bracketing currentIndex (absent when the data predates comet_visuals.py)
+  const cometVisuals = useMemo(() => {
+    const atlas = trajectoryData.atlas || trajectoryData["3iatlas"] || [];
+    const i0 = Math.max(0, Math.min(Math.floor(currentIndex), atlas.length - 1));
+    const a = atlas[i0];
+    const b = atlas[Math.min(i0 + 1, atlas.length - 1)];
+    if (!a?.dust_tail || !b?.dust_tail) return { tailDirection: undefined, activity: undefined };
+
+    const f = currentIndex - i0;
+    const dir = new THREE.Vector3(a.dust_tail.x, a.dust_tail.z, -a.dust_tail.y).lerp(
+      new THREE.Vector3(b.dust_tail.x, b.dust_tail.z, -b.dust_tail.y),
+      f
+    );
+    return {
+      tailDirection: dir.toArray() as [number, number, number],
+      activity:
+        a.activity !== undefined && b.activity !== undefined
+          ? THREE.MathUtils.lerp(a.activity, b.activity, f)
+          : undefined,
+    };
+  }, [trajectoryData, currentIndex]);
+
   // Prepare bodies for screen-space locators (in Ride mode only) - memoized to prevent recreation
   const locatorBodies = useMemo(() => {
     if (viewMode !== "ride-atlas") return [];
@@ -280,13 +316,27 @@ export function SceneContent({
     };
   }, []);
 
+  // Playback epoch for sampling precomputed camera tracks
+  const currentJd = useMemo(
+    () => jdAtIndex(trajectoryData.atlas || trajectoryData["3iatlas"] || [], currentIndex),
+    [trajectoryData, currentIndex]
+  );
+
   useFrame((state, dt) => {
     const controls = controlsRef.current;
     if (!controls) return;
 
     const userBusy = Boolean(controls.userIsInteracting);
+    const rideTrack = cameraTracks?.["ride-atlas"];
 
-    if (viewMode === "ride-atlas" && !userBusy && cometVelocity && cometPosition) {
+    if (viewMode === "ride-atlas" && !userBusy && rideTrack && currentJd !== null) {
+      // Precomputed smooth track: sample directly, no per-frame smoothing
+      sampleCameraTrack(rideTrack, "position", currentJd, camPosRef.current);
+      sampleCameraTrack(rideTrack, "look_at", currentJd, targetRef.current);
+      state.camera.position.copy(camPosRef.current);
+      controls.target.copy(targetRef.current);
+      controls.update();
+    } else if (viewMode === "ride-atlas" && !userBusy && cometVelocity && cometPosition) {
       // Comet world position & forward (from velocity)
       const comet = new THREE.Vector3(...cometPosition);
       const fwd = new THREE.Vector3(...cometVelocity).normalize();
@@ -370,6 +420,7 @@ export function SceneContent({
             )}
             color={`#${planet.color.toString(16).padStart(6, '0')}`}
             showOrbit={true}
+            orbitPath={orbitPaths?.[key]}
           />
         );
       })}
@@ -382,6 +433,8 @@ export function SceneContent({
         scale={cometScale}
         tailLength={tailLength}
         sunPosition={[0, 0, 0]}
+        tailDirection={cometVisuals.tailDirection}
+        activity={cometVisuals.activity}
       />
 
       {/* Perihelion Glow Effect */}
@@ -391,20 +444,37 @@ export function SceneContent({
         visible={isPerihelion}
       />
 
-      {/* Trajectory Trail */}
-      <TrajectoryTrail
-        trajectoryData={trajectoryData.atlas || trajectoryData["3iatlas"] || []}
-        currentIndex={currentIndex}
-        color="#00ff88"
-        opacity={0.8}
-      />
+      {/* Trajectory Trail: zoom-selected LOD level up to the playback epoch */}
+      {trajectoryLod?.index.atlas && currentJd !== null ? (
+        <LodTrajectoryLine
+          pyramid={trajectoryLod}
+          body="atlas"
+          untilJd={currentJd}
+          head={cometPosition}
+          color="#00ff88"
+          opacity={0.8}
+        />
+      ) : (
+        <TrajectoryTrail
+          trajectoryData={trajectoryData.atlas || trajectoryData["3iatlas"] || []}
+          currentIndex={currentIndex}
+          color="#00ff88"
+          opacity={0.8}
+        />
+      )}
 
-      {/* Full Trajectory (dimmer, for context) */}
-      <FullTrajectoryLine
-        trajectoryData={trajectoryData.atlas || trajectoryData["3iatlas"] || []}
-        color="#00ff88"
-        opacity={0.15}
-      />
+      {/* Full Trajectory (dimmer, for context): LOD pyramid, else analytic hyperbola */}
+      {trajectoryLod?.index.atlas ? (
+        <LodTrajectoryLine pyramid={trajectoryLod} body="atlas" color="#00ff88" opacity={0.15} />
+      ) : orbitPaths?.atlas ? (
+        <OrbitPathLine path={orbitPaths.atlas} color="#00ff88" opacity={0.15} />
+      ) : (
+        <FullTrajectoryLine
+          trajectoryData={trajectoryData.atlas || trajectoryData["3iatlas"] || []}
+          color="#00ff88"
+          opacity={0.15}
+        />
+      )}
 
       {/* Camera Controls - Enhanced for better exploration */}
       {!cinematicActive && (
@@ -28,22 +28,21 @@ export function TelemetryHUD({ currentFrame, className = '', variant = 'panel' }
         distanceKm: 0,
         velocityKmS: 0,
         velocityKmH: 0,
+        earthDistanceAU: undefined as number | undefined,
+        lightTimeMin: undefined as number | undefined,
       };
     }
 
-    // Calculate distance from Sun (origin)
+    // Prefer the backend's precomputed columns; older data only has vectors
     const { position, velocity } = currentFrame;
-    const distanceAU = Math.sqrt(
+    const distanceAU = currentFrame.distance_au ?? Math.sqrt(
       position.x * position.x + position.y * position.y + position.z * position.z
     );
 
-    // Calculate velocity magnitude
-    const velocityAUPerDay = Math.sqrt(
-      velocity.x * velocity.x + velocity.y * velocity.y + velocity.z * velocity.z
-    );
-
     // Convert to km/s (AU/day -> km/s)
-    const velocityKmS = (velocityAUPerDay * AU_TO_KM) / 86400;
+    const velocityKmS = currentFrame.speed_kms ?? (Math.sqrt(
+      velocity.x * velocity.x + velocity.y * velocity.y + velocity.z * velocity.z
+    ) * AU_TO_KM) / 86400;
     const velocityKmH = velocityKmS * 3600;
 
     return {
@@ -52,6 +51,8 @@ export function TelemetryHUD({ currentFrame, className = '', variant = 'panel' }
       distanceKm: distanceAU * AU_TO_KM,
       velocityKmS,
       velocityKmH,
+      earthDistanceAU: currentFrame.earth_distance_au,
+      lightTimeMin: currentFrame.earth_light_time_min,
     };
   }, [currentFrame]);
 
@@ -106,6 +107,22 @@ export function TelemetryHUD({ currentFrame, className = '', variant = 'panel' }
             </div>
           </div>
         </div>
+
+        {telemetry.earthDistanceAU !== undefined && (
+          <div>
+            <span className={distanceLabelClass}>Distance from Earth:</span>
+            <div className={`${indentClass}`}>
+              <div className="text-white font-semibold">
+                {telemetry.earthDistanceAU.toFixed(3)} AU
+              </div>
+              {telemetry.lightTimeMin !== undefined && (
+                <div className="text-white/70 text-[0.7rem]">
+                  Light time {telemetry.lightTimeMin.toFixed(1)} min
+                </div>
+              )}
+            </div>
+          </div>
+        )}
       </div>
 
       {/* Perihelion Countdown */}
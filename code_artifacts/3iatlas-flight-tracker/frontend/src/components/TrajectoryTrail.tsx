@@ -5,9 +5,18 @@
  * Renders the green hyperbolic path line showing the comet's trajectory
  */
 
-import { useMemo } from 'react';
+import { useFrame, useThree } from '@react-three/fiber';
+import { useMemo, useRef, useState } from 'react';
 import * as THREE from 'three';
-import { VectorData } from '@/types/trajectory';
+import { OrbitPath, VectorData } from '@/types/trajectory';
+import {
+  LodPyramid,
+  loadLodLevel,
+  nearestVertexDistance,
+  pixelSizeAt,
+  selectLodLevel,
+  verticesUntil,
+} from '@/lib/lod-pyramid';
 
 interface TrajectoryTrailProps {
   trajectoryData: VectorData[];
@@ -148,3 +157,135 @@ export function FullTrajectoryLine({
     </line>
   );
 }
+
+/**
+ * OrbitPathLine Component
+ * =============================
+ * Renders a precomputed analytic orbit (backend/orbit_paths.py): complete
+ * ellipses and the full ATLAS hyperbola with curvature-adaptive vertices
+ */
+
+interface OrbitPathLineProps {
+  path: OrbitPath;
+  color?: string;
+  opacity?: number;
+}
+
+export function OrbitPathLine({
+  path,
+  color = '#00ff88',
+  opacity = 0.3,
+}: OrbitPathLineProps) {
+  const positions = useMemo(() => {
+    const v = path.vertices;
+    const count = v.length / 3 + (path.closed ? 1 : 0);
+    const array = new Float32Array(count * 3);
+    for (let i = 0; i < count; i++) {
+      const k = (i % (v.length / 3)) * 3;
+      // Ecliptic (x, y, z) -> scene (x, z, -y)
+      array[i * 3] = v[k];
+      array[i * 3 + 1] = v[k + 2];
+      array[i * 3 + 2] = -v[k + 1];
+    }
+    return array;
+  }, [path]);
+
+  return (
+    <line>
+      <bufferGeometry>
+        <bufferAttribute
+          attach="attributes-position"
+          count={positions.length / 3}
+          array={positions}
+          itemSize={3}
+        />
+      </bufferGeometry>
+      <lineBasicMaterial
+        color={color}
+        opacity={opacity}
+        transparent
+        linewidth={1}
+      />
+    </line>
+  );
+}
+
+/**
+ * LodTrajectoryLine Component
+ * =============================
+ * Renders one body's path from a precomputed LOD pyramid
+ * (backend/lod_pyramid.py), switching to the coarsest level whose error
+ * stays under half a pixel at the current camera distance. Finer levels are
+ * fetched on first use; the previous level stays on screen until they
+ * arrive. With untilJd set it draws the trail up to that epoch, ending on
+ * head.
+ */
+
+interface LodTrajectoryLineProps {
+  pyramid: LodPyramid;
+  body: string;
+  untilJd?: number | null;
+  head?: [number, number, number];
+  color?: string;
+  opacity?: number;
+}
+
+export function LodTrajectoryLine({
+  pyramid,
+  body,
+  untilJd,
+  head,
+  color = '#00ff88',
+  opacity = 0.3,
+}: LodTrajectoryLineProps) {
+  const { camera, size } = useThree();
+  const levels = pyramid.index[body];
+  const [level, setLevel] = useState(0);
+  const wanted = useRef(0);
+
+  // Start from the coarsest level; re-select only when the wanted level changes
+  useFrame(() => {
+    if (!levels?.length || !(camera instanceof THREE.PerspectiveCamera)) return;
+    const coarse = pyramid.loaded[0]?.[body]?.positions;
+    if (!coarse) return;
+    const distance = nearestVertexDistance(coarse, camera.position);
+    const selected = selectLodLevel(levels, pixelSizeAt(camera, distance, size.height)).level;
+    if (selected === wanted.current) return;
+    wanted.current = selected;
+    if (pyramid.loaded[selected]) {
+      setLevel(selected);
+      return;
+    }
+    loadLodLevel(pyramid, selected)
+      .then(() => {
+        if (wanted.current === selected) setLevel(selected);
+      })
+      .catch(() => undefined); // keep drawing the level already loaded
+  });
+
+  const vertices = pyramid.loaded[level]?.[body];
+  const positions = useMemo(() => {
+    if (!vertices || untilJd == null) return vertices?.positions;
+    return verticesUntil(vertices, untilJd, head);
+  }, [vertices, untilJd, head]);
+  if (!positions || positions.length < 6) return null;
+
+  return (
+    <line>
+      <bufferGeometry key={`${level}:${positions.length}`}>
+        <bufferAttribute
+          attach="attributes-position"
+          count={positions.length / 3}
+          array={positions}
+          itemSize={3}
+        />
+      </bufferGeometry>
+      <lineBasicMaterial
+        color={color}
+        opacity={opacity}
+        transparent
+        linewidth={1}
+      />
+    </line>
+  );
+}
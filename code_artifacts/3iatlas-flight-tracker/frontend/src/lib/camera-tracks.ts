@@ -0,0 +1,66 @@
+/**
+ * Precomputed Camera Tracks
+ * Evaluates the B-spline camera tracks written by backend/camera_paths.py
+ *
+ * Each track stores uniform cubic B-spline control points (scene axes, AU)
+ * for position, look_at and up; the parameter is u = (jd - start_jd) / knot_days.
+ */
+
+import * as THREE from "three";
+import { CameraTrack } from "@/types/trajectory";
+
+export type CameraTrackKey = "position" | "look_at" | "up";
+
+/**
+ * Sample one channel of a track at a Julian Date (clamped to the track span)
+ */
+export function sampleCameraTrack(
+  track: CameraTrack,
+  key: CameraTrackKey,
+  jd: number,
+  out: THREE.Vector3 = new THREE.Vector3()
+): THREE.Vector3 {
+  const control = track[key];
+  const u = THREE.MathUtils.clamp(
+    (jd - track.start_jd) / track.knot_days,
+    0,
+    track.segments
+  );
+  const i = Math.min(Math.floor(u), track.segments - 1);
+  const t = u - i;
+
+  // Uniform cubic B-spline basis
+  const t2 = t * t;
+  const t3 = t2 * t;
+  const w = [
+    (1 - t) * (1 - t) * (1 - t) / 6,
+    (3 * t3 - 6 * t2 + 4) / 6,
+    (-3 * t3 + 3 * t2 + 3 * t + 1) / 6,
+    t3 / 6,
+  ];
+
+  out.set(0, 0, 0);
+  for (let k = 0; k < 4; k++) {
+    const c = (i + k) * 3;
+    out.x += w[k] * control[c];
+    out.y += w[k] * control[c + 1];
+    out.z += w[k] * control[c + 2];
+  }
+  return out;
+}
+
+/**
+ * Julian Date at a fractional playback index (records must carry jd)
+ */
+export function jdAtIndex(
+  frames: { jd?: number }[],
+  index: number
+): number | null {
+  if (frames.length === 0) return null;
+  const i0 = THREE.MathUtils.clamp(Math.floor(index), 0, frames.length - 1);
+  const i1 = Math.min(i0 + 1, frames.length - 1);
+  const a = frames[i0].jd;
+  const b = frames[i1].jd;
+  if (!a || !b) return null;
+  return THREE.MathUtils.lerp(a, b, index - i0);
+}
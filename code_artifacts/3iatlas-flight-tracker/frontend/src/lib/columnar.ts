@@ -0,0 +1,101 @@
+/**
+ * Columnar Trajectory Loader
+ * Loads backend/columnar.py products (JSON manifest + little-endian .bin)
+ *
+ * Column blocks are 8-byte aligned, so each one is exposed as a zero-copy
+ * typed-array view on the fetched buffer (all WebGL platforms are
+ * little-endian).
+ */
+
+// ============================================================================
+// TYPE DEFINITIONS
+// ============================================================================
+
+export type ColumnarDtype = "<f8" | "<f4" | "|u1";
+
+export interface ColumnarBlock {
+  offset: number;
+  dtype: ColumnarDtype;
+  shape: number[];
+  units?: string;
+}
+
+export interface ColumnarManifest {
+  format: string;
+  data_file: string;
+  bytes: number;
+  byte_order: "little";
+  metadata: Record<string, unknown>;
+  axes: ColumnarBlock[];
+  objects: Record<string, { axis: number; columns: Record<string, ColumnarBlock> }>;
+  [extra: string]: unknown;
+}
+
+export type ColumnarArray = Float64Array | Float32Array | Uint8Array;
+
+export interface ColumnarObject {
+  jd: Float64Array;
+  columns: Record<string, { data: ColumnarArray; shape: number[]; units?: string }>;
+}
+
+export interface ColumnarProduct {
+  manifest: ColumnarManifest;
+  objects: Record<string, ColumnarObject>;
+}
+
+// ============================================================================
+// LOADING
+// ============================================================================
+
+function view(buffer: ArrayBuffer, block: ColumnarBlock): ColumnarArray {
+  const count = block.shape.reduce((a, b) => a * b, 1);
+  switch (block.dtype) {
+    case "<f8":
+      return new Float64Array(buffer, block.offset, count);
+    case "<f4":
+      return new Float32Array(buffer, block.offset, count);
+    case "|u1":
+      return new Uint8Array(buffer, block.offset, count);
+  }
+}
+
+/**
+ * Fetch a columnar manifest and its binary blocks
+ */
+export async function loadColumnar(manifestUrl: string): Promise<ColumnarProduct> {
+  const manifestResponse = await fetch(manifestUrl);
+  if (!manifestResponse.ok) throw new Error(`Failed to load ${manifestUrl}`);
+  const manifest: ColumnarManifest = await manifestResponse.json();
+
+  const dataUrl = manifestUrl.replace(/[^/]*$/, manifest.data_file);
+  const dataResponse = await fetch(dataUrl);
+  if (!dataResponse.ok) throw new Error(`Failed to load ${dataUrl}`);
+  const buffer = await dataResponse.arrayBuffer();
+
+  const objects: Record<string, ColumnarObject> = {};
+  for (const [name, entry] of Object.entries(manifest.objects)) {
+    const columns: ColumnarObject["columns"] = {};
+    for (const [column, block] of Object.entries(entry.columns)) {
+      columns[column] = { data: view(buffer, block), shape: block.shape, units: block.units };
+    }
+    objects[name] = {
+      jd: view(buffer, manifest.axes[entry.axis]) as Float64Array,
+      columns,
+    };
+  }
+  return { manifest, objects };
+}
+
+/**
+ * Ecliptic (x, y, z) position column -> scene-axes (x, z, -y) Float32Array,
+ * ready for a BufferGeometry position attribute
+ */
+export function toScenePositions(position: ColumnarArray): Float32Array {
+  const out = new Float32Array(position.length);
+  for (let i = 0; i < position.length; i += 3) {
+    out[i] = position[i];
+    out[i + 1] = position[i + 2];
+    out[i + 2] = -position[i + 1];
+  }
+  return out;
+}
@@ -0,0 +1,71 @@
+/**
+ * Quantized Delta Tile Decoder
+ * Decodes tiles written by backend/delta_codec.py (encoding "delta/1")
+ *
+ * Each column stores an origin, a quantization scale and integers differenced
+ * `order` times; decoding is `order` running sums, then origin + q * scale.
+ */
+
+import { type VectorData } from '@/types/trajectory';
+
+// ============================================================================
+// TYPE DEFINITIONS
+// ============================================================================
+
+export interface DeltaColumn<Origin> {
+  origin: Origin;
+  scale: number;
+  data: number[];
+}
+
+export interface DeltaTile {
+  encoding: 'delta/1';
+  order: number;
+  count: number;
+  jd: DeltaColumn<number>;
+  position: DeltaColumn<number[]>;
+  velocity: DeltaColumn<number[]>;
+}
+
+// ============================================================================
+// DECODING
+// ============================================================================
+
+function decodeColumn(column: DeltaColumn<number | number[]>, order: number): Float64Array {
+  const origin = typeof column.origin === 'number' ? [column.origin] : column.origin;
+  const width = origin.length;
+  const q = Float64Array.from(column.data);
+
+  // Running sums per component undo the differencing
+  for (let pass = 0; pass < order; pass++) {
+    for (let i = width; i < q.length; i++) {
+      q[i] += q[i - width];
+    }
+  }
+  for (let i = 0; i < q.length; i++) {
+    q[i] = origin[i % width] + q[i] * column.scale;
+  }
+  return q;
+}
+
+/**
+ * VectorData records of one delta-encoded tile
+ */
+export function decodeDeltaTile(tile: DeltaTile): VectorData[] {
+  if (tile.encoding !== 'delta/1') throw new Error(`Unknown tile encoding ${tile.encoding}`);
+  const jd = decodeColumn(tile.jd, tile.order);
+  const position = decodeColumn(tile.position, tile.order);
+  const velocity = decodeColumn(tile.velocity, tile.order);
+
+  const records: VectorData[] = [];
+  for (let i = 0; i < tile.count; i++) {
+    const k = i * 3;
+    records.push({
+      jd: jd[i],
+      date: new Date(Math.round((jd[i] - 2440587.5) * 86400000)).toISOString(),
+      position: { x: position[k], y: position[k + 1], z: position[k + 2] },
+      velocity: { x: velocity[k], y: velocity[k + 1], z: velocity[k + 2] },
+    });
+  }
+  return records;
+}
@@ -0,0 +1,162 @@
+/**
+ * Trajectory LOD Pyramid
+ * Loads backend/lod_pyramid.py products and picks the coarsest level whose
+ * measured error stays under a pixel budget for the current view
+ *
+ * Levels are nested RDP decimations (coarsest first), each its own columnar
+ * product with one object per body. The index (trajectory_lod.json) lists
+ * the level files and each body's tolerance, measured error and vertex
+ * count per level. Only the coarsest level is fetched up front; finer ones
+ * are fetched the first time the view asks for them.
+ */
+
+import * as THREE from "three";
+import { loadColumnar, toScenePositions } from "./columnar";
+
+// ============================================================================
+// TYPE DEFINITIONS
+// ============================================================================
+
+export interface LodLevel {
+  level: number;
+  tolerance_au: number;
+  max_error_au: number;
+  count: number;
+}
+
+export interface LodLevelFile {
+  level: number;
+  tolerance_au: number;
+  manifest: string;
+  bytes: number;
+}
+
+export interface LodIndex {
+  format: string;
+  metadata: Record<string, unknown>;
+  levels: LodLevelFile[];
+  lod: Record<string, LodLevel[]>;
+}
+
+// One body's kept vertices at one level
+export interface LodVertices {
+  jd: Float64Array;
+  positions: Float32Array; // scene axes (x, z, -y)
+}
+
+export interface LodPyramid {
+  url: string;
+  levels: LodLevelFile[];
+  index: Record<string, LodLevel[]>;
+  // Fetched levels: level -> body -> vertices
+  loaded: Record<number, Record<string, LodVertices>>;
+  pending: Record<number, Promise<void>>;
+}
+
+// Allowed on-screen error of the chosen level, in pixels
+export const LOD_PIXEL_TOLERANCE = 0.5;
+
+// ============================================================================
+// LOADING AND LEVEL SELECTION
+// ============================================================================
+
+/**
+ * Fetch one level's columnar product (once; later calls share the request)
+ */
+export function loadLodLevel(pyramid: LodPyramid, level: number): Promise<void> {
+  if (!pyramid.pending[level]) {
+    const url = pyramid.url.replace(/[^/]*$/, pyramid.levels[level].manifest);
+    pyramid.pending[level] = loadColumnar(url).then(({ objects }) => {
+      const bodies: Record<string, LodVertices> = {};
+      for (const [name, object] of Object.entries(objects)) {
+        bodies[name] = {
+          jd: object.jd,
+          positions: toScenePositions(object.columns.position.data),
+        };
+      }
+      pyramid.loaded[level] = bodies;
+    });
+  }
+  return pyramid.pending[level];
+}
+
+/**
+ * Fetch a pyramid index and its coarsest level
+ */
+export async function loadLodPyramid(indexUrl: string): Promise<LodPyramid> {
+  const response = await fetch(indexUrl);
+  if (!response.ok) throw new Error(`Failed to load ${indexUrl}`);
+  const index: LodIndex = await response.json();
+
+  const pyramid: LodPyramid = {
+    url: indexUrl,
+    levels: index.levels,
+    index: index.lod,
+    loaded: {},
+    pending: {},
+  };
+  await loadLodLevel(pyramid, 0);
+  return pyramid;
+}
+
+/**
+ * Vertices up to (and including) a Julian Date, optionally closed by a head
+ * point (e.g. the comet's current position) so the trail ends on the body
+ */
+export function verticesUntil(
+  vertices: LodVertices,
+  jd: number,
+  head?: [number, number, number]
+): Float32Array {
+  // Binary search for the first vertex after jd
+  let lo = 0;
+  let hi = vertices.jd.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (vertices.jd[mid] <= jd) lo = mid + 1;
+    else hi = mid;
+  }
+  const out = new Float32Array(lo * 3 + (head ? 3 : 0));
+  out.set(vertices.positions.subarray(0, lo * 3));
+  if (head) out.set(head, lo * 3);
+  return out;
+}
+
+/**
+ * World size (AU) of one pixel at a distance from a perspective camera
+ */
+export function pixelSizeAt(
+  camera: THREE.PerspectiveCamera,
+  distance: number,
+  viewportHeight: number
+): number {
+  const fov = THREE.MathUtils.degToRad(camera.fov);
+  return (2 * distance * Math.tan(fov / 2)) / (viewportHeight * camera.zoom);
+}
+
+/**
+ * Coarsest level whose measured error is within pixelTolerance pixels
+ * (the finest level when none is)
+ */
+export function selectLodLevel(
+  levels: LodLevel[],
+  pixelSize: number,
+  pixelTolerance: number = LOD_PIXEL_TOLERANCE
+): LodLevel {
+  const budget = pixelSize * pixelTolerance;
+  return levels.find((level) => level.max_error_au <= budget) ?? levels[levels.length - 1];
+}
+
+/**
+ * Distance from a point to the nearest vertex of a scene-axes position array
+ */
+export function nearestVertexDistance(positions: Float32Array, point: THREE.Vector3): number {
+  let best = Infinity;
+  for (let i = 0; i < positions.length; i += 3) {
+    const dx = positions[i] - point.x;
+    const dy = positions[i + 1] - point.y;
+    const dz = positions[i + 2] - point.z;
+    best = Math.min(best, dx * dx + dy * dy + dz * dz);
+  }
+  return Math.sqrt(best);
+}
@@ -4,6 +4,7 @@
  */
 
 import { type VectorData } from '@/types/trajectory';
+import { decodeDeltaTile, type DeltaTile } from './delta-codec';
 import { smoothEphemerisData } from './horizons-api';
 
 // Helper function to convert Horizons date format to ISO
@@ -114,8 +115,13 @@ async function loadObjectData({
     console.log(`[Solar System] 🌌 Loading real NASA data for ${obj.name}...`);
 
     let vectors: VectorData[] = [];
+    const tiled = objKey !== 'sun' ? await loadTiledObject(objKey, startDate, endDate) : null;
 
-    if (objKey === 'atlas') {
+    if (tiled) {
+      // Only the monthly tiles overlapping the requested range
+      vectors = objKey === 'atlas' ? smoothEphemerisData(tiled) : tiled;
+      console.log(`[Solar System] 🧩 Loaded ${obj.name} from data tiles`);
+    } else if (objKey === 'atlas') {
       // Load 3I/ATLAS data from the real NASA Horizons file
       const response = await fetch('/data/3I_ATLAS_positions_parsed.json');
       if (!response.ok) throw new Error('Failed to load 3I/ATLAS data');
@@ -222,6 +228,82 @@ async function loadObjectData({
   }
 }
 
+// ============================================================================
+// TILED DATA (backend/data_tiles.py)
+// ============================================================================
+
+interface DataTile {
+  key: string;
+  file: string;
+  start_jd: number;
+  end_jd: number;
+  count: number;
+  bytes: number;
+  sha256: string;
+}
+
+interface TileManifest {
+  format: string;
+  tile: string;
+  encoding?: 'json' | 'delta';
+  objects: Record<
+    string,
+    { start_jd: number; end_jd: number; count: number; tiles: DataTile[] }
+  >;
+}
+
+let tileManifest: Promise<TileManifest | null> | null = null;
+
+function loadTileManifest(): Promise<TileManifest | null> {
+  if (!tileManifest) {
+    tileManifest = fetch('/data/tiles/manifest.json')
+      .then((response) => (response.ok ? response.json() : null))
+      .catch(() => null);
+  }
+  return tileManifest;
+}
+
+function dateToJd(date: string): number {
+  return Date.parse(date) / (1000 * 60 * 60 * 24) + 2440587.5;
+}
+
+/**
+ * Records of one object from only the tiles overlapping [startDate, endDate]
+ * (null when the object is not tiled, so callers fall back to the full files)
+ */
+async function loadTiledObject(
+  objKey: SolarSystemObjectKey,
+  startDate: string,
+  endDate: string
+): Promise<VectorData[] | null> {
+  const manifest = await loadTileManifest();
+  const entry = manifest?.objects[objKey];
+  if (!entry) return null;
+
+  const startJd = dateToJd(startDate);
+  const endJd = dateToJd(endDate) + 1;
+  const tiles = entry.tiles.filter((tile) => tile.end_jd >= startJd && tile.start_jd <= endJd);
+  if (tiles.length === 0) return null;
+
+  try {
+    const chunks = await Promise.all(
+      tiles.map(async (tile) => {
+        // The checksum doubles as a cache key, so unchanged tiles stay cached
+        const response = await fetch(`/data/tiles/${tile.file}?v=${tile.sha256.slice(0, 16)}`);
+        if (!response.ok) throw new Error(`Failed to load tile ${tile.file}`);
+        const payload = await response.json();
+        return manifest?.encoding === 'delta'
+          ? decodeDeltaTile(payload as DeltaTile)
+          : (payload as VectorData[]);
+      })
+    );
+    return chunks.flat();
+  } catch (error) {
+    console.warn(`[Solar System] ⚠️ Tile load failed for ${objKey}, using full file:`, error);
+    return null;
+  }
+}
+
 function normalizeStepHours(stepSize: string): number {
   if (stepSize.endsWith('h')) {
     const value = parseInt(stepSize.slice(0, -1), 10);
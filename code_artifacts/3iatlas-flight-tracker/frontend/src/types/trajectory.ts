@@ -17,6 +17,19 @@ export interface VectorData {
   calculated?: boolean;
   distance_au?: number;
   note?: string;
+  // Precomputed by backend/derived_quantities.py
+  speed_kms?: number;
+  earth_distance_au?: number;
+  earth_range_rate_kms?: number;
+  earth_light_time_min?: number;
+  mars_distance_au?: number;
+  mars_range_rate_kms?: number;
+  mars_light_time_min?: number;
+  // Precomputed by backend/comet_visuals.py (comet records only)
+  anti_solar?: Vector3D;
+  dust_tail?: Vector3D;
+  dust_tail_au?: number;
+  activity?: number;
 }
 
 export interface TrajectoryData {
@@ -51,12 +64,48 @@ export interface TrajectoryData {
   pluto?: VectorData[];
 }
 
+// backend/orbit_paths.py output (vertices flat [x, y, z, ...], AU, ecliptic)
+export interface OrbitPath {
+  closed: boolean;
+  count: number;
+  max_error_au: number;
+  vertices: number[];
+}
+
+export interface OrbitPathsData {
+  metadata: {
+    generated: string;
+    tolerance_au: number;
+    max_radius_au: number;
+  };
+  paths: Record<string, OrbitPath>;
+}
+
+// backend/camera_paths.py output (B-spline control points, scene axes)
+export interface CameraTrack {
+  start_jd: number;
+  knot_days: number;
+  segments: number;
+  position: number[];
+  look_at: number[];
+  up: number[];
+}
+
+export interface CameraTracksData {
+  metadata: {
+    generated: string;
+  };
+  tracks: Record<string, CameraTrack>;
+}
+
 export interface TimelineEvent {
   id: string;
   name: string;
   date: string;
   distance_au?: number;
   max_velocity_kms?: number;
+  magnitude?: number;
+  predicted_magnitude?: number;
   description: string;
   type: 'milestone' | 'encounter';
   educational_content?: string;
@@ -5,7 +5,9 @@ Fetches trajectory data from NASA JPL Horizons API for 3I/ATLAS and planets
 """
 
 import json
+import os
 import re
+import sys
 import time
 import logging
 from datetime import datetime, timedelta
@@ -39,17 +41,32 @@ OBJECTS = {
     'jupiter': '599'         # Jupiter
 }
 
-# Orbital elements for 3I/ATLAS (for fallback calculations)
+# Orbital elements for 3I/ATLAS (JPL#26, for fallback calculations)
 ATLAS_ELEMENTS = {
-    'e': 6.14,                          # eccentricity (highly hyperbolic)
-    'q': 1.36,                          # perihelion distance (AU)
-    'i': 175.0,                         # inclination (degrees)
-    'perihelion_date': '2025-10-29',    # perihelion date
-    'perihelion_time': '11:47',         # UT time
+    'e': 6.139587836355706,             # eccentricity (highly hyperbolic)
+    'q': 1.356419039495192,             # perihelion distance (AU)
+    'i': 175.1131015287974,             # inclination (degrees)
+    'omega': 128.0099421020839,         # argument of perihelion (degrees)
+    'node': 322.1568699043938,          # longitude of ascending node (degrees)
+    'tp': 2460977.9814392594,           # perihelion time (JD TDB, 2025-10-29 11:33)
     'v_infinity': 57.98                 # hyperbolic excess velocity (km/s)
 }
 
-# Milestone events
+# Flight tracker backend (shared modules and orbit solution)
+BACKEND_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    'code_artifacts', '3iatlas-flight-tracker', 'backend'
+)
+sys.path.insert(0, BACKEND_DIR)
+from ephemeris import ephemerides_from_data  # noqa: E402
+from event_detection import detect_events, event_position, merge_with_defaults  # noqa: E402
+from compact_json import write_json  # noqa: E402
+
+# Least-squares solution refreshed by the flight tracker backend (orbit_fit.py)
+FITTED_ELEMENTS_FILE = os.path.join(BACKEND_DIR, 'atlas_orbit_solution.json')
+
+# Milestone events (perihelion and encounters are defaults; compute_milestones()
+# replaces them with the times and distances detected in the fetched data)
 MILESTONES = [
     {
         'name': 'Discovery',
@@ -76,8 +93,8 @@ MILESTONES = [
 
 def horizons_to_threejs(x: float, y: float, z: float) -> List[float]:
     """
-    Convert Horizons coordinate system to Three.js coordinate system
-    Horizons: +X = vernal equinox, +Y = 90° east in equatorial plane, +Z = north pole
+    Convert one Horizons vector to the Three.js coordinate system
+    Horizons: +X = vernal equinox, +Y = 90° east in ecliptic plane, +Z = ecliptic north
     Three.js: +X = right, +Y = up, +Z = out of screen
     
     Conversion: Three.js [x, y, z] = Horizons [x, z, -y]
@@ -193,6 +210,7 @@ def fetch_horizons_data(object_id: str, start_date: str, end_date: str,
         'STEP_SIZE': f"'{step_size}'",
         'OUT_UNITS': 'AU-D',
         'REF_SYSTEM': 'ICRF',
+        'REF_PLANE': 'ECLIPTIC',  # J2000 ecliptic (see frames.py)
         'VEC_TABLE': '2',
         'VEC_CORR': 'NONE'
     }
@@ -233,6 +251,20 @@ def fetch_horizons_data(object_id: str, start_date: str, end_date: str,
     return None
 
 
+def load_atlas_elements() -> Dict:
+    """
+    Return the latest fitted ATLAS elements, or the JPL#26 defaults
+    """
+    try:
+        with open(FITTED_ELEMENTS_FILE, 'r') as f:
+            fit = json.load(f)['elements']
+        logger.info(f"Using fitted orbit solution from {FITTED_ELEMENTS_FILE}")
+        return dict(ATLAS_ELEMENTS, e=fit['e'], q=fit['q'], i=fit['i'],
+                    omega=fit['w'], node=fit['om'], tp=fit['tp'])
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        return ATLAS_ELEMENTS
+
+
 def kepler_fallback_trajectory(start_date: str, end_date: str, 
                                step_hours: int = 6) -> List[Dict]:
     """
@@ -241,19 +273,19 @@ def kepler_fallback_trajectory(start_date: str, end_date: str,
     """
     logger.info("Using Kepler fallback trajectory generator")
     
+    elements = load_atlas_elements()
+    
     # Parse dates
     start_dt = datetime.fromisoformat(start_date)
     end_dt = datetime.fromisoformat(end_date)
-    perihelion_dt = datetime.fromisoformat(ATLAS_ELEMENTS['perihelion_date'])
+    perihelion_dt = datetime(2000, 1, 1, 12, 0, 0) + timedelta(days=elements['tp'] - 2451545.0)
     
     # Orbital elements for 3I/ATLAS
-    e = ATLAS_ELEMENTS['e']  # eccentricity (6.14, highly hyperbolic)
-    q = ATLAS_ELEMENTS['q']  # perihelion distance (1.36 AU)
-    i = np.radians(ATLAS_ELEMENTS['i'])  # inclination (175°, retrograde)
-    
-    # Additional orbital elements (assumed/simplified)
-    omega = np.radians(90)   # argument of periapsis
-    OMEGA = np.radians(180)  # longitude of ascending node
+    e = elements['e']  # eccentricity (6.14, highly hyperbolic)
+    q = elements['q']  # perihelion distance (1.36 AU)
+    i = np.radians(elements['i'])  # inclination (175°, retrograde)
+    omega = np.radians(elements['omega'])  # argument of periapsis
+    OMEGA = np.radians(elements['node'])   # longitude of ascending node
     
     # For hyperbolic orbit: a = q / (e - 1) (negative)
     a = -q / (e - 1)  # negative semimajor axis for hyperbolic orbit
@@ -391,6 +423,36 @@ def find_position_at_date(trajectory: List[Dict], target_date: str) -> Optional[
     return best_match
 
 
+def compute_milestones(trajectory_data: Dict) -> List[Dict]:
+    """
+    Milestones with ATLAS positions attached
+    Perihelion and planetary encounters are detected from the trajectories
+    (exact time and distance); positions are interpolated at those times
+    """
+    series = ephemerides_from_data(trajectory_data)
+    atlas = series.get('atlas')
+    atlas_trajectory = trajectory_data.get('atlas', [])
+    
+    detected = detect_events(series) if atlas is not None and len(atlas) >= 3 else []
+    
+    milestones = []
+    for event in merge_with_defaults(MILESTONES, detected, key='name'):
+        if 'jd' in event:
+            position = event_position(atlas, event)
+        else:
+            position = find_position_at_date(atlas_trajectory, event['date'])
+        if position:
+            milestones.append({
+                'name': event['name'],
+                'date': event['date'],
+                'description': event['description'],
+                'position': position
+            })
+            logger.info(f"Added milestone: {event['name']} at position {position}")
+    
+    return milestones
+
+
 def generate_trajectory_data(start_date: str = '2025-07-01', 
                             end_date: str = '2026-01-31',
                             step_size: str = '6h',
@@ -426,21 +488,7 @@ def generate_trajectory_data(start_date: str = '2025-07-01',
         time.sleep(0.1)
     
     # Add milestones with positions
-    atlas_trajectory = trajectory_data.get('atlas', [])
-    milestones_with_positions = []
-    
-    for milestone in MILESTONES:
-        position = find_position_at_date(atlas_trajectory, milestone['date'])
-        if position:
-            milestones_with_positions.append({
-                'name': milestone['name'],
-                'date': milestone['date'],
-                'description': milestone['description'],
-                'position': position
-            })
-            logger.info(f"Added milestone: {milestone['name']} at position {position}")
-    
-    trajectory_data['milestones'] = milestones_with_positions
+    trajectory_data['milestones'] = compute_milestones(trajectory_data)
     
     # Validate data
     total_points = sum(len(data) for data in trajectory_data.values() if isinstance(data, list))
@@ -450,11 +498,10 @@ def generate_trajectory_data(start_date: str = '2025-07-01',
         logger.error("No data points generated!")
         return False
     
-    # Save to file
+    # Save to file (compact, floats rounded to 1e-9)
     try:
-        with open(output_file, 'w') as f:
-            json.dump(trajectory_data, f, indent=2)
-        logger.info(f"Trajectory data saved to {output_file}")
+        size = write_json(output_file, trajectory_data)
+        logger.info(f"Trajectory data saved to {output_file} ({size:,} bytes)")
         return True
     except Exception as e:
         logger.error(f"Error saving trajectory data: {e}")
@@ -39,7 +39,7 @@ else
     echo "🔄 Committing changes..."
 
     # Add the updated data files
-    git add ../frontend/public/data/
+    git add ../frontend/public/data/ atlas_orbit_solution.json
 
     # Commit with timestamp
     git commit -m "🤖 Auto-update trajectory data from NASA Horizons
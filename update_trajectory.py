@@ -3,20 +3,37 @@
 3I/ATLAS Trajectory Update Script
 Updates trajectory data with latest information from NASA Horizons API
 Designed to run twice daily via cron or scheduler
+
+Each run appends only its new points to a journal next to DATA_FILE under an
+advisory lock; the journal is compacted into DATA_FILE (atomic replace) every
+few runs or with --compact. Points are merged in an indexed SQLite store
+next to DATA_FILE (upserts keyed by epoch), so a run never re-parses the
+whole product; the store is re-seeded from DATA_FILE and its journal
+whenever DATA_FILE was rewritten by another tool.
 """
 
-import json
 import logging
+import os
 from datetime import datetime, timedelta
 from typing import Dict, List
 from generate_trajectory import (
     fetch_horizons_data, 
     kepler_fallback_trajectory,
-    find_position_at_date,
+    compute_milestones,
     OBJECTS,
     logger,
     horizons_to_threejs
 )
+from ephemeris import date_to_jd, datetime_to_jd
+from ephemeris_store import EphemerisStore, export_data
+from trajectory_journal import (
+    append_entry,
+    compact,
+    file_lock,
+    load_snapshot,
+    needs_compaction,
+    read_entries
+)
 
 # Setup additional logging for update script
 update_logger = logging.getLogger('update_script')
@@ -24,23 +41,65 @@ update_logger = logging.getLogger('update_script')
 # Configuration
 DATA_FILE = '/home/ubuntu/3iatlas_trajectory_data.json'
 ROLLING_WINDOW_DAYS = 7  # Maintain 7-day rolling window of fresh data
+HISTORY_DAYS = 30  # Keep at least 30 days of historical data
 
 
-def load_existing_data() -> Dict:
+def store_path() -> str:
+    """
+    Ephemeris store kept next to DATA_FILE
+    """
+    return os.path.splitext(DATA_FILE)[0] + '.sqlite'
+
+
+def snapshot_version() -> int:
     """
-    Load existing trajectory data from file
+    DATA_FILE modification time (0 when missing), recorded in the store
     """
     try:
-        with open(DATA_FILE, 'r') as f:
-            data = json.load(f)
-        logger.info(f"Loaded existing data from {DATA_FILE}")
-        return data
+        return os.stat(DATA_FILE).st_mtime_ns
     except FileNotFoundError:
+        return 0
+
+
+def load_existing_data() -> Dict:
+    """
+    Load existing trajectory data: the snapshot plus every journaled update
+    Raises ValueError if the snapshot or journal is corrupt
+    """
+    try:
+        data = load_snapshot(DATA_FILE)
+        entries = read_entries(DATA_FILE)
+    except ValueError as e:
+        logger.error(f"Error loading {DATA_FILE}: {e}")
+        raise
+
+    if not data and not entries:
         logger.warning(f"Data file not found: {DATA_FILE}. Starting with empty data.")
         return {}
-    except json.JSONDecodeError as e:
-        logger.error(f"Error parsing JSON from {DATA_FILE}: {e}")
-        return {}
+
+    for entry in entries:
+        data = apply_journal_entry(data, entry)
+    logger.info(f"Loaded existing data from {DATA_FILE} ({len(entries)} journaled updates)")
+    return data
+
+
+def apply_journal_entry(data: Dict, entry: Dict) -> Dict:
+    """
+    Apply one journaled update run: merge its new points and prune
+    as of the run time (re-applying an entry changes nothing)
+    """
+    updated = data.copy()
+    run_time = datetime.fromisoformat(entry['last_updated'])
+    
+    for name, new_points in entry.get('objects', {}).items():
+        merged = merge_trajectory_data(updated.get(name, []), new_points)
+        updated[name] = prune_old_data(merged, run_time)
+    
+    for key in ('milestones', 'last_updated'):
+        if key in entry:
+            updated[key] = entry[key]
+    
+    return updated
 
 
 def get_date_range_for_update() -> tuple:
@@ -65,20 +124,14 @@ def merge_trajectory_data(existing: List[Dict], new: List[Dict]) -> List[Dict]:
     if not new:
         return existing
     
-    # Convert to dict keyed by date for easy merging
+    # Convert to dict keyed by epoch (as in the ephemeris store)
     merged = {}
     
-    # Add existing data
-    for point in existing:
-        date_key = point.get('date', '').split()[0]  # Get date part only
-        if date_key:
-            merged[date_key] = point
-    
-    # Add/overwrite with new data
-    for point in new:
-        date_key = point.get('date', '').split()[0]
-        if date_key:
-            merged[date_key] = point
+    # Add existing data, then add/overwrite with new data
+    for point in existing + new:
+        key = point.get('jd') or point.get('date', '')
+        if key:
+            merged[key] = point
     
     # Convert back to list and sort by date
     result = list(merged.values())
@@ -90,26 +143,39 @@ def merge_trajectory_data(existing: List[Dict], new: List[Dict]) -> List[Dict]:
 def prune_old_data(trajectory: List[Dict], cutoff_date: datetime) -> List[Dict]:
     """
     Remove data points older than cutoff date (but keep some historical context)
-    Keep at least 30 days of historical data
+    Keep at least 30 days of historical data, using the same cutoff epoch as
+    the ephemeris store so journal replay and store agree
     """
-    historical_cutoff = cutoff_date - timedelta(days=30)
+    cutoff_jd = prune_cutoff_jd(cutoff_date)
     
     pruned = []
     for point in trajectory:
         try:
-            date_str = point['date'].split()[0]
-            point_dt = datetime.fromisoformat(date_str)
-            
-            if point_dt >= historical_cutoff:
-                pruned.append(point)
-        except:
-            # If date parsing fails, keep the point
+            point_jd = point['jd'] if 'jd' in point else date_to_jd(point['date'])
+        except (KeyError, ValueError):
+            # If the point has no usable epoch, keep it
+            pruned.append(point)
+            continue
+        
+        if point_jd >= cutoff_jd:
             pruned.append(point)
     
     return pruned
 
 
-def update_trajectory_data() -> bool:
+def prune_cutoff_jd(cutoff_date: datetime) -> float:
+    """
+    First epoch kept by prune_old_data and the store (start of the first
+    whole day of the history window)
+    """
+    historical_cutoff = cutoff_date - timedelta(days=HISTORY_DAYS)
+    first_day = datetime.combine(historical_cutoff.date(), datetime.min.time())
+    if first_day < historical_cutoff:
+        first_day += timedelta(days=1)
+    return datetime_to_jd(first_day)
+
+
+def update_trajectory_data(force_compact: bool = False) -> bool:
     """
     Main update function
     Fetches latest data and merges with existing
@@ -118,15 +184,39 @@ def update_trajectory_data() -> bool:
     logger.info("Starting trajectory data update")
     logger.info("=" * 80)
     
-    # Load existing data
-    existing_data = load_existing_data()
-    
+    # One update at a time (cron and workflow runs may overlap)
+    try:
+        with file_lock(DATA_FILE):
+            return _update_locked(force_compact)
+    except (TimeoutError, ValueError) as e:
+        logger.error(f"Update aborted, {DATA_FILE} left unchanged: {e}")
+        return False
+
+
+def _update_locked(force_compact: bool) -> bool:
+    """
+    Fetch new points, journal them and compact when due (caller holds the lock)
+    """
+    with EphemerisStore(store_path()) as store:
+        # Seed the store from the snapshot and journal when it is new or
+        # DATA_FILE was rewritten by something else (e.g. generate_trajectory.py)
+        counts = store.sync(snapshot_version(), load_existing_data)
+        if counts:
+            logger.info(f"Seeded {store.path} with {sum(counts.values())} points")
+        return _update_store(store, force_compact)
+
+
+def _update_store(store: EphemerisStore, force_compact: bool) -> bool:
+    """
+    Upsert new points into the store and journal them
+    """
     # Get date range for update
     start_date, end_date = get_date_range_for_update()
     logger.info(f"Fetching updates from {start_date} to {end_date}")
     
-    # Update each object's trajectory
-    updated_data = existing_data.copy()
+    # New points per object (only these are journaled)
+    run_time = datetime.now()
+    entry = {'objects': {}, 'last_updated': run_time.isoformat()}
     
     for name, object_id in OBJECTS.items():
         logger.info(f"Updating {name}...")
@@ -143,41 +233,32 @@ def update_trajectory_data() -> bool:
                 logger.error(f"Failed to fetch data for {name}, keeping existing data")
                 continue
         
-        # Merge with existing
-        existing_trajectory = existing_data.get(name, [])
-        merged_trajectory = merge_trajectory_data(existing_trajectory, new_data)
+        entry['objects'][name] = new_data
         
-        # Prune old data
-        merged_trajectory = prune_old_data(merged_trajectory, datetime.now())
-        
-        updated_data[name] = merged_trajectory
-        logger.info(f"Updated {name}: {len(merged_trajectory)} total points")
+        # Merge with existing (upsert by epoch) and prune old data
+        store.upsert_records(name, new_data)
+        store.delete_before(name, prune_cutoff_jd(run_time))
+        logger.info(f"Updated {name}: {store.span(name)[2]} total points")
     
-    # Update milestones (in case ATLAS position changed)
-    if 'milestones' in existing_data and 'atlas' in updated_data:
-        atlas_trajectory = updated_data['atlas']
-        updated_milestones = []
-        
-        for milestone in existing_data['milestones']:
-            position = find_position_at_date(atlas_trajectory, milestone['date'])
-            if position:
-                updated_milestones.append({
-                    'name': milestone['name'],
-                    'date': milestone['date'],
-                    'description': milestone['description'],
-                    'position': position
-                })
-        
-        updated_data['milestones'] = updated_milestones
+    store.set_meta('last_updated', entry['last_updated'])
+    updated_data = export_data(store, 'lists', [name for name in OBJECTS
+                                                if name in store.objects()])
     
-    # Add update timestamp
-    updated_data['last_updated'] = datetime.now().isoformat()
+    # Update milestones (event times follow the refreshed trajectory)
+    if 'atlas' in updated_data:
+        entry['milestones'] = compute_milestones(updated_data)
+        updated_data['milestones'] = entry['milestones']
+        store.set_meta('milestones', entry['milestones'])
     
-    # Save updated data
+    # Journal this run; rewrite DATA_FILE only when compaction is due
     try:
-        with open(DATA_FILE, 'w') as f:
-            json.dump(updated_data, f, indent=2)
-        logger.info(f"Updated trajectory data saved to {DATA_FILE}")
+        size = append_entry(DATA_FILE, entry)
+        logger.info(f"Journaled {size:,} bytes of new data for {DATA_FILE}")
+        
+        if force_compact or needs_compaction(DATA_FILE):
+            size = compact(DATA_FILE, updated_data)
+            store.mark_synced(snapshot_version())
+            logger.info(f"Compacted trajectory data into {DATA_FILE} ({size:,} bytes)")
         
         # Log statistics
         total_points = sum(len(data) for data in updated_data.values() 
@@ -190,6 +271,20 @@ def update_trajectory_data() -> bool:
         return False
 
 
+def compact_trajectory_data() -> bool:
+    """
+    Fold the journal into DATA_FILE without fetching anything
+    """
+    try:
+        with file_lock(DATA_FILE):
+            size = compact(DATA_FILE, load_existing_data())
+    except (TimeoutError, ValueError) as e:
+        logger.error(f"Compaction aborted: {e}")
+        return False
+    logger.info(f"Compacted trajectory data into {DATA_FILE} ({size:,} bytes)")
+    return True
+
+
 def setup_cron_job():
     """
     Helper function to display instructions for setting up cron job
@@ -211,6 +306,9 @@ if __name__ == '__main__':
     
     if len(sys.argv) > 1 and sys.argv[1] == '--setup-cron':
         setup_cron_job()
+    elif len(sys.argv) > 1 and sys.argv[1] == '--compact':
+        if not compact_trajectory_data():
+            exit(1)
     else:
         success = update_trajectory_data()
         